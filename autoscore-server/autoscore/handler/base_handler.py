@@ -1,7 +1,7 @@
 """Base handler for message processing."""
 
 from abc import ABC, abstractmethod
-from typing import Generic
+from typing import Generic, Optional
 
 from websockets.asyncio.server import ServerConnection
 
@@ -32,13 +32,18 @@ class BaseHandler(Generic[REQ, RES], ABC):
         """Send a response to the websocket."""
         await websocket.send(response.model_dump_json())
 
+    def error_response(self, error_message: str, session_id: str, request_id: Optional[str] = None) -> ErrorResponse:
+        """Create an error response for a request of this handler."""
+        return ErrorResponse(request_type=self.get_request_type(), session_id=session_id, request_id=request_id, status=Status.ERROR,
+                             message=error_message,
+                             )
+
     async def send_error(
         self,
         websocket: ServerConnection,
         error_message: str,
-        request_id: str,
+        session_id: str,
+        request_id: Optional[str] = None,
     ) -> None:
         """Send an error response to the websocket."""
-        response = ErrorResponse(request_type=self.get_request_type(), session_id=request_id, status=Status.ERROR, message=error_message,
-                                 )
-        await websocket.send(response.model_dump_json())
+        await websocket.send(self.error_response(error_message, session_id, request_id).model_dump_json())
@@ -0,0 +1,44 @@
+"""Detections handler for scoring the detections of models running on the client."""
+
+import logging
+import time
+from typing import Optional
+
+from websockets.asyncio.server import ServerConnection
+
+from autoscore.handler.base_handler import BaseHandler
+from autoscore.metrics.server_metrics import ServerMetrics
+from autoscore.model.request import DetectionsRequest, RequestType
+from autoscore.model.response import PipelineDetectionResponse, Status
+from detector.service.detection_scoring_service import DetectionScoringService
+
+
+class DetectionsHandler(BaseHandler[DetectionsRequest, PipelineDetectionResponse]):
+    """Handles detections requests."""
+
+    logger = logging.getLogger(__qualname__)
+
+    def __init__(self, detection_scoring_service: DetectionScoringService, metrics: Optional[ServerMetrics] = None) -> None:
+        self.__detection_scoring_service = detection_scoring_service
+        self.__metrics = metrics or ServerMetrics()
+
+    def get_request_type(self) -> RequestType:
+        """Return the request type handled by this handler."""
+        return RequestType.DETECTIONS
+
+    async def handle(self, websocket: ServerConnection, request: DetectionsRequest) -> None:
+        """Handle detections requests on the event loop, which is cheaper than a hand-off as no model runs."""
+        start_time = time.perf_counter()
+        detection_result = self.__detection_scoring_service.score_detections(request.detections)
+        self.__metrics.record_request(RequestType.DETECTIONS, detection_result.result_code, time.perf_counter() - start_time)
+        self.__metrics.record_stage_timings(detection_result.stage_timings)
+
+        response = PipelineDetectionResponse(
+            request_type=RequestType.DETECTIONS,
+            session_id=request.session_id,
+            request_id=request.request_id,
+            status=Status.SUCCESS,
+            detection_result=detection_result,
+            player_id=request.player_id,
+        )
+        await self.send_response(websocket, response)
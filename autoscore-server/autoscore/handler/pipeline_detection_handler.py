@@ -1,16 +1,40 @@
 """Pipeline detection handler for processing dart detection and scoring requests."""
 
+import asyncio
+import json
 import logging
+import time
+from concurrent.futures import Future
+from functools import partial
+from typing import Callable, List, Optional, Tuple
 
-from detector.model.detection_models import ResultCode
-from detector.model.image_models import DartImage
+import numpy as np
+from detector.model.detection_models import CalibrationResult, DetectionProgress, DetectionResult
+from detector.model.detection_result_code import ResultCode
+from detector.model.exception import DartDetectionError
+from detector.model.image_models import CropInformation, DartImage, PreprocessingResult
+from detector.model.timing_models import PipelineStage
 from detector.service.dart_image_scoring_service import DartInImageScoringService
+from detector.util.deadline import Deadline
+from detector.util.timing_utils import StageTimer
+from detector.yolo.dartboard_cropper import YoloDartBoardImageCropper
 from websockets.asyncio.server import ServerConnection
 
 from autoscore.handler.base_handler import BaseHandler
-from autoscore.model.request import PipelineDetectionRequest, RequestType
-from autoscore.model.response import PipelineDetectionResponse, Status
-from autoscore.util.file_util import base64_to_numpy, save_base64_as_png
+from autoscore.metrics.server_metrics import ServerMetrics
+from autoscore.model.configuration import QualityLevel
+from autoscore.model.request import FrameRequest, LocalFrameRequest, PipelineDetectionRequest, RequestType
+from autoscore.model.response import DetectionProgressResponse, PipelineDetectionResponse, Status
+from autoscore.service.capture_suggester import CaptureSuggester
+from autoscore.service.negative_result_cache import NegativeResultCache
+from autoscore.service.quality_ladder import QualityLadder
+from autoscore.service.request_profiler import RequestProfiler
+from autoscore.service.request_scheduler import RequestPriority, RequestScheduler, SessionQueueFullError
+from autoscore.service.result_cache import DetectionResultCache
+from autoscore.service.session_crops import SessionCrops
+from autoscore.util.file_util import decode_base64, image_bytes_to_numpy, save_base64_as_png
+
+FULL_QUALITY = QualityLevel()
 
 
 class PipelineDetectionHandler(BaseHandler[PipelineDetectionRequest, PipelineDetectionResponse]):
@@ -18,33 +42,307 @@ class PipelineDetectionHandler(BaseHandler[PipelineDetectionRequest, PipelineDet
 
     logger = logging.getLogger(__qualname__)
 
-    def __init__(self, dart_detection_service: DartInImageScoringService) -> None:
-        self.__dart_detection_service = dart_detection_service
+    def __init__(  # noqa: PLR0913
+        self,
+        request_scheduler: RequestScheduler,
+        result_cache: Optional[DetectionResultCache] = None,
+        metrics: Optional[ServerMetrics] = None,
+        request_profiler: Optional[RequestProfiler] = None,
+        capture_suggester: Optional[CaptureSuggester] = None,
+        negative_cache: Optional[NegativeResultCache] = None,
+        quality_ladder: Optional[QualityLadder] = None,
+        session_crops: Optional[SessionCrops] = None,
+    ) -> None:
+        self.__request_scheduler = request_scheduler
+        self.__result_cache = result_cache
+        self.__metrics = metrics or ServerMetrics()
+        self.__request_profiler = request_profiler
+        self.__capture_suggester = capture_suggester
+        self.__negative_cache = negative_cache
+        self.__quality_ladder = quality_ladder
+        self.__session_crops = session_crops
 
     def get_request_type(self) -> RequestType:
         """Return the request type handled by this handler."""
         return RequestType.FULL
 
     async def handle(self, websocket: ServerConnection, request: PipelineDetectionRequest) -> None:
-        """Handle pipeline detection requests."""
+        """Handle pipeline detection requests, streaming a progress response per stage first if the request asks for it."""
+        progress_sends: List[Future[None]] = []
+        progress = (
+            partial(self.__send_progress, asyncio.get_running_loop(), websocket, request, progress_sends) if request.stream else None
+        )
+        payload = await self.__respond(request, request.image, progress)
+        # The final response must not overtake the progress responses scheduled from the worker thread
+        await asyncio.gather(*map(asyncio.wrap_future, progress_sends), return_exceptions=True)
+        await websocket.send(payload)
+
+    async def respond_to_frame(self, request: LocalFrameRequest, frame: np.ndarray) -> str:
+        """Detect darts in a raw BGR frame that needs no decoding and return the serialized response."""
+        return await self.__respond(request, frame)
+
+    async def __respond(
+        self,
+        request: FrameRequest,
+        image: str | np.ndarray,
+        progress: Optional[Callable[[DetectionProgress], None]] = None,
+    ) -> str:
+        start_time = time.perf_counter()
+        deadline = self.__deadline(request)
+        quality_level, quality = self.__quality_ladder.current if self.__quality_ladder else (0, FULL_QUALITY)
         try:
-            detection_result = self.__dart_detection_service.detect_and_score(
-                image=DartImage(raw_image=base64_to_numpy(request.image)))
+            # Frames of a session that is backing off and frames seen before are answered without inference,
+            # so they must not wait behind detections
+            known_result = self.__negative_cache.get(request.session_id) if self.__negative_cache else None
+            content_hash = None
+            if known_result is None and self.__result_cache is not None:
+                # Hashing a frame takes a fraction of a millisecond per megabyte, which the event loop should not spend
+                content_hash, known_result = await asyncio.to_thread(self.__get_cached, self.__result_cache, request, image)
+            payload, detection_result, timer = await self.__request_scheduler.run(
+                request.session_id,
+                partial(self.__process, request, image, progress, known_result, content_hash, deadline, quality_level, quality),
+                RequestPriority.INTERACTIVE if known_result is not None else RequestPriority.BULK,
+                quality.max_queued_per_session,
+            )
+        except SessionQueueFullError as e:
+            self.logger.warning("Rejected detection request: %s", e)
+            self.__metrics.record_request(RequestType.FULL, None, time.perf_counter() - start_time)
+            return self.error_response(str(e), request.session_id, request.request_id).model_dump_json()
+        except Exception as e:
+            self.logger.exception("Pipeline detection error")
+            self.__metrics.record_request(RequestType.FULL, ResultCode.UNKNOWN, time.perf_counter() - start_time)
+            return self.error_response(f"Pipeline detection failed: {e!s}", request.session_id, request.request_id).model_dump_json()
 
+        if deadline is not None and deadline.expired_before is not None:
+            self.__metrics.record_expired(deadline.expired_before)
+        self.__metrics.record_request(RequestType.FULL, detection_result.result_code, time.perf_counter() - start_time)
+        self.__metrics.record_stage_timings(timer.to_stage_timings())
+        return payload
 
-            save_base64_as_png(request.image)
+    @staticmethod
+    def __deadline(request: FrameRequest) -> Optional[Deadline]:
+        """Combine the client deadline and maximum age of a request into the deadline it is dropped at."""
+        budgets: List[float] = []
+        if request.max_age is not None:
+            budgets.append(request.max_age)
+        if request.deadline is not None:
+            budgets.append(request.deadline - time.time())
+        return Deadline.after(min(budgets)) if budgets else None
 
-            await self.send_response(
-                websocket,
-                PipelineDetectionResponse(
-                    request_type=RequestType.FULL,
-                    session_id=request.session_id,
-                    status=Status.SUCCESS,
-                    detection_result=detection_result,
-                    player_id=request.player_id,
-                ),
+    def __process(  # noqa: PLR0913
+        self,
+        request: FrameRequest,
+        image: str | np.ndarray,
+        progress: Optional[Callable[[DetectionProgress], None]],
+        known_result: Optional[DetectionResult],
+        content_hash: Optional[str],
+        deadline: Optional[Deadline],
+        quality_level: int,
+        quality: QualityLevel,
+        dart_detection_service: DartInImageScoringService,
+    ) -> Tuple[str, DetectionResult, StageTimer]:
+        """Decode, detect and serialize a frame on an inference worker thread, so the event loop only sends the response."""
+        profile = self.__request_profiler.start() if self.__request_profiler else None
+        timer = StageTimer()
+        try:
+            with timer:
+                if known_result is not None:
+                    # The session showed no dartboard recently or the frame was seen before, skip decoding and detection
+                    detection_result, cached = known_result, True
+                elif (expired_result := self.__drop_if_expired(deadline, PipelineStage.DECODE)) is not None:
+                    # The frame waited for a worker past its deadline, drop it before it is even decoded
+                    detection_result, cached = expired_result, False
+                elif isinstance(image, str):
+                    with timer.measure(PipelineStage.DECODE):
+                        image_bytes = decode_base64(image)
+                    detection_result = self.__detect_and_cache(
+                        dart_detection_service,
+                        request,
+                        content_hash,
+                        partial(self.__decode_image, image_bytes, timer),
+                        partial(save_base64_as_png, image_bytes),
+                        progress,
+                        deadline,
+                        quality,
+                        timer,
+                    )
+                    cached = False
+                else:
+                    # Raw frames are neither decoded nor archived, encoding them to PNG would cost more than the transport saves
+                    detection_result = self.__detect_and_cache(
+                        dart_detection_service,
+                        request,
+                        content_hash,
+                        partial(DartImage, raw_image=image),
+                        None,
+                        progress,
+                        deadline,
+                        quality,
+                        timer,
+                    )
+                    cached = False
+                if known_result is None and self.__negative_cache is not None:
+                    self.__negative_cache.record(request.session_id, detection_result)
+
+            response = PipelineDetectionResponse(
+                request_type=RequestType.FULL,
+                session_id=request.session_id,
+                request_id=request.request_id,
+                status=Status.EXPIRED if detection_result.result_code is ResultCode.DEADLINE_EXCEEDED else Status.SUCCESS,
+                detection_result=detection_result,
+                player_id=request.player_id,
+                cached=cached,
+                capture_suggestion=self.__capture_suggester.suggest(detection_result) if self.__capture_suggester else None,
+                quality_level=quality_level,
             )
+            return self.__serialize(response, timer), detection_result, timer
+        finally:
+            if profile is not None and self.__request_profiler is not None:
+                self.__request_profiler.finish(profile, request.session_id, timer.to_stage_timings())
 
-        except Exception as e:
-            self.logger.exception("Pipeline detection error")
-            await self.send_error(websocket, f"Pipeline detection failed: {e!s}", request.session_id)
+    def __detect_and_cache(  # noqa: PLR0913
+        self,
+        dart_detection_service: DartInImageScoringService,
+        request: FrameRequest,
+        content_hash: Optional[str],
+        decode: Callable[[], DartImage],
+        archive: Optional[Callable[[], object]],
+        progress: Optional[Callable[[DetectionProgress], None]],
+        deadline: Optional[Deadline],
+        quality: QualityLevel,
+        timer: StageTimer,
+    ) -> DetectionResult:
+        if self.__result_cache is None or content_hash is None:
+            return self.__detect(dart_detection_service, request, decode(), archive, progress, deadline, quality, timer)
+
+        session_id = request.session_id
+        image = decode()
+        perceptual_hash = None
+        similar_result = None
+        # Degraded quality levels reuse the calibration of near-duplicate frames even if the perceptual cache is off
+        if self.__result_cache.perceptual_hash_enabled or quality.perceptual_max_distance is not None:
+            perceptual_hash = self.__result_cache.perceptual_hash(image.raw_image)
+            similar_result = self.__result_cache.get_similar(session_id, perceptual_hash, quality.perceptual_max_distance)
+
+        detection_result = self.__detect(
+            dart_detection_service, request, image, archive, progress, deadline, quality, timer, similar_result
+        )
+        # A dropped frame says nothing about its content, a later copy of it has to be detected
+        if detection_result.result_code is not ResultCode.DEADLINE_EXCEEDED:
+            # Only frames calibrated on their own pixels are offered for reuse, so a slowly moving camera cannot keep a stale calibration
+            reused_calibration = similar_result is not None and detection_result.calibration_result is similar_result.calibration_result
+            self.__result_cache.put(session_id, content_hash, detection_result, None if reused_calibration else perceptual_hash)
+        return detection_result
+
+    def __get_cached(
+        self, result_cache: DetectionResultCache, request: FrameRequest, image: str | np.ndarray
+    ) -> Tuple[str, Optional[DetectionResult]]:
+        """Hash the received frame as it was encoded and get the cached result of an identical frame of the session, if any."""
+        content_hash = result_cache.content_hash(image.encode() if isinstance(image, str) else image.data)
+        cached_result = result_cache.get(request.session_id, content_hash)
+        if cached_result is None:
+            return content_hash, None
+        self.logger.debug("Reusing cached detection result for frame %s of session %s", content_hash, request.session_id)
+        return content_hash, self.__with_roi(cached_result, request.roi)
+
+    @staticmethod
+    def __with_roi(detection_result: DetectionResult, roi: Optional[CropInformation]) -> DetectionResult:
+        """Map a cached result to the region the client cropped the frame to, positions only depend on the cropped pixels."""
+        if roi is None:
+            return detection_result
+        return detection_result.model_copy(update={"preprocessing_result": PreprocessingResult(crop_info=roi)})
+
+    def __detect(  # noqa: PLR0913
+        self,
+        dart_detection_service: DartInImageScoringService,
+        request: FrameRequest,
+        image: DartImage,
+        archive: Optional[Callable[[], object]],
+        progress: Optional[Callable[[DetectionProgress], None]],
+        deadline: Optional[Deadline],
+        quality: QualityLevel,
+        timer: StageTimer,
+        similar_result: Optional[DetectionResult] = None,
+    ) -> DetectionResult:
+        roi = request.roi
+        frame_shape = image.raw_image.shape
+        reused_crop, calibration_result = self.__reusable_calibration(request, frame_shape, similar_result)
+        if calibration_result is not None:
+            self.logger.debug("Reusing the calibration of a near-duplicate frame for session %s", request.session_id)
+        elif roi is None and self.__session_crops is not None:
+            reused_crop = self.__session_crops.reuse(request.session_id, frame_shape, quality.crop_every_n_frames)
+        if reused_crop is not None:
+            # Cut the frame to the last dartboard crop of the session, just like a client sending a roi does
+            image, roi = YoloDartBoardImageCropper.apply_crop(image, reused_crop), reused_crop
+
+        detection_result = dart_detection_service.detect_and_score(
+            image=image,
+            roi=roi,
+            progress=progress,
+            deadline=deadline,
+            inference_size=quality.inference_size,
+            calibration_result=calibration_result,
+        )
+        if request.roi is None and self.__session_crops is not None:
+            self.__session_crops.record(request.session_id, frame_shape, detection_result, reused=reused_crop is not None)
+        if archive is not None and detection_result.result_code is not ResultCode.DEADLINE_EXCEEDED:
+            with timer.measure(PipelineStage.ARCHIVE):
+                archive()
+        return detection_result
+
+    @staticmethod
+    def __reusable_calibration(
+        request: FrameRequest, frame_shape: Tuple[int, ...], similar_result: Optional[DetectionResult]
+    ) -> Tuple[Optional[CropInformation], Optional[CalibrationResult]]:
+        """Get the crop to cut the frame to and the calibration of a near-duplicate frame, if the frame can be cut the same way."""
+        if similar_result is None or similar_result.calibration_result is None or not similar_result.calibration_result.success:
+            return None, None
+        crop = similar_result.preprocessing_result.crop_info if similar_result.preprocessing_result is not None else None
+        if request.roi is not None:
+            # The client already cut the frame, the calibration only fits if it was cut to the same region
+            return None, similar_result.calibration_result if crop == request.roi else None
+        if crop is not None and (crop.x_offset + crop.width > frame_shape[1] or crop.y_offset + crop.height > frame_shape[0]):
+            return None, None
+        return crop, similar_result.calibration_result
+
+    @staticmethod
+    def __drop_if_expired(deadline: Optional[Deadline], stage: PipelineStage) -> Optional[DetectionResult]:
+        if deadline is None:
+            return None
+        try:
+            deadline.check(stage)
+        except DartDetectionError as e:
+            return DetectionResult(processing_time=0.0, result_code=e.error_code, message=e.message, details=e.details)
+        return None
+
+    @staticmethod
+    def __send_progress(
+        loop: asyncio.AbstractEventLoop,
+        websocket: ServerConnection,
+        request: PipelineDetectionRequest,
+        progress_sends: List[Future[None]],
+        progress: DetectionProgress,
+    ) -> None:
+        """Serialize a progress response on the worker thread and hand the send over to the event loop."""
+        response = DetectionProgressResponse(
+            request_type=RequestType.FULL,
+            session_id=request.session_id,
+            request_id=request.request_id,
+            status=Status.SUCCESS,
+            player_id=request.player_id,
+            progress=progress,
+        )
+        progress_sends.append(asyncio.run_coroutine_threadsafe(websocket.send(response.model_dump_json()), loop))
+
+    @staticmethod
+    def __decode_image(image_bytes: bytes, timer: StageTimer) -> DartImage:
+        with timer.measure(PipelineStage.DECODE):
+            return DartImage(raw_image=image_bytes_to_numpy(image_bytes))
+
+    @staticmethod
+    def __serialize(response: PipelineDetectionResponse, timer: StageTimer) -> str:
+        """Serialize the response with the timings of this frame, including the serialization itself."""
+        with timer.measure(PipelineStage.SERIALIZE):
+            payload = response.model_dump(mode="json")
+        payload["detection_result"]["stage_timings"] = timer.to_stage_timings().model_dump(mode="json")
+        return json.dumps(payload, separators=(",", ":"))
@@ -0,0 +1,38 @@
+"""Profiling handler for changing the request profiling interval at runtime."""
+
+import logging
+
+from websockets.asyncio.server import ServerConnection
+
+from autoscore.handler.base_handler import BaseHandler
+from autoscore.model.request import ProfilingRequest, RequestType
+from autoscore.model.response import ProfilingResponse, Status
+from autoscore.service.request_profiler import RequestProfiler
+
+
+class ProfilingHandler(BaseHandler[ProfilingRequest, ProfilingResponse]):
+    """Handles profiling requests."""
+
+    logger = logging.getLogger(__qualname__)
+
+    def __init__(self, request_profiler: RequestProfiler) -> None:
+        self.__request_profiler = request_profiler
+
+    def get_request_type(self) -> RequestType:
+        """Return the request type handled by this handler."""
+        return RequestType.PROFILING
+
+    async def handle(self, websocket: ServerConnection, request: ProfilingRequest) -> None:
+        """Handle profiling requests."""
+        self.logger.info("Session %s changed the profiling interval to %d", request.session_id, request.every_n)
+        self.__request_profiler.configure(request.every_n)
+        response = ProfilingResponse(
+            request_type=RequestType.PROFILING,
+            session_id=request.session_id,
+            request_id=request.request_id,
+            status=Status.SUCCESS,
+            player_id=request.player_id,
+            every_n=self.__request_profiler.every_n,
+            profile_dir=str(self.__request_profiler.output_dir),
+        )
+        await self.send_response(websocket, response)
@@ -2,9 +2,13 @@
 
 import asyncio
 import logging
+from pathlib import Path
 
+import click
 import websockets
+from pydanclick import from_pydantic
 
+from autoscore.model.configuration import ServerConfig
 from autoscore.websocket.dart_websocket_server import DartWebSocketServer
 
 logging.basicConfig(
@@ -14,21 +18,42 @@ logging.basicConfig(
 logger = logging.getLogger("Main")
 
 
-async def async_main() -> None:
+async def async_main(config: ServerConfig) -> None:
     """Start the WebSocket server."""
-    server = DartWebSocketServer()
+    server = DartWebSocketServer(config)
 
-    logger.info("Starting dart WebSocket server on localhost:8765")
+    logger.info("Starting dart WebSocket server on %s:%d", config.host, config.port)
 
-    async with websockets.serve(server.register_connection, "0.0.0.0", 8765, max_size=20 * 1024 * 1024) as websocket_server:  # noqa: S104
-        logger.info("WebSocket server is running on ws://127.0.0.1:8765")
-        await websocket_server.serve_forever()
+    await server.start()
+    try:
+        async with websockets.serve(
+            server.register_connection,
+            config.host,
+            config.port,
+            max_size=config.max_message_size,
+            max_queue=config.max_queued_messages,
+            ping_interval=config.ping_interval_seconds,
+            ping_timeout=config.ping_timeout_seconds,
+            process_request=server.admission_controller.process_request,
+        ) as websocket_server:
+            logger.info("WebSocket server is running on ws://%s:%d", config.host, config.port)
+            server.mark_ready()
+            await websocket_server.serve_forever()
+    finally:
+        await server.stop()
 
 
-def main() -> None:
+@click.command()
+@click.option("--config-path", type=click.Path(exists=True, path_type=Path), help="Path to JSON config file for the server")
+@from_pydantic("config", ServerConfig)
+def main(config_path: Path | None, config: ServerConfig) -> None:
     """Entry point for the autoscore-server script."""
+    if config_path:
+        logger.info("Loading server configuration from %s", config_path)
+        config = ServerConfig.from_json(config_path)
+
     try:
-        asyncio.run(async_main())
+        asyncio.run(async_main(config))
     except KeyboardInterrupt:
         logger.info("Server shutdown requested")
     except Exception:
@@ -0,0 +1 @@
+"""Metrics package for collecting and exporting server telemetry."""
@@ -0,0 +1,73 @@
+"""Local HTTP endpoint serving metrics in the Prometheus text exposition format."""
+
+import asyncio
+import logging
+from http import HTTPStatus
+from typing import Callable, Optional
+
+from autoscore.metrics.metrics_registry import MetricsRegistry
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+REQUEST_READ_TIMEOUT = 5.0
+
+
+class MetricsHttpServer:
+    """Serves the metrics registry on GET /metrics and the readiness of the server on GET /ready."""
+
+    logger = logging.getLogger(__qualname__)
+
+    def __init__(self, registry: MetricsRegistry, host: str, port: int, is_ready: Optional[Callable[[], bool]] = None) -> None:
+        self.__registry = registry
+        self.__is_ready = is_ready or (lambda: True)
+        self.__host = host
+        self.__port = port
+        self.__server: Optional[asyncio.Server] = None
+
+    async def start(self) -> None:
+        """Start serving metrics."""
+        self.__server = await asyncio.start_server(self.__handle_client, self.__host, self.__port)
+        self.logger.info("Metrics are served on http://%s:%d/metrics", self.__host, self.__port)
+
+    async def stop(self) -> None:
+        """Stop serving metrics."""
+        if self.__server is not None:
+            self.__server.close()
+            await self.__server.wait_closed()
+            self.__server = None
+
+    async def __handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            request_line = await asyncio.wait_for(reader.readline(), REQUEST_READ_TIMEOUT)
+            while (await asyncio.wait_for(reader.readline(), REQUEST_READ_TIMEOUT)).strip():
+                pass  # Skip headers, the request line is all we need
+
+            method, path, *_ = request_line.decode("latin-1").split() or ["", ""]
+            if method != "GET":
+                await self.__respond(writer, HTTPStatus.METHOD_NOT_ALLOWED, "Only GET is supported\n")
+            elif path.split("?")[0] == "/metrics":
+                await self.__respond(writer, HTTPStatus.OK, self.__registry.render(), PROMETHEUS_CONTENT_TYPE)
+            elif path.split("?")[0] == "/ready":
+                if self.__is_ready():
+                    await self.__respond(writer, HTTPStatus.OK, "ready\n")
+                else:
+                    await self.__respond(writer, HTTPStatus.SERVICE_UNAVAILABLE, "not ready\n")
+            else:
+                await self.__respond(writer, HTTPStatus.NOT_FOUND, "Not found\n")
+        except (TimeoutError, ValueError, ConnectionError):
+            self.logger.debug("Invalid or incomplete metrics request")
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def __respond(
+        writer: asyncio.StreamWriter, status: HTTPStatus, body: str, content_type: str = "text/plain; charset=utf-8"
+    ) -> None:
+        payload = body.encode("utf-8")
+        header = (
+            f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            f"Content-Length: {len(payload)}\r\n"
+            "Connection: close\r\n\r\n"
+        )
+        writer.write(header.encode("latin-1") + payload)
+        await writer.drain()
@@ -0,0 +1,217 @@
+"""Minimal thread-safe metric types rendered in the Prometheus text exposition format."""
+
+import bisect
+import math
+import threading
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple, TypeVar
+
+LabelValues = Tuple[str, ...]
+Sample = Tuple[str, Dict[str, str], float]
+
+DEFAULT_LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Metric(ABC):
+    """Base class for a metric family with a fixed set of label names."""
+
+    metric_type: str = "untyped"
+
+    def __init__(self, name: str, description: str, label_names: Sequence[str] = ()) -> None:
+        self.name = name
+        self.description = description
+        self.label_names = tuple(label_names)
+        self._lock = threading.Lock()
+
+    @abstractmethod
+    def samples(self) -> Iterable[Sample]:
+        """Get all samples of this metric family."""
+
+    def _label_values(self, labels: Dict[str, object]) -> LabelValues:
+        if set(labels) != set(self.label_names):
+            msg = f"Metric {self.name} expects labels {self.label_names}, got {tuple(labels)}"
+            raise ValueError(msg)
+        return tuple(str(labels[name]) for name in self.label_names)
+
+    def _labels_dict(self, label_values: LabelValues) -> Dict[str, str]:
+        return dict(zip(self.label_names, label_values, strict=True))
+
+
+M = TypeVar("M", bound=Metric)
+
+
+class Counter(Metric):
+    """Monotonically increasing counter."""
+
+    metric_type = "counter"
+
+    def __init__(self, name: str, description: str, label_names: Sequence[str] = ()) -> None:
+        super().__init__(name, description, label_names)
+        self.__values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: object) -> None:
+        """Increase the counter for the given labels."""
+        key = self._label_values(labels)
+        with self._lock:
+            self.__values[key] = self.__values.get(key, 0.0) + amount
+
+    def set_total(self, total: float, **labels: object) -> None:
+        """Set the total of a counter that mirrors an externally maintained count."""
+        key = self._label_values(labels)
+        with self._lock:
+            self.__values[key] = total
+
+    def value(self, **labels: object) -> float:
+        """Get the current value for the given labels."""
+        with self._lock:
+            return self.__values.get(self._label_values(labels), 0.0)
+
+    def samples(self) -> Iterable[Sample]:
+        """Get all samples of this counter."""
+        with self._lock:
+            return [(self.name, self._labels_dict(key), value) for key, value in self.__values.items()]
+
+
+class Gauge(Metric):
+    """Gauge that can go up and down or is read from a callback on every collection."""
+
+    metric_type = "gauge"
+
+    def __init__(self, name: str, description: str, label_names: Sequence[str] = ()) -> None:
+        super().__init__(name, description, label_names)
+        self.__values: Dict[LabelValues, float] = {}
+        self.__callbacks: Dict[LabelValues, Callable[[], float]] = {}
+
+    def set(self, value: float, **labels: object) -> None:
+        """Set the gauge for the given labels."""
+        key = self._label_values(labels)
+        with self._lock:
+            self.__values[key] = value
+
+    def inc(self, amount: float = 1.0, **labels: object) -> None:
+        """Increase the gauge for the given labels."""
+        key = self._label_values(labels)
+        with self._lock:
+            self.__values[key] = self.__values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels: object) -> None:
+        """Decrease the gauge for the given labels."""
+        self.inc(-amount, **labels)
+
+    def set_function(self, callback: Callable[[], float], **labels: object) -> None:
+        """Read the gauge value for the given labels from a callback on every collection."""
+        key = self._label_values(labels)
+        with self._lock:
+            self.__callbacks[key] = callback
+
+    def value(self, **labels: object) -> float:
+        """Get the current value for the given labels."""
+        key = self._label_values(labels)
+        with self._lock:
+            callback = self.__callbacks.get(key)
+            value = self.__values.get(key, 0.0)
+        return float(callback()) if callback else value
+
+    def samples(self) -> Iterable[Sample]:
+        """Get all samples of this gauge."""
+        with self._lock:
+            values = dict(self.__values)
+            callbacks = dict(self.__callbacks)
+        values.update({key: float(callback()) for key, callback in callbacks.items()})
+        return [(self.name, self._labels_dict(key), value) for key, value in values.items()]
+
+
+class Histogram(Metric):
+    """Histogram with fixed cumulative buckets."""
+
+    metric_type = "histogram"
+
+    def __init__(
+        self, name: str, description: str, label_names: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS
+    ) -> None:
+        super().__init__(name, description, label_names)
+        self.buckets = tuple(sorted(buckets))
+        self.__counts: Dict[LabelValues, List[int]] = {}
+        self.__sums: Dict[LabelValues, float] = {}
+
+    def observe(self, value: float, **labels: object) -> None:
+        """Add an observation for the given labels."""
+        key = self._label_values(labels)
+        bucket_index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts = self.__counts.setdefault(key, [0] * (len(self.buckets) + 1))
+            counts[bucket_index] += 1
+            self.__sums[key] = self.__sums.get(key, 0.0) + value
+
+    def count(self, **labels: object) -> int:
+        """Get the number of observations for the given labels."""
+        with self._lock:
+            return sum(self.__counts.get(self._label_values(labels), []))
+
+    def samples(self) -> Iterable[Sample]:
+        """Get the bucket, sum and count samples of this histogram."""
+        samples: List[Sample] = []
+        with self._lock:
+            for key, counts in self.__counts.items():
+                labels = self._labels_dict(key)
+                cumulative = 0
+                for upper_bound, count in zip((*self.buckets, math.inf), counts, strict=True):
+                    cumulative += count
+                    samples.append((f"{self.name}_bucket", {**labels, "le": _format_value(upper_bound)}, cumulative))
+                samples.append((f"{self.name}_sum", labels, self.__sums[key]))
+                samples.append((f"{self.name}_count", labels, cumulative))
+        return samples
+
+
+class MetricsRegistry:
+    """Registry of metric families that renders them in the Prometheus text exposition format."""
+
+    def __init__(self) -> None:
+        self.__metrics: Dict[str, Metric] = {}
+        self.__collectors: List[Callable[[], None]] = []
+        self.__lock = threading.Lock()
+
+    def register(self, metric: M) -> M:
+        """Register a metric family and return it."""
+        with self.__lock:
+            if metric.name in self.__metrics:
+                msg = f"Metric {metric.name} is already registered"
+                raise ValueError(msg)
+            self.__metrics[metric.name] = metric
+        return metric
+
+    def add_collector(self, collector: Callable[[], None]) -> None:
+        """Add a callback that refreshes metric values right before they are rendered."""
+        with self.__lock:
+            self.__collectors.append(collector)
+
+    def render(self) -> str:
+        """Render all registered metrics in the Prometheus text exposition format."""
+        with self.__lock:
+            collectors = list(self.__collectors)
+            metrics = list(self.__metrics.values())
+        for collector in collectors:
+            collector()
+
+        lines: List[str] = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.description}")
+            lines.append(f"# TYPE {metric.name} {metric.metric_type}")
+            lines.extend(f"{name}{_format_labels(labels)} {_format_value(value)}" for name, labels, value in metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape_label_value(value)}"' for name, value in labels.items()) + "}"
+
+
+def _escape_label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
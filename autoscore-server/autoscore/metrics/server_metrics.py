@@ -0,0 +1,158 @@
+"""Metrics collected by the autoscore WebSocket server."""
+
+from typing import Callable, Optional
+
+from autoscore.metrics.metrics_registry import Counter, Gauge, Histogram, MetricsRegistry
+from autoscore.model.request import RequestType
+from autoscore.service.result_cache import CacheStatistics
+from detector.model.detection_result_code import ResultCode
+from detector.model.timing_models import PipelineStage, StageTimings
+
+NO_RESULT_CODE = "NONE"
+
+LOOP_LAG_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+INFERENCE_STAGES = {
+    PipelineStage.CROP_MODEL: "dartboard",
+    PipelineStage.DART_MODEL: "dart",
+}
+
+
+class ServerMetrics:
+    """Registry of all metrics exported by the autoscore WebSocket server."""
+
+    def __init__(self, registry: Optional[MetricsRegistry] = None) -> None:
+        self.registry = registry or MetricsRegistry()
+        self.requests = self.registry.register(
+            Counter("autoscore_requests_total", "Processed requests by request type and result code", ("request_type", "result_code"))
+        )
+        self.request_latency = self.registry.register(
+            Histogram("autoscore_request_latency_seconds", "End-to-end latency of processed requests", ("request_type",))
+        )
+        self.stage_latency = self.registry.register(
+            Histogram("autoscore_stage_latency_seconds", "Latency of each detection pipeline stage", ("stage",))
+        )
+        self.model_inferences = self.registry.register(
+            Counter("autoscore_model_inferences_total", "YOLO model inferences by model", ("model",))
+        )
+        self.queue_depth = self.registry.register(
+            Gauge("autoscore_request_queue_depth", "Requests received but not yet answered")
+        )
+        self.ready = self.registry.register(
+            Gauge("autoscore_ready", "Whether the models are loaded and warmed up and the server accepts requests")
+        )
+        self.active_connections = self.registry.register(
+            Gauge("autoscore_active_connections", "Currently open WebSocket connections")
+        )
+        self.cache_lookups = self.registry.register(
+            Counter("autoscore_result_cache_lookups_total", "Result cache lookups by outcome", ("outcome",))
+        )
+        self.cache_hit_ratio = self.registry.register(
+            Gauge("autoscore_result_cache_hit_ratio", "Ratio of frames answered from the result cache")
+        )
+        self.perceptual_lookups = self.registry.register(
+            Counter(
+                "autoscore_result_cache_perceptual_lookups_total",
+                "Lookups of a near-duplicate frame to reuse its crop and calibration by outcome",
+                ("outcome",),
+            )
+        )
+        self.loop_lag = self.registry.register(
+            Histogram("autoscore_event_loop_lag_seconds", "Delay of the event loop in waking up a periodic task", buckets=LOOP_LAG_BUCKETS)
+        )
+        self.loop_blocks = self.registry.register(
+            Counter("autoscore_event_loop_blocked_total", "Times the event loop was blocked longer than the watchdog threshold")
+        )
+        self.scheduler_wait = self.registry.register(
+            Histogram("autoscore_scheduler_wait_seconds", "Time detection requests wait for an inference worker", ("priority",))
+        )
+        self.expired_requests = self.registry.register(
+            Counter(
+                "autoscore_expired_requests_total", "Detection requests dropped before a pipeline stage after their deadline", ("stage",)
+            )
+        )
+        self.quality_level = self.registry.register(
+            Gauge("autoscore_quality_level", "Active level of the quality ladder, 0 is full quality")
+        )
+        self.admission_rejections = self.registry.register(
+            Counter("autoscore_admission_rejections_total", "Connections and requests rejected by admission control by reason", ("reason",))
+        )
+        self.inflight_bytes = self.registry.register(
+            Gauge("autoscore_inflight_bytes", "Total size of received messages that were not answered yet")
+        )
+        self.cache_entries = self.registry.register(Gauge("autoscore_result_cache_entries", "Entries in the result cache"))
+        self.cache_size = self.registry.register(Gauge("autoscore_result_cache_size_bytes", "Estimated size of the result cache"))
+
+    def record_request(self, request_type: RequestType, result_code: Optional[ResultCode], latency: Optional[float] = None) -> None:
+        """Count a processed request and observe its latency in seconds."""
+        self.requests.inc(request_type=request_type.value, result_code=result_code.name if result_code else NO_RESULT_CODE)
+        if latency is not None:
+            self.request_latency.observe(latency, request_type=request_type.value)
+
+    def record_stage_timings(self, stage_timings: Optional[StageTimings]) -> None:
+        """Observe the stage latencies of a processed frame and count the model inferences it needed."""
+        if stage_timings is None:
+            return
+        for stage in PipelineStage:
+            duration = getattr(stage_timings, stage.value)
+            if duration is None:
+                continue
+            self.stage_latency.observe(duration, stage=stage.value)
+            if stage in INFERENCE_STAGES:
+                self.model_inferences.inc(model=INFERENCE_STAGES[stage])
+
+    def record_loop_lag(self, lag: float) -> None:
+        """Observe the scheduling lag of the event loop in seconds."""
+        self.loop_lag.observe(lag)
+
+    def record_loop_block(self) -> None:
+        """Count a stall of the event loop above the watchdog threshold."""
+        self.loop_blocks.inc()
+
+    def record_scheduler_wait(self, priority: str, seconds: float) -> None:
+        """Observe how long a request of a scheduling class waited for an inference worker."""
+        self.scheduler_wait.observe(seconds, priority=priority)
+
+    def record_expired(self, stage: PipelineStage) -> None:
+        """Count a detection request dropped before a pipeline stage because its deadline passed."""
+        self.expired_requests.inc(stage=stage.value)
+
+    def record_quality_level(self, level: int) -> None:
+        """Set the active level of the quality ladder."""
+        self.quality_level.set(level)
+
+    def record_admission_rejection(self, reason: str) -> None:
+        """Count a connection or request rejected by admission control."""
+        self.admission_rejections.inc(reason=reason)
+
+    def mark_ready(self, *, ready: bool = True) -> None:
+        """Mark the server as ready or not ready to serve requests."""
+        self.ready.set(1.0 if ready else 0.0)
+
+    @property
+    def is_ready(self) -> bool:
+        """Whether the server was marked as ready."""
+        return self.ready.value() > 0
+
+    def track_connections(self, connection_count: Callable[[], int]) -> None:
+        """Read the number of active connections from a callback on every collection."""
+        self.active_connections.set_function(connection_count)
+
+    def track_inflight_bytes(self, inflight_bytes: Callable[[], int]) -> None:
+        """Read the size of the messages in flight from a callback on every collection."""
+        self.inflight_bytes.set_function(inflight_bytes)
+
+    def track_result_cache(self, cache_statistics: Callable[[], CacheStatistics]) -> None:
+        """Mirror the result cache counters on every collection."""
+
+        def collect() -> None:
+            statistics = cache_statistics()
+            self.cache_lookups.set_total(statistics.hits, outcome="hit")
+            self.cache_lookups.set_total(statistics.misses, outcome="miss")
+            self.perceptual_lookups.set_total(statistics.perceptual_hits, outcome="hit")
+            self.perceptual_lookups.set_total(statistics.perceptual_misses, outcome="miss")
+            self.cache_hit_ratio.set(statistics.hit_rate)
+            self.cache_entries.set(statistics.entries)
+            self.cache_size.set(statistics.size_bytes)
+
+        self.registry.add_collector(collect)
@@ -0,0 +1,313 @@
+"""Contains configurations for the autoscore WebSocket server."""
+
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel, Field, PositiveFloat
+
+
+class QualityLevel(BaseModel):
+    """Step of the quality ladder trading detection quality for throughput while the server is overloaded."""
+
+    inference_size: Optional[int] = Field(
+        default=None,
+        ge=32,
+        description="Input size of the dart model, None runs it at the size it was trained at",
+    )
+    crop_every_n_frames: int = Field(
+        default=1,
+        ge=1,
+        description="Run the cropping model on every n-th frame of a session and reuse its last dartboard crop in between",
+    )
+    perceptual_max_distance: Optional[int] = Field(
+        default=None,
+        ge=0,
+        description="Reuse the cached crop and calibration of frames within this perceptual hash distance and only run the dart model, "
+        "None keeps the result cache settings",
+    )
+    max_queued_per_session: Optional[int] = Field(
+        default=None,
+        ge=1,
+        description="Maximum detection requests of a session waiting for a worker, None keeps scheduler_max_queued_per_session",
+    )
+
+
+def _default_quality_ladder() -> List[QualityLevel]:
+    return [
+        QualityLevel(),
+        QualityLevel(inference_size=640, crop_every_n_frames=4, perceptual_max_distance=4, max_queued_per_session=4),
+        QualityLevel(inference_size=480, crop_every_n_frames=16, perceptual_max_distance=8, max_queued_per_session=2),
+    ]
+
+
+class ServerConfig(BaseModel):
+    """Configurations for the autoscore WebSocket server."""
+
+    host: str = Field(
+        default="0.0.0.0",  # noqa: S104
+        description="Host interface the WebSocket server binds to",
+    )
+    port: int = Field(
+        default=8765,
+        ge=1,
+        le=65535,
+        description="Port of the WebSocket server",
+    )
+    max_message_size: int = Field(
+        default=20 * 1024 * 1024,
+        ge=1,
+        description="Maximum size in bytes of a single incoming WebSocket message",
+    )
+    max_queued_messages: int = Field(
+        default=4,
+        ge=1,
+        description="Incoming messages buffered per connection before reading from the socket pauses",
+    )
+    max_inflight_bytes: int = Field(
+        default=256 * 1024 * 1024,
+        ge=1,
+        description="Maximum total size in bytes of received messages not yet answered, further messages are rejected",
+    )
+    max_connections: int = Field(
+        default=256,
+        ge=1,
+        description="Maximum open WebSocket connections, further connections are rejected with 503 and a Retry-After header",
+    )
+    max_connections_per_ip: int = Field(
+        default=32,
+        ge=1,
+        description="Maximum open WebSocket connections from a single client address",
+    )
+    connection_retry_after_seconds: int = Field(
+        default=5,
+        ge=1,
+        description="Seconds a rejected client is asked to wait before connecting again",
+    )
+    session_frame_rate: float = Field(
+        default=30.0,
+        gt=0.0,
+        description="Detection requests per second a session may send on average, further requests are rejected",
+    )
+    session_frame_burst: int = Field(
+        default=30,
+        ge=1,
+        description="Detection requests a session may send at once above its frame rate",
+    )
+    ip_frame_rate: float = Field(
+        default=120.0,
+        gt=0.0,
+        description="Detection requests per second all sessions of a client address may send on average",
+    )
+    ip_frame_burst: int = Field(
+        default=120,
+        ge=1,
+        description="Detection requests all sessions of a client address may send at once above their frame rate",
+    )
+    idle_timeout_seconds: Optional[float] = Field(
+        default=300.0,
+        gt=0.0,
+        description="Close connections that sent no message for this many seconds, disabled if not set",
+    )
+    ping_interval_seconds: Optional[float] = Field(
+        default=20.0,
+        gt=0.0,
+        description="Interval in seconds at which connections are pinged to detect half-open connections, disabled if not set",
+    )
+    ping_timeout_seconds: Optional[float] = Field(
+        default=20.0,
+        gt=0.0,
+        description="Close connections that do not answer a ping within this many seconds",
+    )
+    metrics_enabled: bool = Field(
+        default=True,
+        description="Serve metrics in the Prometheus text format on a local HTTP endpoint",
+    )
+    metrics_host: str = Field(
+        default="127.0.0.1",
+        description="Host interface the metrics endpoint binds to",
+    )
+    metrics_port: int = Field(
+        default=8766,
+        ge=1,
+        le=65535,
+        description="Port of the metrics endpoint",
+    )
+    inference_workers: int = Field(
+        default=1,
+        ge=1,
+        description="Worker threads running detections off the event loop, each loads its own copy of the models",
+    )
+    pipeline_window: int = Field(
+        default=1,
+        ge=1,
+        description="Maximum requests with a request_id processed concurrently per connection, 1 answers every request in order",
+    )
+    scheduler_max_session_share: float = Field(
+        default=0.5,
+        gt=0.0,
+        le=1.0,
+        description="Maximum share of the inference workers a single session may occupy, at least one worker",
+    )
+    scheduler_max_queued_per_session: int = Field(
+        default=8,
+        ge=1,
+        description="Maximum detection requests of a session waiting for a worker, further requests are rejected",
+    )
+    scheduler_session_weights: Dict[str, PositiveFloat] = Field(
+        default_factory=dict,
+        description="Relative share of the inference workers per session id when sessions compete, sessions not listed have weight 1",
+    )
+    quality_ladder_enabled: bool = Field(
+        default=True,
+        description="Step down the quality ladder while the server is overloaded and back up once the load falls",
+    )
+    quality_ladder: List[QualityLevel] = Field(
+        default_factory=_default_quality_ladder,
+        min_length=1,
+        description="Quality levels from full quality down to the cheapest detection, the first level is used without load",
+    )
+    quality_ladder_interval_seconds: float = Field(
+        default=1.0,
+        gt=0.0,
+        description="Interval in seconds at which the load is checked and the quality level changed by at most one step",
+    )
+    quality_step_down_queue_depth: int = Field(
+        default=8,
+        ge=1,
+        description="Step down a quality level when at least this many requests are received but not yet answered",
+    )
+    quality_step_down_loop_lag_seconds: float = Field(
+        default=0.1,
+        gt=0.0,
+        description="Step down a quality level when the event loop lags behind by at least this many seconds",
+    )
+    quality_step_up_queue_depth: int = Field(
+        default=2,
+        ge=0,
+        description="Step back up a quality level once at most this many requests wait and the loop lag is low again",
+    )
+    quality_step_up_loop_lag_seconds: float = Field(
+        default=0.02,
+        ge=0.0,
+        description="Step back up a quality level once the event loop lag is at most this many seconds and few requests wait",
+    )
+    local_socket_path: Optional[Path] = Field(
+        default=None,
+        description="Unix domain socket for co-located producers passing raw frames through shared memory, disabled if not set",
+    )
+    capture_suggestions_enabled: bool = Field(
+        default=True,
+        description="Suggest a dartboard region and resolution in detection responses, so clients can upload pre-cropped frames",
+    )
+    loop_watchdog_enabled: bool = Field(
+        default=True,
+        description="Measure the event loop lag and log the stack of calls blocking the loop",
+    )
+    loop_watchdog_interval_seconds: float = Field(
+        default=0.1,
+        gt=0.0,
+        description="Interval in seconds at which the event loop lag is measured",
+    )
+    loop_block_threshold_seconds: float = Field(
+        default=0.25,
+        gt=0.0,
+        description="Log the stack of the event loop thread when it is blocked longer than this many seconds",
+    )
+    model_cache_dir: Optional[Path] = Field(
+        default=None,
+        description="Directory to cache fused YOLO models in for faster restarts, disabled if not set",
+    )
+    model_warmup_runs: int = Field(
+        default=1,
+        ge=0,
+        description="Number of warm-up inferences per model before the server reports readiness",
+    )
+    traffic_recording_path: Optional[Path] = Field(
+        default=None,
+        description="Append all received requests and sent responses to this file for later replay, disabled if not set",
+    )
+    traffic_recording_max_bytes: int = Field(
+        default=1024 * 1024 * 1024,
+        ge=1,
+        description="Stop recording traffic once the recording file reaches this size in bytes",
+    )
+    profile_every_n: int = Field(
+        default_factory=lambda: int(os.environ.get("AUTOSCORE_PROFILE_EVERY_N", "0")),
+        ge=0,
+        description="Profile one in every n detection requests with cProfile, 0 disables profiling. "
+        "Defaults to the AUTOSCORE_PROFILE_EVERY_N environment variable",
+    )
+    profile_dir: Path = Field(
+        default=Path("profiles"),
+        description="Directory request profiles are written to",
+    )
+    profile_max_files: int = Field(
+        default=20,
+        ge=1,
+        description="Maximum number of request profiles kept in the profile directory, the oldest are removed first",
+    )
+    profiling_requests_enabled: bool = Field(
+        default=False,
+        description="Allow clients to change the profiling interval at runtime with PROFILING requests",
+    )
+    result_cache_enabled: bool = Field(
+        default=True,
+        description="Enable caching of detection results for frames that were already processed",
+    )
+    result_cache_max_entries: int = Field(
+        default=256,
+        ge=1,
+        description="Maximum number of detection results kept in the result cache",
+    )
+    result_cache_max_bytes: int = Field(
+        default=16 * 1024 * 1024,
+        ge=1,
+        description="Maximum estimated memory in bytes used by cached detection results",
+    )
+    result_cache_ttl_seconds: float = Field(
+        default=300.0,
+        gt=0.0,
+        description="Time in seconds after which a cached detection result expires",
+    )
+    result_cache_session_scoped: bool = Field(
+        default=True,
+        description="Only reuse cached detection results within the session that produced them",
+    )
+    negative_cache_enabled: bool = Field(
+        default=True,
+        description="Answer frames of a session without detection while it backs off after frames without a dartboard",
+    )
+    negative_cache_initial_backoff_seconds: float = Field(
+        default=0.25,
+        gt=0.0,
+        description="Time in seconds frames are skipped after the first rejected frame, doubled for every further rejected frame",
+    )
+    negative_cache_max_backoff_seconds: float = Field(
+        default=2.0,
+        gt=0.0,
+        description="Maximum time in seconds frames are skipped before a session is checked again",
+    )
+    perceptual_cache_enabled: bool = Field(
+        default=False,
+        description="Reuse the cached crop and calibration of near-duplicate frames based on a perceptual hash, darts are always detected",
+    )
+    perceptual_hash_size: int = Field(
+        default=16,
+        ge=4,
+        le=64,
+        description="Edge length of the difference hash grid, the hash has hash_size^2 bits",
+    )
+    perceptual_hash_max_distance: int = Field(
+        default=4,
+        ge=0,
+        description="Maximum hamming distance between perceptual hashes to treat frames as near-duplicates",
+    )
+
+    @classmethod
+    def from_json(cls, json_path: Path) -> "ServerConfig":
+        """Load configuration from a JSON file."""
+        with Path.open(json_path, encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(**data)
@@ -2,10 +2,11 @@
 
 from abc import ABC
 from enum import Enum
-from typing import TypeVar
+from typing import List, Optional, TypeVar
 
-from detector.model.detection_models import CalibrationResult
-from pydantic import BaseModel, ConfigDict
+from detector.model.detection_models import CalibrationResult, YoloDetection
+from detector.model.image_models import CropInformation
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class RequestType(Enum):
@@ -15,6 +16,8 @@ class RequestType(Enum):
     SCORING = "SCORING"
     PING = "PING"
     FULL = "FULL"
+    DETECTIONS = "DETECTIONS"
+    PROFILING = "PROFILING"
     NONE = "NONE"
 
 
@@ -25,6 +28,10 @@ class BaseRequest(ABC, BaseModel):
     request_type: RequestType
     session_id: str
     player_id: str | None = None
+    request_id: str | None = Field(
+        default=None,
+        description="Client chosen id echoed in the response, requests with an id may be answered out of order",
+    )
 
 
 class PingRequest(BaseRequest):
@@ -46,10 +53,55 @@ class CalibrationRequest(BaseRequest):
     image: str
 
 
-class PipelineDetectionRequest(BaseRequest):
+class FrameRequest(BaseRequest):
+    """Base class for requests to detect darts in a single frame."""
+
+    roi: Optional[CropInformation] = Field(
+        default=None,
+        description="Region of the full frame the image was cropped to by the client, the server then skips cropping the dartboard",
+    )
+    deadline: Optional[float] = Field(
+        default=None,
+        description="Unix time in seconds after which the result is no longer useful, the frame is dropped once it passed",
+    )
+    max_age: Optional[float] = Field(
+        default=None,
+        gt=0,
+        description="Seconds after the server received the frame after which it is dropped",
+    )
+
+
+class PipelineDetectionRequest(FrameRequest):
     """Request model for pipeline detection operations."""
 
     image: str
+    stream: bool = Field(
+        default=False,
+        description="Send a progress response after the board was located and after it was calibrated, before the final response",
+    )
+
+
+class DetectionsRequest(BaseRequest):
+    """Request model for scoring detections of a model that runs on the client."""
+
+    detections: List[YoloDetection] = Field(
+        max_length=256,
+        description="Calibration point and dart detections with centers normalized to the image the client ran the model on",
+    )
+
+
+class LocalFrameRequest(FrameRequest):
+    """Request model for detecting darts in a raw BGR frame in a slot of a shared memory frame ring."""
+
+    slot: int = Field(ge=0)
+    height: int = Field(gt=0)
+    width: int = Field(gt=0)
+
+
+class ProfilingRequest(BaseRequest):
+    """Request model to change the request profiling interval at runtime."""
+
+    every_n: int = Field(ge=0)
 
 
 REQ = TypeVar("REQ", bound=BaseRequest)
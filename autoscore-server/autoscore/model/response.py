@@ -2,10 +2,11 @@
 
 from abc import ABC
 from enum import Enum
-from typing import Optional, TypeVar
+from typing import Optional, Tuple, TypeVar
 
-from detector.model.detection_models import CalibrationResult, DetectionResult, ScoringResult
-from pydantic import BaseModel, ConfigDict
+from detector.model.detection_models import CalibrationResult, DetectionProgress, DetectionResult, ScoringResult
+from detector.model.image_models import CropInformation
+from pydantic import BaseModel, ConfigDict, Field
 
 from autoscore.model.request import RequestType
 
@@ -15,6 +16,7 @@ class Status(Enum):
 
     SUCCESS = 0
     ERROR = 1
+    EXPIRED = 2
 
     @property
     def message(self) -> str:
@@ -22,6 +24,7 @@ class Status(Enum):
         messages = {
             0: "Success",
             1: "Error",
+            2: "Expired",
         }
         return messages[self.value]
 
@@ -35,10 +38,13 @@ class BaseResponse(ABC, BaseModel):
     status: Status
     message: Optional[str] = None
     player_id: str | None = None
+    request_id: str | None = None
+
 
 class ErrorResponse(BaseResponse):
     """Response model for error responses."""
 
+    retry_after: Optional[float] = Field(default=None, description="Seconds after which a rejected request may be sent again")
 
 
 class PingResponse(BaseResponse):
@@ -59,10 +65,33 @@ class ScoringResponse(BaseResponse):
     scoring_result: ScoringResult
 
 
+class CaptureSuggestion(BaseModel):
+    """Region and resolution a client can capture frames at, so it only uploads the pixels the detection uses."""
+
+    roi: CropInformation = Field(description="Region of the full frame containing the dartboard, in full frame pixels")
+    resolution: Tuple[int, int] = Field(description="Resolution as 'width,height' to scale the region to before uploading it")
+
+
 class PipelineDetectionResponse(BaseResponse):
     """Response model for pipeline detection responses."""
 
     detection_result: DetectionResult
+    cached: bool = False
+    capture_suggestion: Optional[CaptureSuggestion] = None
+    quality_level: int = Field(default=0, description="Level of the quality ladder the frame was processed at, 0 is full quality")
+
+
+class DetectionProgressResponse(BaseResponse):
+    """Response model for the intermediate stages of a streamed pipeline detection, followed by the final response."""
+
+    progress: DetectionProgress
+
+
+class ProfilingResponse(BaseResponse):
+    """Response model for profiling responses."""
+
+    every_n: int
+    profile_dir: str
 
 
 RES = TypeVar("RES", bound=BaseResponse)
@@ -0,0 +1 @@
+"""Service package containing server side request processing services."""
@@ -0,0 +1,24 @@
+"""Suggests the region and resolution clients should capture frames at after the dartboard was found."""
+
+from typing import Optional, Tuple
+
+from autoscore.model.response import CaptureSuggestion
+from detector.model.detection_models import DetectionResult
+
+
+class CaptureSuggester:
+    """Derives a capture suggestion from the dartboard crop of a successful detection."""
+
+    def __init__(self, target_image_size: Tuple[int, int]) -> None:
+        self.__target_width, self.__target_height = target_image_size
+
+    def suggest(self, detection_result: DetectionResult) -> Optional[CaptureSuggestion]:
+        """Suggest the dartboard crop of the frame, or None if the client should keep uploading full frames."""
+        if not detection_result.success or detection_result.preprocessing_result is None:
+            return None
+        roi = detection_result.preprocessing_result.crop_info
+        if roi is None or roi.width <= 0 or roi.height <= 0:
+            return None
+        # The crop is resized to the model input size, more pixels than that are uploaded and decoded for nothing
+        resolution = (min(roi.width, self.__target_width), min(roi.height, self.__target_height))
+        return CaptureSuggestion(roi=roi, resolution=resolution)
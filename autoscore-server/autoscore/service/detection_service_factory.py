@@ -0,0 +1,52 @@
+"""Factory for building fully loaded and warmed up dart detection services."""
+
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from detector.model.configuration import ProcessingConfig
+from detector.service.calibration.board_calibration_service import DartBoardCalibrationService
+from detector.service.dart_image_scoring_service import DartInImageScoringService
+from detector.service.image_preprocessor import ImagePreprocessor
+from detector.service.scoring.dart_scoring_service import DartScoringService
+from detector.yolo.dart_detector import YoloDartImageProcessor
+
+logger = logging.getLogger("DetectionServiceFactory")
+
+
+def create_detection_service(config: ProcessingConfig, warmup_runs: int = 1) -> DartInImageScoringService:
+    """Load the dartboard and dart models in parallel, warm them up and wire the detection service."""
+    start_time = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=2, thread_name_prefix="model-loader") as executor:
+        dart_processor_future = executor.submit(YoloDartImageProcessor, config)
+        preprocessor_future = executor.submit(ImagePreprocessor, config)
+        yolo_dart_image_processor = dart_processor_future.result()
+        image_preprocessor = preprocessor_future.result()
+
+        if warmup_runs > 0:
+            warmups = [
+                executor.submit(yolo_dart_image_processor.warmup, warmup_runs),
+                executor.submit(image_preprocessor.warmup, warmup_runs),
+            ]
+            for warmup in warmups:
+                warmup.result()
+
+    calibration_service = DartBoardCalibrationService(
+        config=config,
+        yolo_image_processor=yolo_dart_image_processor,
+        image_preprocessor=image_preprocessor,
+    )
+    scoring_service = DartScoringService(
+        config=config,
+        yolo_image_processor=yolo_dart_image_processor,
+        image_preprocessor=image_preprocessor,
+    )
+    detection_service = DartInImageScoringService(
+        config=config,
+        yolo_image_processor=yolo_dart_image_processor,
+        calibration_service=calibration_service,
+        dart_scoring_service=scoring_service,
+        image_preprocessor=image_preprocessor,
+    )
+    logger.info("Detection service loaded and warmed up in %.2f seconds", time.perf_counter() - start_time)
+    return detection_service
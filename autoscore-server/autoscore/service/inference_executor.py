@@ -0,0 +1,49 @@
+"""Executor running blocking detection work off the event loop with one detection service per worker thread."""
+
+import asyncio
+import logging
+import queue
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Sequence, TypeVar
+
+from detector.service.dart_image_scoring_service import DartInImageScoringService
+
+T = TypeVar("T")
+
+
+class InferenceExecutor:
+    """Runs detections on worker threads, lending each call a detection service no other thread is using."""
+
+    logger = logging.getLogger(__qualname__)
+
+    def __init__(self, detection_services: Sequence[DartInImageScoringService]) -> None:
+        if not detection_services:
+            msg = "At least one detection service is required"
+            raise ValueError(msg)
+        # The YOLO models are not thread-safe, so every worker thread needs a service of its own
+        self.__idle_services: queue.SimpleQueue[DartInImageScoringService] = queue.SimpleQueue()
+        for detection_service in detection_services:
+            self.__idle_services.put(detection_service)
+        self.__workers = len(detection_services)
+        self.__executor = ThreadPoolExecutor(max_workers=self.__workers, thread_name_prefix="inference")
+
+    @property
+    def workers(self) -> int:
+        """Get the number of worker threads."""
+        return self.__workers
+
+    async def run(self, function: Callable[[DartInImageScoringService], T]) -> T:
+        """Run a blocking function with an idle detection service on a worker thread without blocking the event loop."""
+        return await asyncio.get_running_loop().run_in_executor(self.__executor, self.__run_with_service, function)
+
+    def close(self) -> None:
+        """Stop the worker threads once the running detections are done."""
+        self.__executor.shutdown(wait=False, cancel_futures=True)
+
+    def __run_with_service(self, function: Callable[[DartInImageScoringService], T]) -> T:
+        # There are as many services as worker threads, so an idle service is always available here
+        detection_service = self.__idle_services.get()
+        try:
+            return function(detection_service)
+        finally:
+            self.__idle_services.put(detection_service)
@@ -0,0 +1,70 @@
+"""Per-session cache of rejected frames that skips detection with an exponential back-off."""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+from autoscore.model.configuration import ServerConfig
+from detector.model.detection_models import DetectionResult
+from detector.model.detection_result_code import REJECTED_FRAME_CODES, ResultCode
+
+MAX_SESSIONS = 1024
+MAX_BACKOFF_DOUBLINGS = 32
+
+
+@dataclass
+class _Rejection:
+    result_code: ResultCode
+    consecutive: int
+    retry_at: float
+
+
+class NegativeResultCache:
+    """Remembers sessions whose frames show no dartboard and answers their next frames without detection."""
+
+    logger = logging.getLogger(__qualname__)
+
+    def __init__(self, config: Optional[ServerConfig] = None) -> None:
+        self.__config = config or ServerConfig()
+        self.__rejections: OrderedDict[str, _Rejection] = OrderedDict()
+        self.__lock = threading.Lock()
+
+    def get(self, session_id: str) -> Optional[DetectionResult]:
+        """Get a rejected result for the session if it is still backing off, or None if the frame has to be checked."""
+        with self.__lock:
+            rejection = self.__rejections.get(session_id)
+            if rejection is None:
+                return None
+            remaining = rejection.retry_at - time.monotonic()
+            if remaining <= 0:
+                return None
+        return DetectionResult(
+            processing_time=0.0,
+            result_code=rejection.result_code,
+            message=rejection.result_code.message,
+            details=f"Skipped after {rejection.consecutive} rejected frames, checking again in {remaining:.2f}s",
+        )
+
+    def record(self, session_id: str, result: DetectionResult) -> None:
+        """Back off further after a rejected frame and forget the session once a frame is not rejected."""
+        if result.result_code is ResultCode.DEADLINE_EXCEEDED:
+            # The frame was dropped before it was checked, so it neither confirms nor clears a rejection
+            return
+        with self.__lock:
+            if result.result_code not in REJECTED_FRAME_CODES:
+                self.__rejections.pop(session_id, None)
+                return
+
+            previous = self.__rejections.pop(session_id, None)
+            consecutive = previous.consecutive + 1 if previous else 1
+            backoff = min(
+                self.__config.negative_cache_max_backoff_seconds,
+                self.__config.negative_cache_initial_backoff_seconds * 2 ** min(consecutive - 1, MAX_BACKOFF_DOUBLINGS),
+            )
+            self.__rejections[session_id] = _Rejection(result.result_code, consecutive, time.monotonic() + backoff)
+            if len(self.__rejections) > MAX_SESSIONS:
+                self.__rejections.popitem(last=False)
+        self.logger.debug("Frame %d of session %s was rejected, skipping frames for %.2fs", consecutive, session_id, backoff)
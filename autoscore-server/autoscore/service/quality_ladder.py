@@ -0,0 +1,71 @@
+"""Quality ladder that degrades detection step by step while the server is overloaded."""
+
+import asyncio
+import contextlib
+import logging
+import time
+from typing import Optional, Tuple
+
+from autoscore.metrics.server_metrics import ServerMetrics
+from autoscore.model.configuration import QualityLevel, ServerConfig
+
+
+class QualityLadder:
+    """Steps down to cheaper quality levels as the request queue or the event loop lag grows and back up once the load falls."""
+
+    logger = logging.getLogger(__qualname__)
+
+    def __init__(self, config: Optional[ServerConfig] = None, metrics: Optional[ServerMetrics] = None) -> None:
+        self.__config = config or ServerConfig()
+        self.__metrics = metrics or ServerMetrics()
+        self.__levels = self.__config.quality_ladder
+        self.__index = 0
+        self.__task: Optional[asyncio.Task[None]] = None
+        self.__metrics.record_quality_level(0)
+
+    @property
+    def current(self) -> Tuple[int, QualityLevel]:
+        """Get the index of the active quality level, 0 being full quality, and its settings."""
+        index = self.__index
+        return index, self.__levels[index]
+
+    def update(self, queue_depth: float, loop_lag: float) -> int:
+        """Move at most one level down on high load or one level up on low load and return the active level."""
+        config = self.__config
+        if queue_depth >= config.quality_step_down_queue_depth or loop_lag >= config.quality_step_down_loop_lag_seconds:
+            index = min(self.__index + 1, len(self.__levels) - 1)
+        elif queue_depth <= config.quality_step_up_queue_depth and loop_lag <= config.quality_step_up_loop_lag_seconds:
+            index = max(self.__index - 1, 0)
+        else:
+            # Between the thresholds the level is kept, so it does not flap with every small change in load
+            index = self.__index
+        if index != self.__index:
+            self.logger.info(
+                "Quality level %d -> %d with %d requests waiting and %.0fms event loop lag",
+                self.__index,
+                index,
+                queue_depth,
+                loop_lag * 1000,
+            )
+            self.__index = index
+            self.__metrics.record_quality_level(index)
+        return index
+
+    async def start(self) -> None:
+        """Start checking the load of the running event loop periodically."""
+        self.__task = asyncio.create_task(self.__run(), name="quality-ladder")
+
+    async def stop(self) -> None:
+        """Stop checking the load."""
+        if self.__task is not None:
+            self.__task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self.__task
+            self.__task = None
+
+    async def __run(self) -> None:
+        interval = self.__config.quality_ladder_interval_seconds
+        while True:
+            expected_wakeup = time.monotonic() + interval
+            await asyncio.sleep(interval)
+            self.update(self.__metrics.queue_depth.value(), max(0.0, time.monotonic() - expected_wakeup))
@@ -0,0 +1,88 @@
+"""Sampling profiler that captures cProfile profiles of every n-th request."""
+
+import cProfile
+import itertools
+import json
+import logging
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+from detector.model.timing_models import StageTimings
+
+PROFILE_SUFFIX = ".prof"
+UNSAFE_FILE_NAME_CHARACTERS = re.compile(r"[^A-Za-z0-9_.-]")
+
+
+class RequestProfiler:
+    """Profiles one in every n requests and keeps the most recent profiles in a bounded directory."""
+
+    logger = logging.getLogger(__qualname__)
+
+    def __init__(self, output_dir: Path, every_n: int = 0, max_profiles: int = 20) -> None:
+        self.__output_dir = output_dir
+        self.__max_profiles = max_profiles
+        self.__every_n = every_n
+        self.__requests = itertools.count()
+        self.__lock = threading.Lock()
+        self.__create_output_dir()
+
+    @property
+    def every_n(self) -> int:
+        """Get the sampling interval, 0 if profiling is disabled."""
+        return self.__every_n
+
+    @property
+    def output_dir(self) -> Path:
+        """Get the directory profiles are written to."""
+        return self.__output_dir
+
+    def configure(self, every_n: int) -> None:
+        """Profile one in every n requests from now on, or disable profiling with 0."""
+        self.__every_n = max(0, every_n)
+        self.__requests = itertools.count()
+        self.__create_output_dir()
+        self.logger.info("Profiling %s", f"1 in {every_n} requests to {self.__output_dir}" if every_n else "disabled")
+
+    def start(self) -> Optional[cProfile.Profile]:
+        """Start profiling the current request if it is sampled, otherwise return None."""
+        every_n = self.__every_n
+        if not every_n or next(self.__requests) % every_n:
+            return None
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # Another profiler is already active on this thread, e.g. of an overlapping request
+            return None
+        return profile
+
+    def finish(self, profile: cProfile.Profile, session_id: str, stage_timings: Optional[StageTimings]) -> None:
+        """Stop the profile and write it together with the session id and stage timings of the request."""
+        profile.disable()
+        now_ns = time.time_ns()
+        timestamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(now_ns / 1e9))
+        file_stem = f"{timestamp}-{now_ns % 1_000_000_000:09d}-{UNSAFE_FILE_NAME_CHARACTERS.sub('_', session_id)}"
+        with self.__lock:
+            profile.dump_stats(self.__output_dir / f"{file_stem}{PROFILE_SUFFIX}")
+            metadata = {
+                "session_id": session_id,
+                "stage_timings": stage_timings.model_dump(mode="json") if stage_timings else None,
+                "total": stage_timings.total if stage_timings else None,
+            }
+            (self.__output_dir / f"{file_stem}.json").write_text(json.dumps(metadata, indent=2), encoding="utf-8")
+            self.__remove_oldest_profiles()
+        self.logger.info("Wrote request profile %s", file_stem)
+
+    def __create_output_dir(self) -> None:
+        """Create the profile directory once profiling is enabled, so servers that never profile leave no empty directory."""
+        if self.__every_n:
+            self.__output_dir.mkdir(parents=True, exist_ok=True)
+
+    def __remove_oldest_profiles(self) -> None:
+        profiles = sorted(self.__output_dir.glob(f"*{PROFILE_SUFFIX}"))
+        for profile_path in profiles[: max(0, len(profiles) - self.__max_profiles)]:
+            profile_path.unlink(missing_ok=True)
+            profile_path.with_suffix(".json").unlink(missing_ok=True)
@@ -0,0 +1,158 @@
+"""Scheduler sharing the inference workers fairly between sessions, with cheap requests going first."""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Callable, Deque, Dict, Optional, TypeVar
+
+from autoscore.metrics.server_metrics import ServerMetrics
+from autoscore.model.configuration import ServerConfig
+from autoscore.service.inference_executor import InferenceExecutor
+from detector.service.dart_image_scoring_service import DartInImageScoringService
+
+T = TypeVar("T")
+
+
+class RequestPriority(Enum):
+    """Scheduling classes, interactive requests are dispatched before any bulk request."""
+
+    INTERACTIVE = "interactive"
+    BULK = "bulk"
+
+
+class SessionQueueFullError(RuntimeError):
+    """Raised when a session already has the maximum number of requests waiting for a worker."""
+
+
+@dataclass
+class _Job:
+    session_id: str
+    priority: RequestPriority
+    # Resolved by the dispatcher once the job may use a worker
+    turn: "asyncio.Future[None]"
+    enqueued_at: float = field(default_factory=time.perf_counter)
+
+
+@dataclass
+class _Session:
+    weight: float
+    queue: Deque[_Job] = field(default_factory=deque)
+    deficit: float = 0.0
+    in_flight: int = 0
+
+
+class RequestScheduler:
+    """Dispatches requests to the inference workers with deficit round robin across per-session queues."""
+
+    logger = logging.getLogger(__qualname__)
+
+    def __init__(
+        self, inference_executor: InferenceExecutor, config: Optional[ServerConfig] = None, metrics: Optional[ServerMetrics] = None
+    ) -> None:
+        self.__inference_executor = inference_executor
+        self.__config = config or ServerConfig()
+        self.__metrics = metrics or ServerMetrics()
+        self.__max_in_flight_per_session = max(1, int(inference_executor.workers * self.__config.scheduler_max_session_share))
+        self.__interactive: Deque[_Job] = deque()
+        self.__sessions: Dict[str, _Session] = {}
+        # Sessions with queued bulk requests, in the order they get their next turn
+        self.__active: Deque[str] = deque()
+        self.__running = 0
+
+    async def run(
+        self,
+        session_id: str,
+        function: Callable[[DartInImageScoringService], T],
+        priority: RequestPriority = RequestPriority.BULK,
+        max_queued: Optional[int] = None,
+    ) -> T:
+        """Queue a blocking function of a session and run it on an inference worker once it is the session's turn."""
+        session = self.__session(session_id)
+        max_queued = max_queued or self.__config.scheduler_max_queued_per_session
+        if priority is RequestPriority.BULK and len(session.queue) >= max_queued:
+            msg = f"Session {session_id} already has {len(session.queue)} requests waiting"
+            raise SessionQueueFullError(msg)
+
+        job = _Job(session_id, priority, asyncio.get_running_loop().create_future())
+        if priority is RequestPriority.INTERACTIVE:
+            self.__interactive.append(job)
+        else:
+            if not session.queue:
+                self.__active.append(session_id)
+            session.queue.append(job)
+        self.__dispatch()
+
+        try:
+            await job.turn
+        except asyncio.CancelledError:
+            # Cancelled right after the dispatcher granted the turn, the worker slot has to be handed on
+            if job.turn.done() and not job.turn.cancelled():
+                self.__release(session_id)
+            raise
+        try:
+            return await self.__inference_executor.run(function)
+        finally:
+            self.__release(session_id)
+
+    def __dispatch(self) -> None:
+        while self.__running < self.__inference_executor.workers:
+            job = self.__next_job()
+            if job is None:
+                return
+            if job.turn.cancelled():
+                self.__forget_if_idle(job.session_id)
+                continue
+            self.__running += 1
+            self.__session(job.session_id).in_flight += 1
+            self.__metrics.record_scheduler_wait(job.priority.value, time.perf_counter() - job.enqueued_at)
+            job.turn.set_result(None)
+
+    def __next_job(self) -> Optional[_Job]:
+        if self.__interactive:
+            return self.__interactive.popleft()
+        # Sessions weighted below 1 collect their quantum over several rounds, so keep going round until one of them has it
+        eligible = True
+        while eligible:
+            eligible = False
+            for _ in range(len(self.__active)):
+                session_id = self.__active[0]
+                session = self.__sessions[session_id]
+                # A session using its share of the workers waits, so the others get the remaining workers
+                if session.in_flight >= self.__max_in_flight_per_session:
+                    self.__active.rotate(-1)
+                    continue
+                eligible = True
+                if session.deficit < 1:
+                    session.deficit += session.weight
+                if session.deficit < 1:
+                    self.__active.rotate(-1)
+                    continue
+                session.deficit -= 1
+                job = session.queue.popleft()
+                if not session.queue:
+                    self.__active.popleft()
+                    session.deficit = 0.0
+                elif session.deficit < 1:
+                    self.__active.rotate(-1)
+                return job
+        return None
+
+    def __release(self, session_id: str) -> None:
+        self.__running -= 1
+        self.__sessions[session_id].in_flight -= 1
+        self.__forget_if_idle(session_id)
+        self.__dispatch()
+
+    def __session(self, session_id: str) -> _Session:
+        session = self.__sessions.get(session_id)
+        if session is None:
+            session = self.__sessions[session_id] = _Session(weight=self.__config.scheduler_session_weights.get(session_id, 1.0))
+        return session
+
+    def __forget_if_idle(self, session_id: str) -> None:
+        session = self.__sessions.get(session_id)
+        if session is not None and not session.queue and session.in_flight == 0 and session_id not in self.__active:
+            del self.__sessions[session_id]
@@ -0,0 +1,169 @@
+"""LRU cache for detection results of frames that were already processed."""
+
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+import cv2
+import numpy as np
+from pydantic import BaseModel
+
+from autoscore.model.configuration import ServerConfig
+from detector.model.detection_models import DetectionResult
+from detector.model.detection_result_code import ResultCode
+
+GLOBAL_SCOPE = ""
+NON_CACHEABLE_RESULT_CODES = frozenset({ResultCode.YOLO_ERROR, ResultCode.UNKNOWN})
+
+
+class CacheStatistics(BaseModel):
+    """Snapshot of the result cache counters."""
+
+    hits: int = 0
+    misses: int = 0
+    perceptual_hits: int = 0
+    perceptual_misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    entries: int = 0
+    size_bytes: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Get the ratio of lookups answered with an exact cached result, near-duplicate hits still run the dart model."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+@dataclass
+class _CacheEntry:
+    result: DetectionResult
+    size_bytes: int
+    expires_at: float
+    perceptual_hash: Optional[int] = None
+
+
+class DetectionResultCache:
+    """LRU cache mapping the content hash of an encoded frame to its detection result."""
+
+    logger = logging.getLogger(__qualname__)
+
+    def __init__(self, config: Optional[ServerConfig] = None) -> None:
+        self.__config = config or ServerConfig()
+        self.__entries: OrderedDict[Tuple[str, str], _CacheEntry] = OrderedDict()
+        self.__statistics = CacheStatistics()
+        self.__lock = threading.Lock()
+
+    @property
+    def perceptual_hash_enabled(self) -> bool:
+        """Check if near-duplicate lookups based on a perceptual hash are enabled."""
+        return self.__config.perceptual_cache_enabled
+
+    @property
+    def statistics(self) -> CacheStatistics:
+        """Get a snapshot of the cache counters."""
+        with self.__lock:
+            return self.__statistics.model_copy(update={"entries": len(self.__entries)})
+
+    @staticmethod
+    def content_hash(image_bytes: bytes | memoryview) -> str:
+        """Calculate a fast content hash of the encoded image bytes or of a raw frame buffer."""
+        return hashlib.blake2b(image_bytes, digest_size=16).hexdigest()
+
+    def perceptual_hash(self, image: np.ndarray) -> int:
+        """Calculate a difference hash of the decoded image which is stable against small pixel changes."""
+        hash_size = self.__config.perceptual_hash_size
+        grayscale = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if image.ndim == 3 else image  # noqa: PLR2004
+        resized = cv2.resize(grayscale, (hash_size + 1, hash_size), interpolation=cv2.INTER_AREA)
+        bits = (resized[:, 1:] > resized[:, :-1]).flatten()
+        return int.from_bytes(np.packbits(bits).tobytes(), "big")
+
+    def get(self, session_id: str, content_hash: str) -> Optional[DetectionResult]:
+        """Get the cached result for a frame with the exact same content hash."""
+        with self.__lock:
+            key = (self.__scope(session_id), content_hash)
+            entry = self.__entries.get(key)
+            if entry is None or self.__expire_if_outdated(key, entry):
+                self.__statistics.misses += 1
+                return None
+            self.__entries.move_to_end(key)
+            self.__statistics.hits += 1
+            return entry.result
+
+    def get_similar(self, session_id: str, perceptual_hash: int, max_distance: Optional[int] = None) -> Optional[DetectionResult]:
+        """Get the calibrated result of a near-duplicate frame within max_distance bits, only its crop and calibration may be reused."""
+        if max_distance is None:
+            max_distance = self.__config.perceptual_hash_max_distance
+        with self.__lock:
+            scope = self.__scope(session_id)
+            # Expired entries are removed while searching, so iterate over a copy
+            for key, entry in list(reversed(self.__entries.items())):
+                if key[0] != scope or entry.perceptual_hash is None or not self.__is_calibrated(entry.result):
+                    continue
+                if (entry.perceptual_hash ^ perceptual_hash).bit_count() <= max_distance:
+                    if self.__expire_if_outdated(key, entry):
+                        continue
+                    self.__entries.move_to_end(key)
+                    self.__statistics.perceptual_hits += 1
+                    return entry.result
+            self.__statistics.perceptual_misses += 1
+            return None
+
+    def put(self, session_id: str, content_hash: str, result: DetectionResult, perceptual_hash: Optional[int] = None) -> None:
+        """Store a detection result, evicting the least recently used entries when a limit is exceeded."""
+        if result.result_code in NON_CACHEABLE_RESULT_CODES:
+            return
+
+        entry = _CacheEntry(
+            result=result,
+            size_bytes=len(result.model_dump_json()),
+            expires_at=time.monotonic() + self.__config.result_cache_ttl_seconds,
+            perceptual_hash=perceptual_hash,
+        )
+        if entry.size_bytes > self.__config.result_cache_max_bytes:
+            self.logger.debug("Detection result of %s bytes exceeds the cache size limit", entry.size_bytes)
+            return
+
+        with self.__lock:
+            key = (self.__scope(session_id), content_hash)
+            previous = self.__entries.pop(key, None)
+            if previous is not None:
+                self.__statistics.size_bytes -= previous.size_bytes
+            self.__entries[key] = entry
+            self.__statistics.size_bytes += entry.size_bytes
+            self.__evict()
+
+    def clear_session(self, session_id: str) -> None:
+        """Remove all cached results of a session."""
+        with self.__lock:
+            scope = self.__scope(session_id)
+            for key in [key for key in self.__entries if key[0] == scope]:
+                self.__statistics.size_bytes -= self.__entries.pop(key).size_bytes
+
+    @staticmethod
+    def __is_calibrated(result: DetectionResult) -> bool:
+        return result.calibration_result is not None and result.calibration_result.success
+
+    def __scope(self, session_id: str) -> str:
+        return session_id if self.__config.result_cache_session_scoped else GLOBAL_SCOPE
+
+    def __expire_if_outdated(self, key: Tuple[str, str], entry: _CacheEntry) -> bool:
+        if entry.expires_at > time.monotonic():
+            return False
+        del self.__entries[key]
+        self.__statistics.size_bytes -= entry.size_bytes
+        self.__statistics.expirations += 1
+        return True
+
+    def __evict(self) -> None:
+        while self.__entries and (
+            len(self.__entries) > self.__config.result_cache_max_entries
+            or self.__statistics.size_bytes > self.__config.result_cache_max_bytes
+        ):
+            _, entry = self.__entries.popitem(last=False)
+            self.__statistics.size_bytes -= entry.size_bytes
+            self.__statistics.evictions += 1
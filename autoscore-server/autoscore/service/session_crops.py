@@ -0,0 +1,54 @@
+"""Per-session memory of the dartboard crop, so the cropping model does not have to run on every frame."""
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+from detector.model.detection_models import DetectionResult
+from detector.model.detection_result_code import UNUSABLE_FRAME_CODES
+from detector.model.image_models import CropInformation
+
+MAX_SESSIONS = 1024
+
+
+@dataclass
+class _SessionCrop:
+    crop_info: CropInformation
+    frame_shape: Tuple[int, ...]
+    reused: int = 0
+
+
+class SessionCrops:
+    """Remembers the dartboard crop of the last frame of each session that the cropping model ran on."""
+
+    def __init__(self) -> None:
+        self.__crops: OrderedDict[str, _SessionCrop] = OrderedDict()
+        self.__lock = threading.Lock()
+
+    def reuse(self, session_id: str, frame_shape: Tuple[int, ...], every_n_frames: int) -> Optional[CropInformation]:
+        """Get the crop to reuse for a frame, or None if the cropping model has to run on it."""
+        if every_n_frames <= 1:
+            return None
+        with self.__lock:
+            crop = self.__crops.get(session_id)
+            # A different resolution means the camera was reconfigured, the old crop would cut off the board
+            if crop is None or crop.frame_shape != frame_shape or crop.reused >= every_n_frames - 1:
+                return None
+            crop.reused += 1
+            self.__crops.move_to_end(session_id)
+            return crop.crop_info
+
+    def record(self, session_id: str, frame_shape: Tuple[int, ...], result: DetectionResult, *, reused: bool) -> None:
+        """Remember the crop of a successful frame the cropping model ran on, or forget it once a frame shows no usable board."""
+        with self.__lock:
+            if result.result_code in UNUSABLE_FRAME_CODES:
+                # The board may have moved out of the reused crop, the next frame runs the cropping model again
+                self.__crops.pop(session_id, None)
+                return
+            if reused or not result.success or result.preprocessing_result is None or result.preprocessing_result.crop_info is None:
+                return
+            self.__crops.pop(session_id, None)
+            self.__crops[session_id] = _SessionCrop(result.preprocessing_result.crop_info, frame_shape)
+            if len(self.__crops) > MAX_SESSIONS:
+                self.__crops.popitem(last=False)
@@ -0,0 +1,146 @@
+"""Append-only recording of the WebSocket traffic of the server for later replay."""
+
+import itertools
+import logging
+import queue
+import struct
+import threading
+import time
+from dataclasses import dataclass
+from enum import Enum
+from pathlib import Path
+from typing import Any, AsyncIterator, BinaryIO, Iterator, Optional, Union, cast
+
+from websockets.asyncio.server import ServerConnection
+
+MAGIC = b"ADTR1\n"
+RECORD_HEADER = struct.Struct("<BdIHI")
+WRITE_QUEUE_SIZE = 1024
+CONNECTION_ID_RANGE = 2**32
+
+
+class TrafficDirection(Enum):
+    """Direction of a recorded message."""
+
+    REQUEST = 0
+    RESPONSE = 1
+
+
+@dataclass(frozen=True)
+class TrafficRecord:
+    """A single recorded WebSocket message."""
+
+    direction: TrafficDirection
+    timestamp: float
+    connection_id: int
+    session_id: str
+    payload: bytes
+
+
+class TrafficRecorder:
+    """Writes received requests and sent responses with their timestamps to an append-only file on a background thread."""
+
+    logger = logging.getLogger(__qualname__)
+
+    def __init__(self, path: Path, max_bytes: Optional[int] = None) -> None:
+        self.__path = path
+        self.__max_bytes = max_bytes
+        # Start ids at the current time, so connections of different server runs appended to one file do not collide
+        self.__connection_ids = itertools.count(time.time_ns() // 1_000_000)
+        self.__queue: queue.Queue[Optional[TrafficRecord]] = queue.Queue(maxsize=WRITE_QUEUE_SIZE)
+        self.__dropped = 0
+        self.__path.parent.mkdir(parents=True, exist_ok=True)
+        self.__writer = threading.Thread(target=self.__write_records, name="traffic-recorder", daemon=True)
+        self.__writer.start()
+        self.logger.info("Recording traffic to %s", self.__path)
+
+    @property
+    def dropped(self) -> int:
+        """Get the number of records that were dropped because the writer could not keep up."""
+        return self.__dropped
+
+    def new_connection_id(self) -> int:
+        """Get a unique id for a new connection, so replays can reproduce the messages per connection."""
+        return next(self.__connection_ids) % CONNECTION_ID_RANGE
+
+    def record(
+        self,
+        direction: TrafficDirection,
+        connection_id: int,
+        session_id: str,
+        message: Union[str, bytes],
+        timestamp: Optional[float] = None,
+    ) -> None:
+        """Queue a message for recording without blocking the caller."""
+        payload = message.encode("utf-8") if isinstance(message, str) else message
+        record = TrafficRecord(direction, timestamp or time.time(), connection_id, session_id, payload)
+        try:
+            self.__queue.put_nowait(record)
+        except queue.Full:
+            self.__dropped += 1
+
+    def wrap(self, websocket: ServerConnection, connection_id: int) -> ServerConnection:
+        """Wrap a connection so every message sent on it is recorded as a response."""
+        return cast("ServerConnection", _RecordingConnection(websocket, self, connection_id))
+
+    def close(self) -> None:
+        """Flush all queued records and stop the writer thread."""
+        self.__queue.put(None)
+        self.__writer.join()
+        if self.__dropped:
+            self.logger.warning("Dropped %d traffic records because the writer could not keep up", self.__dropped)
+
+    def __write_records(self) -> None:
+        with self.__path.open("ab") as file:
+            written_bytes = file.tell()
+            if written_bytes == 0:
+                written_bytes += file.write(MAGIC)
+            while (record := self.__queue.get()) is not None:
+                if self.__max_bytes is not None and written_bytes >= self.__max_bytes:
+                    self.__dropped += 1
+                    continue
+                written_bytes += _write_record(file, record)
+                if self.__queue.empty():
+                    file.flush()
+
+
+class _RecordingConnection:
+    """Proxy of a server connection that records every sent message."""
+
+    def __init__(self, websocket: ServerConnection, recorder: TrafficRecorder, connection_id: int) -> None:
+        self.__websocket = websocket
+        self.__recorder = recorder
+        self.__connection_id = connection_id
+
+    async def send(self, message: Union[str, bytes]) -> None:
+        await self.__websocket.send(message)
+        self.__recorder.record(TrafficDirection.RESPONSE, self.__connection_id, "", message)
+
+    def __getattr__(self, name: str) -> Any:  # noqa: ANN401
+        return getattr(self.__websocket, name)
+
+    def __aiter__(self) -> AsyncIterator[Union[str, bytes]]:
+        return self.__websocket.__aiter__()
+
+
+def _write_record(file: BinaryIO, record: TrafficRecord) -> int:
+    session_id = record.session_id.encode("utf-8")
+    header = RECORD_HEADER.pack(record.direction.value, record.timestamp, record.connection_id, len(session_id), len(record.payload))
+    return file.write(header) + file.write(session_id) + file.write(record.payload)
+
+
+def read_traffic(path: Path) -> Iterator[TrafficRecord]:
+    """Read all records of a traffic recording in the order they were written."""
+    with path.open("rb") as file:
+        if file.read(len(MAGIC)) != MAGIC:
+            msg = f"{path} is not a traffic recording"
+            raise ValueError(msg)
+        while header := file.read(RECORD_HEADER.size):
+            if len(header) < RECORD_HEADER.size:
+                return  # Incomplete trailing record of an interrupted recording
+            direction, timestamp, connection_id, session_id_length, payload_length = RECORD_HEADER.unpack(header)
+            session_id = file.read(session_id_length).decode("utf-8")
+            payload = file.read(payload_length)
+            if len(payload) < payload_length:
+                return
+            yield TrafficRecord(TrafficDirection(direction), timestamp, connection_id, session_id, payload)
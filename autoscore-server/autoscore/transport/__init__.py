@@ -0,0 +1 @@
+"""Transport package for local clients exchanging frames with the server without a WebSocket."""
@@ -0,0 +1,92 @@
+"""Ring of fixed size frame slots in shared memory, written by a local producer and read by the server without copying."""
+
+import contextlib
+import logging
+from multiprocessing import resource_tracker, shared_memory
+from typing import Optional, Self, Set
+
+import numpy as np
+from pydantic import BaseModel, Field
+
+CHANNELS = 3
+
+_created_in_process: Set[str] = set()
+
+
+class FrameRingDescriptor(BaseModel):
+    """Name and layout of a frame ring, sent by the producer to attach the server to it."""
+
+    name: str
+    slot_count: int = Field(gt=0)
+    slot_size: int = Field(gt=0)
+
+
+class FrameRing:
+    """Fixed number of slots in a shared memory block that each hold one raw BGR frame."""
+
+    logger = logging.getLogger(__qualname__)
+
+    def __init__(self, memory: shared_memory.SharedMemory, slot_count: int, slot_size: int, *, owner: bool) -> None:
+        if memory.size < slot_count * slot_size:
+            msg = f"Shared memory {memory.name} of {memory.size} bytes is too small for {slot_count} slots of {slot_size} bytes"
+            raise ValueError(msg)
+        self.__memory = memory
+        self.__slot_count = slot_count
+        self.__slot_size = slot_size
+        self.__owner = owner
+
+    @classmethod
+    def create(cls, slot_count: int, max_width: int, max_height: int, name: Optional[str] = None) -> Self:
+        """Create a ring whose slots fit frames up to the given size, owned and eventually unlinked by the producer."""
+        slot_size = max_width * max_height * CHANNELS
+        memory = shared_memory.SharedMemory(name=name, create=True, size=slot_count * slot_size)
+        _created_in_process.add(memory.name)
+        return cls(memory, slot_count, slot_size, owner=True)
+
+    @classmethod
+    def attach(cls, descriptor: FrameRingDescriptor) -> Self:
+        """Attach to a ring created by another process without taking over its lifetime."""
+        memory = shared_memory.SharedMemory(name=descriptor.name)
+        # Before Python 3.13 attaching registers the block with the resource tracker, which would unlink it when the server exits
+        if memory.name not in _created_in_process:
+            with contextlib.suppress(KeyError, ValueError):
+                resource_tracker.unregister(memory._name, "shared_memory")  # type: ignore[attr-defined]  # noqa: SLF001
+        return cls(memory, descriptor.slot_count, descriptor.slot_size, owner=False)
+
+    @property
+    def descriptor(self) -> FrameRingDescriptor:
+        """Get the descriptor other processes attach to this ring with."""
+        return FrameRingDescriptor(name=self.__memory.name, slot_count=self.__slot_count, slot_size=self.__slot_size)
+
+    def frame(self, slot: int, height: int, width: int) -> np.ndarray:
+        """Get a writable view of a frame in a slot, no data is copied."""
+        if not 0 <= slot < self.__slot_count:
+            msg = f"Slot {slot} is outside of the ring with {self.__slot_count} slots"
+            raise ValueError(msg)
+        frame_size = height * width * CHANNELS
+        if frame_size > self.__slot_size:
+            msg = f"Frame of {width}x{height} does not fit into a slot of {self.__slot_size} bytes"
+            raise ValueError(msg)
+        buffer = self.__memory.buf
+        if buffer is None:
+            msg = "Frame ring is closed"
+            raise ValueError(msg)
+        offset = slot * self.__slot_size
+        return np.ndarray((height, width, CHANNELS), dtype=np.uint8, buffer=buffer, offset=offset)
+
+    def write(self, slot: int, frame: np.ndarray) -> None:
+        """Copy a BGR frame into a slot."""
+        height, width = frame.shape[:2]
+        np.copyto(self.frame(slot, height, width), frame)
+
+    def close(self) -> None:
+        """Detach from the shared memory, and remove it if this process created it."""
+        try:
+            self.__memory.close()
+        except BufferError:
+            self.logger.warning(
+                "Frame ring %s is still referenced by frame views and stays mapped until they are released", self.__memory.name
+            )
+        if self.__owner:
+            self.__memory.unlink()
+            _created_in_process.discard(self.__memory.name)
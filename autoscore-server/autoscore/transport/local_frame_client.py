@@ -0,0 +1,67 @@
+"""Producer side of the local frame transport, for capture processes running on the same machine as the server."""
+
+import asyncio
+import json
+from pathlib import Path
+from types import TracebackType
+from typing import Any, Dict, Optional, Self, Type
+
+from autoscore.model.request import LocalFrameRequest, RequestType
+from autoscore.transport.frame_ring import FrameRing
+
+
+class LocalFrameClient:
+    """Requests detections of frames written into a shared memory ring over the Unix domain socket of the server."""
+
+    def __init__(self, socket_path: Path, ring: FrameRing) -> None:
+        self.__socket_path = socket_path
+        self.__ring = ring
+        self.__reader: Optional[asyncio.StreamReader] = None
+        self.__writer: Optional[asyncio.StreamWriter] = None
+
+    async def __aenter__(self) -> Self:
+        await self.connect()
+        return self
+
+    async def __aexit__(
+        self, exc_type: Optional[Type[BaseException]], exc_value: Optional[BaseException], traceback: Optional[TracebackType]
+    ) -> None:
+        await self.close()
+
+    async def connect(self) -> None:
+        """Connect to the server and let it attach to the frame ring."""
+        self.__reader, self.__writer = await asyncio.open_unix_connection(self.__socket_path)
+        reply = await self.__exchange(self.__ring.descriptor.model_dump_json())
+        if reply.get("name") != self.__ring.descriptor.name:
+            msg = f"Server could not attach to the frame ring: {reply.get('message')}"
+            raise ConnectionError(msg)
+
+    async def detect(  # noqa: PLR0913
+        self, slot: int, height: int, width: int, session_id: str, request_id: Optional[str] = None, player_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Request the detection of the frame written into a slot, which must not be overwritten until this returns."""
+        request = LocalFrameRequest(
+            request_type=RequestType.FULL,
+            session_id=session_id,
+            request_id=request_id,
+            player_id=player_id,
+            slot=slot,
+            height=height,
+            width=width,
+        )
+        return await self.__exchange(request.model_dump_json())
+
+    async def close(self) -> None:
+        """Close the connection to the server."""
+        if self.__writer is not None:
+            self.__writer.close()
+            await self.__writer.wait_closed()
+            self.__writer = None
+
+    async def __exchange(self, message: str) -> Dict[str, Any]:
+        if self.__reader is None or self.__writer is None:
+            msg = "Client is not connected"
+            raise ConnectionError(msg)
+        self.__writer.write(message.encode("utf-8") + b"\n")
+        await self.__writer.drain()
+        return json.loads(await self.__reader.readuntil(b"\n"))
@@ -0,0 +1,92 @@
+"""Unix domain socket server answering detection requests for frames in a shared memory ring of a local producer."""
+
+import asyncio
+import contextlib
+import logging
+from pathlib import Path
+from typing import Optional
+
+from pydantic import ValidationError
+
+from autoscore.handler.pipeline_detection_handler import PipelineDetectionHandler
+from autoscore.metrics.server_metrics import ServerMetrics
+from autoscore.model.request import LocalFrameRequest, RequestType
+from autoscore.model.response import ErrorResponse, Status
+from autoscore.transport.frame_ring import FrameRing, FrameRingDescriptor
+
+
+class LocalFrameServer:
+    """Serves co-located producers that pass raw frames through shared memory instead of encoding them for the WebSocket."""
+
+    logger = logging.getLogger(__qualname__)
+
+    def __init__(self, socket_path: Path, detection_handler: PipelineDetectionHandler, metrics: Optional[ServerMetrics] = None) -> None:
+        self.__socket_path = socket_path
+        self.__detection_handler = detection_handler
+        self.__metrics = metrics or ServerMetrics()
+        self.__server: Optional[asyncio.Server] = None
+
+    async def start(self) -> None:
+        """Listen for local producers on the Unix domain socket."""
+        self.__socket_path.unlink(missing_ok=True)
+        self.__server = await asyncio.start_unix_server(self.__handle_connection, path=self.__socket_path)
+        self.logger.info("Local frame transport listening on %s", self.__socket_path)
+
+    async def stop(self) -> None:
+        """Stop listening and remove the socket file."""
+        if self.__server is not None:
+            self.__server.close()
+            await self.__server.wait_closed()
+            self.__server = None
+        self.__socket_path.unlink(missing_ok=True)
+
+    async def __handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Attach to the ring of the producer, then answer one newline delimited JSON request after the other."""
+        ring = None
+        try:
+            try:
+                ring = FrameRing.attach(FrameRingDescriptor.model_validate_json(await reader.readline()))
+            except (ValidationError, OSError, ValueError) as e:
+                await self.__write_line(writer, self.__error(f"Could not attach to frame ring: {e!s}", None, None))
+                return
+            await self.__write_line(writer, ring.descriptor.model_dump_json())
+
+            while line := await reader.readline():
+                self.__metrics.queue_depth.inc()
+                try:
+                    payload = await self.__respond(ring, line)
+                finally:
+                    self.__metrics.queue_depth.dec()
+                # The producer may reuse the slot as soon as it reads the response
+                await self.__write_line(writer, payload)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            self.logger.info("Local producer disconnected")
+        finally:
+            if ring is not None:
+                ring.close()
+            writer.close()
+            with contextlib.suppress(ConnectionError):
+                await writer.wait_closed()
+
+    async def __respond(self, ring: FrameRing, line: bytes) -> str:
+        try:
+            request = LocalFrameRequest.model_validate_json(line)
+        except ValidationError as e:
+            self.__metrics.record_request(RequestType.NONE, None)
+            return self.__error(f"Invalid request: {e!s}", None, None)
+        try:
+            frame = ring.frame(request.slot, request.height, request.width)
+        except ValueError as e:
+            return self.__error(str(e), request.session_id, request.request_id)
+        return await self.__detection_handler.respond_to_frame(request, frame)
+
+    @staticmethod
+    def __error(message: str, session_id: Optional[str], request_id: Optional[str]) -> str:
+        return ErrorResponse(
+            request_type=RequestType.FULL, session_id=session_id or "unknown", request_id=request_id, status=Status.ERROR, message=message
+        ).model_dump_json()
+
+    @staticmethod
+    async def __write_line(writer: asyncio.StreamWriter, payload: str) -> None:
+        writer.write(payload.encode("utf-8") + b"\n")
+        await writer.drain()
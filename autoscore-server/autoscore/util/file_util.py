@@ -10,9 +10,18 @@ import numpy as np
 from PIL import Image
 
 
+def decode_base64(base64_data: bytes | bytearray | str) -> bytes:
+    """Decode base64 data to the encoded image bytes, raw bytes are passed through."""
+    return base64.b64decode(base64_data) if isinstance(base64_data, str) else bytes(base64_data)
+
+
 def base64_to_numpy(base64_data: bytes | bytearray | str) -> np.ndarray:
     """Convert base64 data to numpy array in BGR format (OpenCV compatible)."""
-    image_bytes = base64.b64decode(base64_data) if isinstance(base64_data, str) else bytes(base64_data)
+    return image_bytes_to_numpy(decode_base64(base64_data))
+
+
+def image_bytes_to_numpy(image_bytes: bytes) -> np.ndarray:
+    """Convert encoded image bytes to numpy array in BGR format (OpenCV compatible)."""
     image_buffer = BytesIO(image_bytes)
     pil_image = Image.open(image_buffer)
     if pil_image.mode != "RGB":
@@ -30,8 +39,7 @@ def save_base64_as_png(base64_data: bytes | bytearray | str, output_dir: str = "
     timestamp = datetime.now().strftime("%M-%S_%f")[:-3]  # noqa: DTZ005
     filename = f"image_{timestamp}.png"
     filepath = output_path / filename
-    image_bytes = base64.b64decode(base64_data) if isinstance(base64_data, str) else bytes(base64_data)
-    image_buffer = BytesIO(image_bytes)
+    image_buffer = BytesIO(decode_base64(base64_data))
     pil_image = Image.open(image_buffer)
     if pil_image.mode != "RGB":
         pil_image = pil_image.convert("RGB")  # type: ignore
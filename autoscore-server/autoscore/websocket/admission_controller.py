@@ -0,0 +1,126 @@
+"""Admission control of connections and detection requests, so a misbehaving client cannot exhaust memory or CPU."""
+
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from http import HTTPStatus
+from typing import Optional, Set
+
+from websockets.asyncio.server import ServerConnection
+from websockets.http11 import Request, Response
+from websockets.protocol import State
+
+from autoscore.metrics.server_metrics import ServerMetrics
+from autoscore.model.configuration import ServerConfig
+
+MAX_BUCKETS = 4096
+UNKNOWN_ADDRESS = "unknown"
+
+
+@dataclass
+class _TokenBucket:
+    rate: float
+    burst: int
+    tokens: float
+    updated_at: float
+
+    def take(self, now: float) -> float:
+        """Take a token and return 0, or return the seconds until a token is available without taking one."""
+        self.tokens = min(self.burst, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+
+class AdmissionController:
+    """Caps connections per server and client address, rate limits detection requests and bounds the bytes in flight."""
+
+    logger = logging.getLogger(__qualname__)
+
+    def __init__(self, config: Optional[ServerConfig] = None, metrics: Optional[ServerMetrics] = None) -> None:
+        self.__config = config or ServerConfig()
+        self.__metrics = metrics or ServerMetrics()
+        self.__connections: Set[ServerConnection] = set()
+        self.__session_buckets: OrderedDict[str, _TokenBucket] = OrderedDict()
+        self.__ip_buckets: OrderedDict[str, _TokenBucket] = OrderedDict()
+        self.__inflight_bytes = 0
+
+    @property
+    def inflight_bytes(self) -> int:
+        """Total size of the received messages that were not answered yet."""
+        return self.__inflight_bytes
+
+    def process_request(self, connection: ServerConnection, request: Request) -> Optional[Response]:
+        """Admit a WebSocket handshake, or answer it with 503 and a Retry-After header while the server is at capacity."""
+        # Connections whose handshake failed after they were admitted never reach the handler, drop them here
+        self.__connections = {admitted for admitted in self.__connections if admitted.state is not State.CLOSED}
+        address = self.address(connection)
+        if len(self.__connections) >= self.__config.max_connections:
+            return self.__reject(connection, "connections", f"Server is at its limit of {self.__config.max_connections} connections")
+        if sum(self.address(admitted) == address for admitted in self.__connections) >= self.__config.max_connections_per_ip:
+            return self.__reject(
+                connection, "ip_connections", f"{address} is at its limit of {self.__config.max_connections_per_ip} connections"
+            )
+        self.__connections.add(connection)
+        self.logger.debug("Admitted connection from %s to %s", address, request.path)
+        return None
+
+    def release_connection(self, connection: ServerConnection) -> None:
+        """Free the slot of a closed connection."""
+        self.__connections.discard(connection)
+
+    def admit_frame(self, connection: ServerConnection, session_id: str) -> float:
+        """Take a token of the session and of the client address, and return 0 or the seconds until the frame may be sent."""
+        config = self.__config
+        now = time.monotonic()
+        session_bucket = self.__bucket(self.__session_buckets, session_id, config.session_frame_rate, config.session_frame_burst, now)
+        ip_bucket = self.__bucket(self.__ip_buckets, self.address(connection), config.ip_frame_rate, config.ip_frame_burst, now)
+        retry_after = session_bucket.take(now)
+        if retry_after > 0:
+            self.__metrics.record_admission_rejection("session_rate")
+            return retry_after
+        retry_after = ip_bucket.take(now)
+        if retry_after > 0:
+            # The session keeps its token, it was not the one sending too much
+            session_bucket.tokens += 1
+            self.__metrics.record_admission_rejection("ip_rate")
+        return retry_after
+
+    def reserve_bytes(self, size: int) -> bool:
+        """Reserve memory for a received message, or return False if the bytes in flight would exceed the limit."""
+        if self.__inflight_bytes + size > self.__config.max_inflight_bytes:
+            self.__metrics.record_admission_rejection("inflight_bytes")
+            return False
+        self.__inflight_bytes += size
+        return True
+
+    def release_bytes(self, size: int) -> None:
+        """Release the memory reserved for a message once it was answered."""
+        self.__inflight_bytes -= size
+
+    @staticmethod
+    def address(connection: ServerConnection) -> str:
+        """Get the client address of a connection."""
+        remote_address = connection.remote_address
+        return str(remote_address[0]) if remote_address else UNKNOWN_ADDRESS
+
+    def __reject(self, connection: ServerConnection, reason: str, message: str) -> Response:
+        self.logger.warning("Rejected connection from %s: %s", self.address(connection), message)
+        self.__metrics.record_admission_rejection(reason)
+        response = connection.respond(HTTPStatus.SERVICE_UNAVAILABLE, f"{message}, retry later\n")
+        response.headers["Retry-After"] = str(self.__config.connection_retry_after_seconds)
+        return response
+
+    @staticmethod
+    def __bucket(buckets: "OrderedDict[str, _TokenBucket]", key: str, rate: float, burst: int, now: float) -> _TokenBucket:
+        bucket = buckets.get(key)
+        if bucket is None:
+            bucket = buckets[key] = _TokenBucket(rate, burst, float(burst), now)
+            if len(buckets) > MAX_BUCKETS:
+                buckets.popitem(last=False)
+        else:
+            buckets.move_to_end(key)
+        return bucket
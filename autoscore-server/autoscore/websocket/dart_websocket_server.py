@@ -1,11 +1,17 @@
 """WebSocket server for handling dart autoscore operations."""
 
 import logging
-from typing import Set
+from typing import Optional, Set
 
 from websockets.asyncio.server import ServerConnection
 
+from autoscore.metrics.metrics_http_server import MetricsHttpServer
+from autoscore.metrics.server_metrics import ServerMetrics
+from autoscore.model.configuration import ServerConfig
+from autoscore.transport.local_frame_server import LocalFrameServer
+from autoscore.websocket.admission_controller import AdmissionController
 from autoscore.websocket.connection_manager import ConnectionManager
+from autoscore.websocket.loop_watchdog import LoopWatchdog
 from autoscore.websocket.message_router import MessageRouter
 
 
@@ -14,10 +20,60 @@ class DartWebSocketServer:
 
     logger = logging.getLogger(__qualname__)
 
-    def __init__(self) -> None:
+    def __init__(self, config: Optional[ServerConfig] = None) -> None:
+        self.config = config or ServerConfig()
         self.connections: Set[ServerConnection] = set()
         self.connection_manager = ConnectionManager(self.connections)
-        self.message_router = MessageRouter()
+        self.metrics = ServerMetrics()
+        self.metrics.track_connections(lambda: len(self.connections))
+        self.admission_controller = AdmissionController(self.config, self.metrics)
+        self.message_router = MessageRouter(self.config, self.metrics, self.admission_controller)
+        self.metrics_server = (
+            MetricsHttpServer(
+                self.metrics.registry, self.config.metrics_host, self.config.metrics_port, lambda: self.metrics.is_ready
+            )
+            if self.config.metrics_enabled
+            else None
+        )
+        self.local_frame_server = (
+            LocalFrameServer(self.config.local_socket_path, self.message_router.detection_handler, self.metrics)
+            if self.config.local_socket_path
+            else None
+        )
+        self.loop_watchdog = (
+            LoopWatchdog(self.metrics, self.config.loop_watchdog_interval_seconds, self.config.loop_block_threshold_seconds)
+            if self.config.loop_watchdog_enabled
+            else None
+        )
+
+    async def start(self) -> None:
+        """Start the background services of the server."""
+        if self.metrics_server is not None:
+            await self.metrics_server.start()
+        if self.loop_watchdog is not None:
+            await self.loop_watchdog.start()
+        if self.message_router.quality_ladder is not None:
+            await self.message_router.quality_ladder.start()
+        if self.local_frame_server is not None:
+            await self.local_frame_server.start()
+
+    def mark_ready(self) -> None:
+        """Mark the server as ready once it accepts WebSocket connections."""
+        self.metrics.mark_ready()
+        self.logger.info("Server is ready")
+
+    async def stop(self) -> None:
+        """Stop the background services of the server."""
+        self.metrics.mark_ready(ready=False)
+        if self.local_frame_server is not None:
+            await self.local_frame_server.stop()
+        if self.message_router.quality_ladder is not None:
+            await self.message_router.quality_ladder.stop()
+        if self.loop_watchdog is not None:
+            await self.loop_watchdog.stop()
+        self.message_router.close()
+        if self.metrics_server is not None:
+            await self.metrics_server.stop()
 
     async def register_connection(self, websocket: ServerConnection) -> None:
         """Register and handle a new WebSocket connection."""
@@ -28,4 +84,5 @@ class DartWebSocketServer:
         except Exception:
             self.logger.exception("Error handling connection")
         finally:
+            self.admission_controller.release_connection(websocket)
             await self.connection_manager.remove_connection(websocket)
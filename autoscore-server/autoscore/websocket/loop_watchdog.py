@@ -0,0 +1,74 @@
+"""Watchdog that measures the scheduling lag of the event loop and logs the stack of calls blocking it."""
+
+import asyncio
+import contextlib
+import logging
+import sys
+import threading
+import time
+import traceback
+from typing import Optional
+
+from autoscore.metrics.server_metrics import ServerMetrics
+
+
+class LoopWatchdog:
+    """Measures how late the event loop wakes up a periodic task and captures the loop thread's stack while it is blocked."""
+
+    logger = logging.getLogger(__qualname__)
+
+    def __init__(self, metrics: ServerMetrics, interval: float = 0.1, threshold: float = 0.25) -> None:
+        self.__metrics = metrics
+        self.__interval = interval
+        self.__threshold = threshold
+        self.__heartbeat = time.monotonic()
+        self.__loop_thread_id: Optional[int] = None
+        self.__task: Optional[asyncio.Task[None]] = None
+        self.__monitor: Optional[threading.Thread] = None
+        self.__stopped = threading.Event()
+
+    async def start(self) -> None:
+        """Start measuring the lag of the running event loop."""
+        self.__loop_thread_id = threading.get_ident()
+        self.__heartbeat = time.monotonic()
+        self.__stopped.clear()
+        self.__task = asyncio.create_task(self.__measure_lag(), name="loop-watchdog")
+        self.__monitor = threading.Thread(target=self.__watch_heartbeat, name="loop-watchdog", daemon=True)
+        self.__monitor.start()
+        self.logger.info("Watching event loop lag every %.0fms, blocking threshold %.0fms", self.__interval * 1000, self.__threshold * 1000)
+
+    async def stop(self) -> None:
+        """Stop measuring the event loop lag."""
+        self.__stopped.set()
+        if self.__task is not None:
+            self.__task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self.__task
+            self.__task = None
+        if self.__monitor is not None:
+            self.__monitor.join(timeout=self.__interval * 2)
+            self.__monitor = None
+
+    async def __measure_lag(self) -> None:
+        while True:
+            expected_wakeup = time.monotonic() + self.__interval
+            await asyncio.sleep(self.__interval)
+            now = time.monotonic()
+            self.__heartbeat = now
+            self.__metrics.record_loop_lag(max(0.0, now - expected_wakeup))
+
+    def __watch_heartbeat(self) -> None:
+        """Check the heartbeat of the loop task from a separate thread, which still runs while the loop is blocked."""
+        reported_heartbeat = None
+        while not self.__stopped.wait(self.__interval):
+            heartbeat = self.__heartbeat
+            blocked_for = time.monotonic() - heartbeat
+            # Report each stall once, a new heartbeat means the loop ran again in between
+            if blocked_for > self.__threshold and heartbeat != reported_heartbeat:
+                reported_heartbeat = heartbeat
+                self.__metrics.record_loop_block()
+                self.logger.warning("Event loop blocked for %.0fms in:\n%s", blocked_for * 1000, self.__loop_stack())
+
+    def __loop_stack(self) -> str:
+        frame = sys._current_frames().get(self.__loop_thread_id or 0)  # noqa: SLF001
+        return "".join(traceback.format_stack(frame)) if frame is not None else "<loop thread not found>"
@@ -1,31 +1,48 @@
 """Message router for handling WebSocket message routing and processing."""
 
+import asyncio
 import json
 import logging
-from typing import TYPE_CHECKING, Any, Dict, Type
+import time
+from typing import TYPE_CHECKING, Any, Dict, Optional, Set, Tuple, Type
 
 import websockets.exceptions
 from detector.model.configuration import ProcessingConfig
-from detector.service.calibration.board_calibration_service import (
-    DartBoardCalibrationService,
-)
-from detector.service.dart_image_scoring_service import DartInImageScoringService
-from detector.service.image_preprocessor import ImagePreprocessor
-from detector.service.scoring.dart_scoring_service import DartScoringService
-from detector.yolo.dart_detector import YoloDartImageProcessor
+from detector.model.detection_result_code import ResultCode
+from detector.service.detection_scoring_service import DetectionScoringService
 from websockets.asyncio.server import ServerConnection
+from websockets.frames import CloseCode
 
+from autoscore.handler.detections_handler import DetectionsHandler
 from autoscore.handler.pipeline_detection_handler import PipelineDetectionHandler
-from autoscore.model.request import BaseRequest, CalibrationRequest, PingRequest, PipelineDetectionRequest, RequestType, \
-    ScoringRequest
+from autoscore.handler.profiling_handler import ProfilingHandler
+from autoscore.metrics.server_metrics import ServerMetrics
+from autoscore.model.configuration import ServerConfig
+from autoscore.model.request import BaseRequest, CalibrationRequest, DetectionsRequest, PingRequest, PipelineDetectionRequest, \
+    ProfilingRequest, RequestType, ScoringRequest
 from autoscore.model.response import (
     ErrorResponse,
     Status,
 )
+from autoscore.service.capture_suggester import CaptureSuggester
+from autoscore.service.detection_service_factory import create_detection_service
+from autoscore.service.inference_executor import InferenceExecutor
+from autoscore.service.negative_result_cache import NegativeResultCache
+from autoscore.service.quality_ladder import QualityLadder
+from autoscore.service.request_profiler import RequestProfiler
+from autoscore.service.request_scheduler import RequestScheduler
+from autoscore.service.result_cache import DetectionResultCache
+from autoscore.service.session_crops import SessionCrops
+from autoscore.service.traffic_recorder import TrafficDirection, TrafficRecorder
+from autoscore.websocket.admission_controller import AdmissionController
 
 if TYPE_CHECKING:
     from autoscore.handler.base_handler import BaseHandler
 
+# Requests that run detections and are limited to the frame rate of their session and client address
+RATE_LIMITED_REQUEST_TYPES = frozenset({RequestType.FULL, RequestType.DETECTIONS})
+INFLIGHT_BYTES_RETRY_AFTER_SECONDS = 1.0
+
 
 class MessageRouter:
     """Routes incoming WebSocket messages to appropriate handlers."""
@@ -34,43 +51,59 @@ class MessageRouter:
 
     def __init__(
         self,
+        server_config: Optional[ServerConfig] = None,
+        metrics: Optional[ServerMetrics] = None,
+        admission_controller: Optional[AdmissionController] = None,
     ) -> None:
-        config = ProcessingConfig()
-        yolo_dart_image_processor = YoloDartImageProcessor(config)
-        image_preprocessor = ImagePreprocessor(config)
-
-        calibration_service = DartBoardCalibrationService(
-            config=config,
-            yolo_image_processor=yolo_dart_image_processor,
-            image_preprocessor=image_preprocessor,
-        )
-        scoring_service = DartScoringService(
-            config=config,
-            yolo_image_processor=yolo_dart_image_processor,
-            image_preprocessor=image_preprocessor,
+        self.server_config = server_config or ServerConfig()
+        self.metrics = metrics or ServerMetrics()
+        self.admission_controller = admission_controller or AdmissionController(self.server_config, self.metrics)
+        self.metrics.track_inflight_bytes(lambda: self.admission_controller.inflight_bytes)
+        config = ProcessingConfig(model_cache_dir=self.server_config.model_cache_dir)
+        self.inference_executor = InferenceExecutor(
+            [create_detection_service(config, self.server_config.model_warmup_runs) for _ in range(self.server_config.inference_workers)]
         )
 
-        dart_scoring_service = DartInImageScoringService(
-            config=config,
-            yolo_image_processor=yolo_dart_image_processor,
-            calibration_service=calibration_service,
-            dart_scoring_service=scoring_service,
-            image_preprocessor=image_preprocessor,
+        self.result_cache = DetectionResultCache(self.server_config) if self.server_config.result_cache_enabled else None
+        self.request_profiler = RequestProfiler(
+            self.server_config.profile_dir, self.server_config.profile_every_n, self.server_config.profile_max_files
         )
-
+        self.request_scheduler = RequestScheduler(self.inference_executor, self.server_config, self.metrics)
+        self.quality_ladder = QualityLadder(self.server_config, self.metrics) if self.server_config.quality_ladder_enabled else None
         self.detection_handler = PipelineDetectionHandler(
-            dart_detection_service=dart_scoring_service
+            request_scheduler=self.request_scheduler,
+            result_cache=self.result_cache,
+            metrics=self.metrics,
+            request_profiler=self.request_profiler,
+            capture_suggester=CaptureSuggester(config.target_image_size) if self.server_config.capture_suggestions_enabled else None,
+            negative_cache=NegativeResultCache(self.server_config) if self.server_config.negative_cache_enabled else None,
+            quality_ladder=self.quality_ladder,
+            session_crops=SessionCrops() if self.quality_ladder is not None else None,
+        )
+        if self.result_cache is not None:
+            result_cache = self.result_cache
+            self.metrics.track_result_cache(lambda: result_cache.statistics)
+
+        self.traffic_recorder = (
+            TrafficRecorder(self.server_config.traffic_recording_path, self.server_config.traffic_recording_max_bytes)
+            if self.server_config.traffic_recording_path
+            else None
         )
 
         self.handlers: Dict[RequestType, BaseHandler] = {
             RequestType.FULL: self.detection_handler,
+            RequestType.DETECTIONS: DetectionsHandler(DetectionScoringService(config), self.metrics),
         }
+        if self.server_config.profiling_requests_enabled:
+            self.handlers[RequestType.PROFILING] = ProfilingHandler(self.request_profiler)
 
         self.request_types: Dict[RequestType, Type[BaseRequest]] = {
             RequestType.CALIBRATION: CalibrationRequest,
             RequestType.SCORING: ScoringRequest,
             RequestType.PING: PingRequest,
             RequestType.FULL: PipelineDetectionRequest,
+            RequestType.DETECTIONS: DetectionsRequest,
+            RequestType.PROFILING: ProfilingRequest,
         }
 
     def _deserialize_request(self, data: Dict[str, Any]) -> BaseRequest:
@@ -93,39 +126,151 @@ class MessageRouter:
 
         return request_class(**data)
 
+    def close(self) -> None:
+        """Release resources held by the router."""
+        self.inference_executor.close()
+        if self.traffic_recorder is not None:
+            self.traffic_recorder.close()
+
     async def handle_messages(self, websocket: ServerConnection) -> None:
         """Handle incoming messages from a WebSocket connection."""
+        connection_id = 0
+        if self.traffic_recorder is not None:
+            connection_id = self.traffic_recorder.new_connection_id()
+            websocket = self.traffic_recorder.wrap(websocket, connection_id)
+        window = asyncio.Semaphore(self.server_config.pipeline_window)
+        in_flight: Set[asyncio.Task[None]] = set()
         try:
-            async for message in websocket:
-                try:
-                    data = json.loads(message)
-                    self.logger.debug("Received message: %s", data)
-                    request = self._deserialize_request(data)
-                    await self._process_message(websocket, request)
-                except json.JSONDecodeError:
-                    await self._send_error(websocket, "Invalid JSON format", None)
-                except ValueError as e:
-                    request_id = data.get("id") if isinstance(data, dict) else None
-                    await self._send_error(websocket, str(e), request_id)
-                except Exception as e:
-                    self.logger.exception("Error processing message")
-                    request_id = data.get("id") if isinstance(data, dict) else None
-                    await self._send_error(websocket, f"Server error: {e!s}", request_id)
+            while (message := await self._receive(websocket)) is not None:
+                arrival_time = time.time()
+                message_size = len(message)
+                if not self.admission_controller.reserve_bytes(message_size):
+                    await self._send_error(
+                        websocket, "Server is busy with too many large messages", None, retry_after=INFLIGHT_BYTES_RETRY_AFTER_SECONDS
+                    )
+                    continue
+                self.metrics.queue_depth.inc()
+                request = await self._parse_request(websocket, connection_id, arrival_time, message)
+                if request is None or await self._reject_if_rate_limited(websocket, request):
+                    self.metrics.queue_depth.dec()
+                    self.admission_controller.release_bytes(message_size)
+                elif request.request_id is not None and self.server_config.pipeline_window > 1:
+                    # Stop reading further frames while the window is full, so a client cannot queue unbounded work
+                    await window.acquire()
+                    task = asyncio.create_task(self._process_pipelined(websocket, request, message_size, window))
+                    in_flight.add(task)
+                    task.add_done_callback(in_flight.discard)
+                else:
+                    await self._process_request(websocket, request, message_size)
         except websockets.exceptions.ConnectionClosed:
             self.logger.info("Connection closed by client")
+        finally:
+            if in_flight:
+                await asyncio.gather(*in_flight, return_exceptions=True)
+
+    async def _receive(self, websocket: ServerConnection) -> Optional[str | bytes]:
+        """Receive the next message, or close the connection and return None once it was idle for too long."""
+        idle_timeout = self.server_config.idle_timeout_seconds
+        try:
+            async with asyncio.timeout(idle_timeout):
+                return await websocket.recv()
+        except TimeoutError:
+            address = self.admission_controller.address(websocket)
+            self.logger.info("Closing connection from %s after %.0fs without a message", address, idle_timeout)
+            await websocket.close(CloseCode.GOING_AWAY, "Idle timeout")
+            return None
+
+    async def _reject_if_rate_limited(self, websocket: ServerConnection, request: BaseRequest) -> bool:
+        """Answer a detection request above the frame rate of its session or client address with an error and a retry hint."""
+        if request.request_type not in RATE_LIMITED_REQUEST_TYPES:
+            return False
+        retry_after = self.admission_controller.admit_frame(websocket, request.session_id)
+        if retry_after <= 0:
+            return False
+        self.metrics.record_request(request.request_type, None)
+        await self._send_error(
+            websocket, "Frame rate limit exceeded", request.session_id, request.request_id, retry_after=round(retry_after, 3)
+        )
+        return True
+
+    async def _parse_request(
+        self, websocket: ServerConnection, connection_id: int, arrival_time: float, message: str | bytes
+    ) -> Optional[BaseRequest]:
+        """Parse a received message into a request, or answer with an error and return None if it is invalid."""
+        data: object = None
+        try:
+            data = json.loads(message)
+            self._record_request(connection_id, arrival_time, message, data)
+            self.logger.debug("Received message: %s", data)
+            if isinstance(data, dict):
+                return self._deserialize_request(data)
+            self.metrics.record_request(RequestType.NONE, ResultCode.INVALID_INPUT)
+            await self._send_error(websocket, "Message must be a JSON object", None)
+        except json.JSONDecodeError:
+            self._record_request(connection_id, arrival_time, message, None)
+            self.metrics.record_request(RequestType.NONE, ResultCode.INVALID_INPUT)
+            await self._send_error(websocket, "Invalid JSON format", None)
+        except ValueError as e:
+            self.metrics.record_request(RequestType.NONE, ResultCode.INVALID_INPUT)
+            await self._send_error(websocket, str(e), *self.__ids(data))
+        except Exception as e:
+            self.logger.exception("Error parsing message")
+            self.metrics.record_request(RequestType.NONE, ResultCode.UNKNOWN)
+            await self._send_error(websocket, f"Server error: {e!s}", *self.__ids(data))
+        return None
+
+    async def _process_request(self, websocket: ServerConnection, request: BaseRequest, message_size: int) -> None:
+        """Process a parsed request and answer with an error if processing fails unexpectedly."""
+        try:
+            await self._process_message(websocket, request)
+        except websockets.exceptions.ConnectionClosed:
+            raise
+        except Exception as e:
+            self.logger.exception("Error processing message")
+            self.metrics.record_request(RequestType.NONE, ResultCode.UNKNOWN)
+            await self._send_error(websocket, f"Server error: {e!s}", request.session_id, request.request_id)
+        finally:
+            self.metrics.queue_depth.dec()
+            self.admission_controller.release_bytes(message_size)
+
+    async def _process_pipelined(
+        self, websocket: ServerConnection, request: BaseRequest, message_size: int, window: asyncio.Semaphore
+    ) -> None:
+        """Process a request concurrently with others of the same connection and free its slot in the window afterwards."""
+        try:
+            await self._process_request(websocket, request, message_size)
+        except websockets.exceptions.ConnectionClosed:
+            self.logger.debug("Connection closed before request %s of session %s was answered", request.request_id, request.session_id)
+        finally:
+            window.release()
+
+    @staticmethod
+    def __ids(data: object) -> Tuple[Optional[str], Optional[str]]:
+        """Get the session and request id of a message that could not be parsed into a request."""
+        if not isinstance(data, dict):
+            return None, None
+        session_id, request_id = data.get("session_id"), data.get("request_id")
+        return (str(session_id) if session_id is not None else None, str(request_id) if request_id is not None else None)
+
+    def _record_request(self, connection_id: int, arrival_time: float, message: str | bytes, data: object) -> None:
+        """Record a received message if traffic recording is enabled."""
+        if self.traffic_recorder is None:
+            return
+        session_id = data.get("session_id") if isinstance(data, dict) else None
+        self.traffic_recorder.record(TrafficDirection.REQUEST, connection_id, str(session_id or ""), message, arrival_time)
 
     async def _process_message(self, websocket: ServerConnection, request: BaseRequest) -> None:
         """Process a parsed message and route it to the appropriate handler."""
         message_type = request.request_type
-        request_id = request.session_id
 
         if not message_type:
-            await self._send_error(websocket, "Missing message type", request_id)
+            await self._send_error(websocket, "Missing message type", request.session_id, request.request_id)
             return
 
         handler = self.handlers.get(message_type)
         if not handler:
-            await self._send_error(websocket, f"Unknown message type: {message_type}", request_id)
+            self.metrics.record_request(message_type, ResultCode.INVALID_INPUT)
+            await self._send_error(websocket, f"Unknown message type: {message_type}", request.session_id, request.request_id)
             return
 
         await handler.handle(websocket, request)
@@ -133,15 +278,19 @@ class MessageRouter:
     async def _send_error(
         self,
         websocket: ServerConnection,
-        error_message: str ,
-        request_id: str | None,
+        error_message: str,
+        session_id: str | None,
+        request_id: str | None = None,
+        retry_after: Optional[float] = None,
     ) -> None:
         try:
             response = ErrorResponse(
                 request_type=RequestType.NONE,
-                session_id=request_id or "unknown",
+                session_id=session_id or "unknown",
+                request_id=request_id,
                 status=Status.ERROR,
                 message=error_message,
+                retry_after=retry_after,
             )
             await websocket.send(response.model_dump_json())
         except Exception:
@@ -0,0 +1,15 @@
+"""Benchmarks for the dart detection pipeline and the autoscore WebSocket server."""
+
+from pathlib import Path
+from typing import List
+
+BENCHMARK_PATH = Path(__file__).parent
+ROOT_PATH = BENCHMARK_PATH.parent
+IMAGE_PATH = ROOT_PATH / "images"
+BASELINE_PATH = BENCHMARK_PATH / "baselines" / "pipeline_baseline.json"
+IMAGE_SUFFIXES = (".jpg", ".jpeg", ".png")
+
+
+def find_images(image_dir: Path) -> List[Path]:
+    """Find all images in a directory, sorted by name."""
+    return sorted(path for path in image_dir.iterdir() if path.suffix.lower() in IMAGE_SUFFIXES)
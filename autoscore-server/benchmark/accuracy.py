@@ -0,0 +1,105 @@
+"""Comparison of predicted dart scores with ground truth scores."""
+
+import json
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from detector.model.detection_models import DartScore
+
+MISS = "MISS"
+NONE = "NONE"
+BULL = "BULL"
+
+ConfusionMatrix = Dict[str, Dict[str, int]]
+
+
+def load_ground_truth(ground_truth_path: Path) -> Dict[str, List[str]]:
+    """Load the expected dart scores per image file name from the alternating file name and darts list of the ground truth file."""
+    with Path.open(ground_truth_path, encoding="utf-8") as f:
+        data = json.load(f)
+    return {data[i]: data[i + 1]["darts"] for i in range(0, len(data), 2)}
+
+
+def score_label(dart_score: DartScore) -> str:
+    """Get the ground truth label of a predicted score, e.g. 'T20', 'SB', 'DB' or 'MISS'."""
+    if dart_score.multiplier == 0:
+        return MISS
+    if dart_score.single_value == 25:  # noqa: PLR2004
+        return "DB" if dart_score.multiplier == 2 else "SB"  # noqa: PLR2004
+    return dart_score.dart_score_str
+
+
+def split_label(label: str) -> Tuple[str, str]:
+    """Split a score label into its ring and segment, e.g. 'T20' into ('T', '20') and 'DB' into ('DB', 'BULL')."""
+    if label in {MISS, NONE}:
+        return label, label
+    if label in {"SB", "DB"}:
+        return label, BULL
+    return label[0], label[1:]
+
+
+def pair_scores(expected: Sequence[str], predicted: Sequence[str]) -> List[Tuple[str, str]]:
+    """Pair expected with predicted labels by exact match, then segment, then ring, then order, and unpaired ones with NONE."""
+    remaining_expected = list(expected)
+    remaining_predicted = list(predicted)
+    pairs: List[Tuple[str, str]] = []
+
+    for key in (lambda label: label, lambda label: split_label(label)[1], lambda label: split_label(label)[0], lambda _: ""):
+        for expected_label in list(remaining_expected):
+            match = next((label for label in remaining_predicted if key(label) == key(expected_label)), None)
+            if match is not None:
+                pairs.append((expected_label, match))
+                remaining_expected.remove(expected_label)
+                remaining_predicted.remove(match)
+
+    pairs.extend((expected_label, NONE) for expected_label in remaining_expected)
+    pairs.extend((NONE, predicted_label) for predicted_label in remaining_predicted)
+    return pairs
+
+
+def match_percentage(expected: Sequence[str], predicted: Sequence[str]) -> float:
+    """Get the share of expected darts that were predicted with exactly the right score."""
+    if not expected:
+        return 1.0 if not predicted else 0.0
+    matches = sum(expected_label == predicted_label for expected_label, predicted_label in pair_scores(expected, predicted))
+    return matches / len(expected)
+
+
+class ConfusionCounter:
+    """Counts pairs of expected and predicted labels by score, segment and ring."""
+
+    def __init__(self) -> None:
+        self.__scores: Dict[str, Counter] = defaultdict(Counter)
+        self.__segments: Dict[str, Counter] = defaultdict(Counter)
+        self.__rings: Dict[str, Counter] = defaultdict(Counter)
+
+    def add(self, expected: Sequence[str], predicted: Sequence[str]) -> None:
+        """Count the paired labels of a single image."""
+        for expected_label, predicted_label in pair_scores(expected, predicted):
+            expected_ring, expected_segment = split_label(expected_label)
+            predicted_ring, predicted_segment = split_label(predicted_label)
+            self.__scores[expected_label][predicted_label] += 1
+            self.__segments[expected_segment][predicted_segment] += 1
+            self.__rings[expected_ring][predicted_ring] += 1
+
+    def scores(self) -> ConfusionMatrix:
+        """Get the confusion of expected and predicted scores."""
+        return _to_matrix(self.__scores)
+
+    def segments(self) -> ConfusionMatrix:
+        """Get the confusion of expected and predicted segments."""
+        return _to_matrix(self.__segments)
+
+    def rings(self) -> ConfusionMatrix:
+        """Get the confusion of expected and predicted rings."""
+        return _to_matrix(self.__rings)
+
+
+def _to_matrix(counters: Dict[str, Counter]) -> ConfusionMatrix:
+    return {expected: dict(sorted(counter.items())) for expected, counter in sorted(counters.items())}
+
+
+def predicted_labels(dart_scores: Sequence[Optional[DartScore]]) -> List[str]:
+    """Get the ground truth labels of all predicted scores."""
+    return [score_label(dart_score) for dart_score in dart_scores if dart_score is not None]
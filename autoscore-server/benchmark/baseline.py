@@ -0,0 +1,58 @@
+"""Benchmark reports and their comparison against a stored baseline."""
+
+import json
+import platform
+from pathlib import Path
+from typing import Dict, List
+
+from pydantic import BaseModel, Field
+
+from benchmark.statistics import LatencyStatistics
+
+DEFAULT_TOLERANCE = 0.2
+# Page and allocator granularity make small memory growth noisy, so growth below this never counts as a regression
+RSS_NOISE_BYTES = 4 * 1024 * 1024
+
+
+class BenchmarkReport(BaseModel):
+    """Results of all benchmarks of a single run."""
+
+    python_version: str = Field(default_factory=platform.python_version)
+    machine: str = Field(default_factory=platform.machine)
+    benchmarks: Dict[str, LatencyStatistics] = Field(default_factory=dict)
+
+    @classmethod
+    def from_json(cls, json_path: Path) -> "BenchmarkReport":
+        """Load a report from a JSON file."""
+        with Path.open(json_path, encoding="utf-8") as f:
+            return cls(**json.load(f))
+
+    def to_json(self, json_path: Path) -> None:
+        """Write the report to a JSON file."""
+        json_path.parent.mkdir(parents=True, exist_ok=True)
+        json_path.write_text(self.model_dump_json(indent=2) + "\n", encoding="utf-8")
+
+
+def find_regressions(report: BenchmarkReport, baseline: BenchmarkReport, tolerance: float = DEFAULT_TOLERANCE) -> List[str]:
+    """Compare a report against a baseline and describe every metric that regressed by more than the tolerance or has no baseline."""
+    regressions: List[str] = []
+    for name, current in report.benchmarks.items():
+        expected = baseline.benchmarks.get(name)
+        if expected is None:
+            regressions.append(f"{name}: no baseline entry, run with --update-baseline to record it")
+            continue
+
+        for metric in ("p50_seconds", "p95_seconds", "p99_seconds"):
+            current_value = getattr(current, metric)
+            baseline_value = getattr(expected, metric)
+            if current_value > baseline_value * (1 + tolerance):
+                regressions.append(f"{name}: {metric} regressed from {baseline_value:.6g} to {current_value:.6g}")
+
+        if current.throughput_per_second < expected.throughput_per_second * (1 - tolerance):
+            regressions.append(
+                f"{name}: throughput dropped from {expected.throughput_per_second:.6g}/s to {current.throughput_per_second:.6g}/s"
+            )
+
+        if expected.peak_rss_bytes and current.peak_rss_bytes > expected.peak_rss_bytes * (1 + tolerance) + RSS_NOISE_BYTES:
+            regressions.append(f"{name}: peak RSS grew from {expected.peak_rss_bytes} to {current.peak_rss_bytes} bytes")
+    return regressions
@@ -0,0 +1,34 @@
+"""Build the preprocessed dataset cache used by evaluation and benchmark runs."""
+
+import logging
+from pathlib import Path
+from typing import Optional
+
+import click
+
+from benchmark import IMAGE_PATH, find_images
+from detector.model.configuration import ProcessingConfig
+from detector.service.image_preprocessor import ImagePreprocessor
+from detector.util.dataset_cache import DatasetCache
+
+DEFAULT_CACHE_DIR = Path("dataset_cache")
+
+
+@click.command()
+@click.option("--image-dir", type=click.Path(exists=True, file_okay=False, path_type=Path), default=IMAGE_PATH, help="Directory of images")
+@click.option(
+    "--config-path", type=click.Path(exists=True, dir_okay=False, path_type=Path), help="Path to JSON config file for dart detection"
+)
+@click.option("--cache-dir", type=click.Path(file_okay=False, path_type=Path), default=DEFAULT_CACHE_DIR, show_default=True)
+def main(image_dir: Path, config_path: Optional[Path], cache_dir: Path) -> None:
+    """Decode, crop and resize all images once into a memory-mapped frame file keyed by the preprocessing config."""
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    config = ProcessingConfig.from_json(config_path) if config_path else ProcessingConfig()
+    image_paths = find_images(image_dir)
+
+    dataset = DatasetCache(cache_dir).build(image_paths, config, ImagePreprocessor(config).preprocess_image)
+    click.echo(f"Cached {len(dataset)} frames for config {DatasetCache.cache_key(config)} in {cache_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""Parallel accuracy and latency evaluation of the dart detection pipeline against ground truth scores."""
+
+import logging
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import click
+from pydantic import BaseModel
+
+from benchmark import IMAGE_PATH, ROOT_PATH
+from benchmark.accuracy import ConfusionCounter, ConfusionMatrix, load_ground_truth, match_percentage, predicted_labels
+from benchmark.statistics import Percentiles
+from detector.entrypoint.parallel_pipeline import ParallelImageScorer, ScoredImage
+from detector.model.configuration import ProcessingConfig
+from detector.model.timing_models import StageTimings
+
+logger = logging.getLogger("Evaluation")
+
+GROUND_TRUTH_PATH = ROOT_PATH / "tests" / "resources" / "ground_truth.json"
+
+
+class ImageEvaluation(BaseModel):
+    """Predicted and expected scores of a single image."""
+
+    image: str
+    expected: List[str]
+    predicted: List[str]
+    match_percentage: float
+    result_code: str
+    message: Optional[str] = None
+    latency: float
+    stage_timings: Optional[StageTimings] = None
+
+
+class EvaluationReport(BaseModel):
+    """Accuracy and latency of the pipeline over all ground truth images."""
+
+    config: Dict[str, Any]
+    workers: int
+    wall_time: float
+    image_count: int
+    missing_images: List[str]
+    overall_match_percentage: float
+    success_rate: float
+    failure_reasons: Dict[str, int]
+    latency: Optional[Percentiles] = None
+    score_confusion: ConfusionMatrix
+    segment_confusion: ConfusionMatrix
+    ring_confusion: ConfusionMatrix
+    images: List[ImageEvaluation]
+
+
+def evaluate_image(scored_image: ScoredImage, expected: List[str]) -> ImageEvaluation:
+    """Compare the detection result of an image with its expected scores."""
+    detection_result = scored_image.detection_result
+    scoring_result = detection_result.scoring_result
+    predicted = (
+        predicted_labels([detection.dart_score for detection in scoring_result.dart_detections])
+        if detection_result.success and scoring_result
+        else []
+    )
+    return ImageEvaluation(
+        image=scored_image.image_path.name,
+        expected=expected,
+        predicted=predicted,
+        match_percentage=match_percentage(expected, predicted),
+        result_code=detection_result.result_code.name,
+        message=detection_result.message,
+        latency=scored_image.latency,
+        stage_timings=detection_result.stage_timings,
+    )
+
+
+def evaluate(
+    image_dir: Path,
+    ground_truth: Dict[str, List[str]],
+    config: ProcessingConfig,
+    workers: Optional[int],
+    dataset_cache_dir: Optional[Path] = None,
+) -> EvaluationReport:
+    """Score all ground truth images in parallel and compare them with the expected scores."""
+    image_paths = [image_dir / file_name for file_name in ground_truth if (image_dir / file_name).is_file()]
+    missing_images = sorted(file_name for file_name in ground_truth if not (image_dir / file_name).is_file())
+    if missing_images:
+        logger.warning("%d ground truth images are missing in %s", len(missing_images), image_dir)
+
+    start_time = time.perf_counter()
+    with ParallelImageScorer(config, workers, dataset_cache_dir) as scorer:
+        evaluations = [
+            evaluate_image(scored_image, ground_truth[scored_image.image_path.name]) for scored_image in scorer.score_images(image_paths)
+        ]
+        worker_count = scorer.workers
+    wall_time = time.perf_counter() - start_time
+
+    evaluations.sort(key=lambda evaluation: evaluation.image)
+    confusion = ConfusionCounter()
+    for evaluation in evaluations:
+        confusion.add(evaluation.expected, evaluation.predicted)
+
+    return EvaluationReport(
+        config=config.model_dump(mode="json"),
+        workers=worker_count,
+        wall_time=wall_time,
+        image_count=len(evaluations),
+        missing_images=missing_images,
+        overall_match_percentage=sum(evaluation.match_percentage for evaluation in evaluations) / len(evaluations) if evaluations else 0.0,
+        success_rate=sum(evaluation.result_code == "SUCCESS" for evaluation in evaluations) / len(evaluations) if evaluations else 0.0,
+        failure_reasons=dict(Counter(evaluation.result_code for evaluation in evaluations if evaluation.result_code != "SUCCESS")),
+        latency=Percentiles.from_values([evaluation.latency for evaluation in evaluations]),
+        score_confusion=confusion.scores(),
+        segment_confusion=confusion.segments(),
+        ring_confusion=confusion.rings(),
+        images=evaluations,
+    )
+
+
+@click.command()
+@click.option("--image-dir", type=click.Path(exists=True, file_okay=False, path_type=Path), default=IMAGE_PATH, help="Directory of images")
+@click.option(
+    "--ground-truth", type=click.Path(exists=True, dir_okay=False, path_type=Path), default=GROUND_TRUTH_PATH, help="Ground truth JSON file"
+)
+@click.option(
+    "--config-path", type=click.Path(exists=True, dir_okay=False, path_type=Path), help="Path to JSON config file for dart detection"
+)
+@click.option("--workers", type=click.IntRange(min=1), help="Worker processes, each loading its own pipeline")
+@click.option(
+    "--dataset-cache", type=click.Path(file_okay=False, path_type=Path), help="Read preprocessed frames built by benchmark.dataset_cache"
+)
+@click.option("--output", type=click.Path(dir_okay=False, path_type=Path), default=Path("evaluation_report.json"), show_default=True)
+def main(  # noqa: PLR0913
+    image_dir: Path, ground_truth: Path, config_path: Optional[Path], workers: Optional[int], dataset_cache: Optional[Path], output: Path
+) -> None:
+    """Evaluate the accuracy and latency of the pipeline on all ground truth images and write a JSON report."""
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    config = ProcessingConfig.from_json(config_path) if config_path else ProcessingConfig()
+
+    report = evaluate(image_dir, load_ground_truth(ground_truth), config, workers, dataset_cache)
+    output.write_text(report.model_dump_json(indent=2) + "\n", encoding="utf-8")
+
+    click.echo(f"Evaluated {report.image_count} images with {report.workers} workers in {report.wall_time:.1f}s")
+    click.echo(f"Overall match: {report.overall_match_percentage:.2%}, successful detections: {report.success_rate:.2%}")
+    if report.failure_reasons:
+        click.echo(f"Failures: {report.failure_reasons}")
+    if report.latency:
+        click.echo(f"Latency per image: p50 {report.latency.p50:.2f}s, p95 {report.latency.p95:.2f}s")
+    click.echo(f"Report written to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Import time benchmark that fails if the scoring layer or the server pull in torch before a model is loaded."""
+
+import json
+import subprocess
+import sys
+from operator import attrgetter
+from typing import List, Sequence
+
+import click
+from pydantic import BaseModel
+
+# Everything needed to calibrate and score detections without running a model
+LIGHTWEIGHT_MODULES = (
+    "detector.model.detection_models",
+    "detector.geometry.board",
+    "detector.service.calibration.calibration_matrix_calculator",
+    "detector.service.calibration.coordinate_transformer",
+    "detector.service.scoring.dart_point_score_calculator",
+    "detector.service.detection_scoring_service",
+)
+# Modules that load models when their services are created, but not when they are imported
+DEFERRED_MODEL_MODULES = (
+    "detector.service.dart_image_scoring_service",
+    "detector.entrypoint.image_score_pipeline",
+    "autoscore.websocket.dart_websocket_server",
+)
+HEAVY_MODULES = ("torch", "ultralytics")
+
+IMPORT_SCRIPT = """
+import importlib, json, sys, time
+start = time.perf_counter()
+importlib.import_module(sys.argv[1])
+seconds = time.perf_counter() - start
+print(json.dumps({"seconds": seconds, "heavy_modules": [name for name in sys.argv[2:] if name in sys.modules]}))
+"""
+
+
+class ImportMeasurement(BaseModel):
+    """Time to import a module in a fresh interpreter and the heavy modules the import pulled in."""
+
+    module: str
+    seconds: float
+    heavy_modules: List[str]
+
+
+def measure_import(module: str, heavy_modules: Sequence[str] = HEAVY_MODULES) -> ImportMeasurement:
+    """Import a module in a fresh interpreter, so no module imported before skews the measurement."""
+    completed = subprocess.run(  # noqa: S603
+        [sys.executable, "-c", IMPORT_SCRIPT, module, *heavy_modules], capture_output=True, text=True, check=True
+    )
+    return ImportMeasurement(module=module, **json.loads(completed.stdout))
+
+
+@click.command()
+@click.option("--repeat", type=click.IntRange(min=1), default=3, help="Fresh imports per module, the fastest one is reported")
+@click.option("--max-seconds", type=click.FloatRange(min=0.0), default=2.0, help="Budget of the import time of each module")
+def main(repeat: int, max_seconds: float) -> None:
+    """Measure the import time of the scoring layer and the server and fail if torch is imported too early."""
+    violations: List[str] = []
+    click.echo(f"{'module':<62}{'seconds':>10}  heavy modules")
+    for module in (*LIGHTWEIGHT_MODULES, *DEFERRED_MODEL_MODULES):
+        measurement = min((measure_import(module) for _ in range(repeat)), key=attrgetter("seconds"))
+        click.echo(f"{module:<62}{measurement.seconds:>10.3f}  {', '.join(measurement.heavy_modules) or '-'}")
+        if measurement.heavy_modules:
+            violations.append(f"{module} imports {', '.join(measurement.heavy_modules)}")
+        if measurement.seconds > max_seconds:
+            violations.append(f"{module} takes {measurement.seconds:.3f}s to import, the budget is {max_seconds:.3f}s")
+
+    for violation in violations:
+        click.echo(f"IMPORT BUDGET EXCEEDED {violation}", err=True)
+    if violations:
+        sys.exit(1)
+    click.echo("All modules import without torch within the time budget")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,286 @@
+"""Load generator simulating concurrent dartboard clients of the autoscore WebSocket server."""
+
+import asyncio
+import base64
+import collections
+import json
+import logging
+import time
+from dataclasses import dataclass, field
+from enum import Enum
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional, Sequence, Tuple
+
+import click
+import websockets
+from pydantic import BaseModel
+
+from autoscore.model.request import PipelineDetectionRequest, RequestType
+from autoscore.model.response import Status
+from benchmark import IMAGE_PATH, find_images
+from benchmark.statistics import Percentiles
+from detector.model.detection_result_code import ResultCode
+
+logger = logging.getLogger("LoadGenerator")
+
+MAX_MESSAGE_SIZE = 20 * 1024 * 1024
+RESPONSE_TIMEOUT = 30.0
+
+
+class LoadMode(Enum):
+    """How simulated boards pace their frames."""
+
+    OPEN = "open"
+    """Frames are sent on a fixed schedule, independent of outstanding responses."""
+    CLOSED = "closed"
+    """The next frame is only sent once the response to the previous one arrived."""
+
+
+class LoadReport(BaseModel):
+    """Results of a single load generator run."""
+
+    mode: LoadMode
+    boards: int
+    target_fps: float
+    duration_seconds: float
+    scheduled: int
+    sent: int
+    completed: int
+    errors: int
+    skipped: int
+    cache_hits: int
+    throughput_per_second: float
+    error_rate: float
+    skip_rate: float
+    latency: Optional[Percentiles] = None
+    result_codes: Dict[str, int]
+    stage_timings: Dict[str, Percentiles]
+
+
+@dataclass
+class BoardStatistics:
+    """Mutable counters collected by a simulated board."""
+
+    scheduled: int = 0
+    sent: int = 0
+    completed: int = 0
+    errors: int = 0
+    skipped: int = 0
+    cache_hits: int = 0
+    latencies: List[float] = field(default_factory=list)
+    result_codes: collections.Counter = field(default_factory=collections.Counter)
+    stage_timings: Dict[str, List[float]] = field(default_factory=lambda: collections.defaultdict(list))
+
+    def record_response(self, message: str | bytes, latency: float) -> None:
+        """Record the latency and outcome of a received response."""
+        self.completed += 1
+        self.latencies.append(latency)
+        response: Dict[str, Any] = json.loads(message)
+        if response.get("status") != Status.SUCCESS.value:
+            self.errors += 1
+            self.result_codes[Status.ERROR.name] += 1
+            return
+
+        self.cache_hits += bool(response.get("cached"))
+        detection_result = response.get("detection_result") or {}
+        if "result_code" in detection_result:
+            self.result_codes[ResultCode(detection_result["result_code"]).name] += 1
+        for stage, duration in (detection_result.get("stage_timings") or {}).items():
+            if duration is not None:
+                self.stage_timings[stage].append(duration)
+
+
+class SimulatedBoard:
+    """A single dartboard client sending frames at a target rate over its own connection."""
+
+    logger = logging.getLogger(__qualname__)
+
+    def __init__(  # noqa: PLR0913
+        self, uri: str, session_id: str, frames: Sequence[str], fps: float, mode: LoadMode, max_in_flight: int = 4
+    ) -> None:
+        self.__uri = uri
+        self.__requests = [
+            PipelineDetectionRequest(session_id=session_id, request_type=RequestType.FULL, image=frame).model_dump_json()
+            for frame in frames
+        ]
+        self.__period = 1.0 / fps
+        self.__mode = mode
+        self.__max_in_flight = max_in_flight
+        self.statistics = BoardStatistics()
+
+    async def run(self, duration: float) -> BoardStatistics:
+        """Send frames for the given duration in seconds and collect statistics."""
+        try:
+            async with websockets.connect(self.__uri, max_size=MAX_MESSAGE_SIZE) as websocket:
+                if self.__mode is LoadMode.CLOSED:
+                    await self.__run_closed_loop(websocket, duration)
+                else:
+                    await self.__run_open_loop(websocket, duration)
+        except (OSError, websockets.exceptions.WebSocketException):
+            self.logger.exception("Board connection failed")
+            self.statistics.errors += 1
+        return self.statistics
+
+    async def __run_closed_loop(self, websocket: websockets.ClientConnection, duration: float) -> None:
+        start_time = time.perf_counter()
+        frame_index = 0
+        while (next_frame_at := start_time + frame_index * self.__period) < start_time + duration:
+            await asyncio.sleep(max(0.0, next_frame_at - time.perf_counter()))
+            self.statistics.scheduled += 1
+            send_time = time.perf_counter()
+            await websocket.send(self.__requests[frame_index % len(self.__requests)])
+            self.statistics.sent += 1
+            self.statistics.record_response(await websocket.recv(), time.perf_counter() - send_time)
+            frame_index += 1
+
+            # Frames that would have been captured while waiting for the response are dropped, like a real client does
+            missed_frames = int((time.perf_counter() - start_time) / self.__period) - frame_index
+            if missed_frames > 0:
+                self.statistics.scheduled += missed_frames
+                self.statistics.skipped += missed_frames
+                frame_index += missed_frames
+
+    async def __run_open_loop(self, websocket: websockets.ClientConnection, duration: float) -> None:
+        in_flight: Deque[float] = collections.deque()
+        all_sent = asyncio.Event()
+
+        async def receive() -> None:
+            while in_flight or not all_sent.is_set():
+                message = await websocket.recv()
+                if in_flight:
+                    self.statistics.record_response(message, time.perf_counter() - in_flight.popleft())
+
+        receiver = asyncio.create_task(receive())
+        start_time = time.perf_counter()
+        frame_index = 0
+        while (next_frame_at := start_time + frame_index * self.__period) < start_time + duration:
+            await asyncio.sleep(max(0.0, next_frame_at - time.perf_counter()))
+            self.statistics.scheduled += 1
+            if len(in_flight) >= self.__max_in_flight:
+                self.statistics.skipped += 1
+            else:
+                in_flight.append(time.perf_counter())
+                await websocket.send(self.__requests[frame_index % len(self.__requests)])
+                self.statistics.sent += 1
+            frame_index += 1
+
+        all_sent.set()
+        if not in_flight:
+            receiver.cancel()
+            await asyncio.gather(receiver, return_exceptions=True)
+            return
+        try:
+            await asyncio.wait_for(receiver, RESPONSE_TIMEOUT)
+        except TimeoutError:
+            self.logger.warning("%d responses did not arrive within %.0f seconds", len(in_flight), RESPONSE_TIMEOUT)
+            self.statistics.errors += len(in_flight)
+
+
+async def run_load(  # noqa: PLR0913
+    uri: str, frames: Sequence[str], boards: int, fps: float, duration: float, mode: LoadMode, max_in_flight: int = 4
+) -> LoadReport:
+    """Simulate the given number of boards against the server and aggregate their statistics."""
+    # Every board starts at a different frame, so the boards do not send identical frames at the same time
+    rotated_frames = [[*frames[index % len(frames) :], *frames[: index % len(frames)]] for index in range(boards)]
+    simulated_boards = [
+        SimulatedBoard(uri, f"load-board-{index}", board_frames, fps, mode, max_in_flight)
+        for index, board_frames in enumerate(rotated_frames)
+    ]
+    start_time = time.perf_counter()
+    statistics = await asyncio.gather(*(board.run(duration) for board in simulated_boards))
+    wall_time = time.perf_counter() - start_time
+    return create_report(statistics, mode, boards, fps, wall_time)
+
+
+def create_report(statistics: Sequence[BoardStatistics], mode: LoadMode, boards: int, fps: float, wall_time: float) -> LoadReport:
+    """Aggregate the statistics of all boards into a report."""
+    scheduled = sum(board.scheduled for board in statistics)
+    completed = sum(board.completed for board in statistics)
+    errors = sum(board.errors for board in statistics)
+    result_codes: collections.Counter = collections.Counter()
+    stage_timings: Dict[str, List[float]] = collections.defaultdict(list)
+    for board in statistics:
+        result_codes.update(board.result_codes)
+        for stage, durations in board.stage_timings.items():
+            stage_timings[stage].extend(durations)
+
+    return LoadReport(
+        mode=mode,
+        boards=boards,
+        target_fps=fps,
+        duration_seconds=wall_time,
+        scheduled=scheduled,
+        sent=sum(board.sent for board in statistics),
+        completed=completed,
+        errors=errors,
+        skipped=sum(board.skipped for board in statistics),
+        cache_hits=sum(board.cache_hits for board in statistics),
+        throughput_per_second=completed / wall_time if wall_time > 0 else 0.0,
+        error_rate=errors / completed if completed else 0.0,
+        skip_rate=sum(board.skipped for board in statistics) / scheduled if scheduled else 0.0,
+        latency=Percentiles.from_values([latency for board in statistics for latency in board.latencies]),
+        result_codes=dict(result_codes),
+        stage_timings={
+            stage: percentiles for stage, durations in stage_timings.items() if (percentiles := Percentiles.from_values(durations))
+        },
+    )
+
+
+def print_reports(reports: Sequence[LoadReport]) -> None:
+    """Print the key figures of all runs as a table."""
+    header = (
+        f"{'mode':<8}{'boards':>8}{'fps':>8}{'sent':>8}{'ok/s':>10}"
+        f"{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'errors':>9}{'skipped':>9}"
+    )
+    click.echo(header)
+    click.echo("-" * len(header))
+    for report in reports:
+        p50, p95, p99 = (report.latency.p50, report.latency.p95, report.latency.p99) if report.latency else (0.0, 0.0, 0.0)
+        click.echo(
+            f"{report.mode.value:<8}{report.boards:>8}{report.target_fps:>8.1f}{report.sent:>8}{report.throughput_per_second:>10.2f}"
+            f"{p50 * 1000:>10.1f}{p95 * 1000:>10.1f}{p99 * 1000:>10.1f}{report.error_rate:>9.1%}{report.skip_rate:>9.1%}"
+        )
+    if any(report.cache_hits for report in reports):
+        click.echo("Some responses were served from the result cache, disable it on the server to measure the pipeline")
+
+
+@click.command()
+@click.option("--uri", default="ws://localhost:8765", show_default=True, help="URI of the autoscore WebSocket server")
+@click.option("--image-dir", type=click.Path(exists=True, file_okay=False, path_type=Path), default=IMAGE_PATH, help="Directory of frames")
+@click.option("--boards", multiple=True, type=click.IntRange(min=1), default=(1,), help="Concurrent boards, repeat to step up the load")
+@click.option(
+    "--fps", type=click.FloatRange(min=0.0, min_open=True), default=1.0, show_default=True, help="Target frames per second per board"
+)
+@click.option("--duration", type=click.FloatRange(min=0.0, min_open=True), default=30.0, show_default=True, help="Seconds per run")
+@click.option("--mode", type=click.Choice([mode.value for mode in LoadMode]), default=LoadMode.CLOSED.value, show_default=True)
+@click.option("--max-in-flight", type=click.IntRange(min=1), default=4, show_default=True, help="Outstanding frames per board in open loop")
+@click.option("--output", type=click.Path(dir_okay=False, path_type=Path), help="Write the reports of all runs to a JSON file")
+def main(  # noqa: PLR0913
+    uri: str,
+    image_dir: Path,
+    boards: Tuple[int, ...],
+    fps: float,
+    duration: float,
+    mode: str,
+    max_in_flight: int,
+    output: Optional[Path],
+) -> None:
+    """Simulate concurrent dartboards sending frames to the server and report latency, throughput, errors and skips."""
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    frames = [base64.b64encode(image_path.read_bytes()).decode("utf-8") for image_path in find_images(image_dir)]
+    if not frames:
+        msg = f"No images found in {image_dir}"
+        raise click.ClickException(msg)
+
+    reports = []
+    for board_count in boards:
+        logger.info("Running %s loop load with %d boards at %.1f fps for %.0f seconds", mode, board_count, fps, duration)
+        reports.append(asyncio.run(run_load(uri, frames, board_count, fps, duration, LoadMode(mode), max_in_flight)))
+
+    print_reports(reports)
+    if output:
+        output.write_text(json.dumps([report.model_dump(mode="json") for report in reports], indent=2) + "\n", encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""Attribution of traced allocations to modules and packages, and the per-frame memory budget."""
+
+import importlib.util
+import platform
+import tracemalloc
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from pydantic import BaseModel, Field
+
+from benchmark.statistics import Percentiles
+
+REPO_PACKAGES = ("detector", "autoscore")
+THIRD_PARTY_DIRECTORIES = ("site-packages", "dist-packages")
+STDLIB = "stdlib"
+UNKNOWN = "<unknown>"
+MIB = 1024 * 1024
+
+DEFAULT_MAX_FRAME_PEAK_BYTES = 256 * MIB
+DEFAULT_MAX_FRAME_RETAINED_BYTES = 64 * 1024
+
+
+class MemoryReport(BaseModel):
+    """Memory used by the models and allocated per frame in a fixed pipeline workload."""
+
+    python_version: str = Field(default_factory=platform.python_version)
+    machine: str = Field(default_factory=platform.machine)
+    frames: int
+    decoded_frame_bytes: float
+    model_rss_bytes: int
+    model_traced_bytes: int
+    peak_rss_bytes: int
+    frame_peak_bytes: Optional[Percentiles] = None
+    max_frame_peak_bytes: int
+    frame_retained_bytes: float
+    allocations_by_module: Dict[str, int]
+    allocations_by_package: Dict[str, int]
+
+
+def check_budget(
+    report: MemoryReport,
+    max_frame_peak_bytes: int = DEFAULT_MAX_FRAME_PEAK_BYTES,
+    max_frame_retained_bytes: int = DEFAULT_MAX_FRAME_RETAINED_BYTES,
+) -> List[str]:
+    """Describe every per-frame allocation metric of the report that exceeds its budget."""
+    violations: List[str] = []
+    if report.max_frame_peak_bytes > max_frame_peak_bytes:
+        violations.append(
+            f"peak allocation per frame of {report.max_frame_peak_bytes} bytes exceeds the budget of {max_frame_peak_bytes} bytes"
+        )
+    if report.frame_retained_bytes > max_frame_retained_bytes:
+        violations.append(
+            f"memory retained per frame of {report.frame_retained_bytes:.0f} bytes exceeds the budget of {max_frame_retained_bytes} bytes"
+        )
+    return violations
+
+
+class AllocationAttributor:
+    """Assigns traced allocations to the innermost repository module and the innermost package that made them."""
+
+    def __init__(self, repo_packages: Tuple[str, ...] = REPO_PACKAGES) -> None:
+        self.__package_roots: Dict[str, Path] = {}
+        for package in repo_packages:
+            spec = importlib.util.find_spec(package)
+            if spec is not None and spec.origin is not None:
+                self.__package_roots[package] = Path(spec.origin).parent
+        self.__by_module: Counter[str] = Counter()
+        self.__by_package: Counter[str] = Counter()
+
+    def add(self, snapshot: tracemalloc.Snapshot, previous: tracemalloc.Snapshot) -> None:
+        """Attribute the memory allocated between two snapshots and still alive in the later one."""
+        for difference in snapshot.compare_to(previous, "traceback"):
+            if difference.size_diff <= 0:
+                continue
+            module, package = self.owner(difference.traceback)
+            self.__by_module[module] += difference.size_diff
+            self.__by_package[package] += difference.size_diff
+
+    def owner(self, traceback: tracemalloc.Traceback) -> Tuple[str, str]:
+        """Get the innermost repository module and the innermost package of an allocation traceback."""
+        # Frames are ordered from the oldest to the most recent call
+        filenames = [frame.filename for frame in reversed(traceback)]
+        module = next((name for name in map(self.module_name, filenames) if name is not None), UNKNOWN)
+        return module, self.package_name(filenames[0]) if filenames else UNKNOWN
+
+    def module_name(self, filename: str) -> Optional[str]:
+        """Get the dotted name of a repository module, or None if the file is not part of the repository packages."""
+        path = Path(filename)
+        for package, root in self.__package_roots.items():
+            if path.is_relative_to(root):
+                return ".".join((package, *path.relative_to(root).with_suffix("").parts))
+        return None
+
+    def package_name(self, filename: str) -> str:
+        """Get the top level package of a file, e.g. 'numpy', 'detector' or 'stdlib'."""
+        module = self.module_name(filename)
+        if module is not None:
+            return module.split(".")[0]
+        if filename.startswith("<"):
+            return filename
+        parts = Path(filename).parts
+        for directory in THIRD_PARTY_DIRECTORIES:
+            if directory in parts[:-1]:
+                return Path(parts[parts.index(directory) + 1]).stem
+        return STDLIB
+
+    def by_module(self, frames: int) -> Dict[str, int]:
+        """Get the mean bytes per frame attributed to each repository module, largest first."""
+        return {name: size // max(1, frames) for name, size in self.__by_module.most_common()}
+
+    def by_package(self, frames: int) -> Dict[str, int]:
+        """Get the mean bytes per frame attributed to each package, largest first."""
+        return {name: size // max(1, frames) for name, size in self.__by_package.most_common()}
@@ -0,0 +1,157 @@
+"""Memory benchmark of the dart detection pipeline that fails if a frame allocates more than its budget."""
+
+import logging
+import sys
+import tracemalloc
+from pathlib import Path
+from typing import List, Optional, Sequence
+
+import click
+
+from benchmark import IMAGE_PATH, find_images
+from benchmark.memory import (
+    DEFAULT_MAX_FRAME_PEAK_BYTES,
+    DEFAULT_MAX_FRAME_RETAINED_BYTES,
+    MIB,
+    AllocationAttributor,
+    MemoryReport,
+    check_budget,
+)
+from benchmark.statistics import Percentiles, current_rss_bytes, peak_rss_bytes
+from detector.entrypoint.image_score_pipeline import DartBoardImageToScorePipeline
+from detector.model.configuration import ProcessingConfig
+from detector.util.file_utils import load_image
+
+logger = logging.getLogger("MemoryBenchmark")
+
+TRACEBACK_FRAMES = 32
+
+
+class PipelineMemoryBenchmark:
+    """Runs a fixed workload through the pipeline and traces the memory of the models and of every frame."""
+
+    logger = logging.getLogger(__qualname__)
+
+    def __init__(
+        self, image_paths: Sequence[Path], config: Optional[ProcessingConfig] = None, iterations: int = 2, warmup: int = 1
+    ) -> None:
+        self.__config = config or ProcessingConfig()
+        self.__image_paths = list(image_paths)
+        self.__iterations = iterations
+        self.__warmup = warmup
+
+    def run(self) -> MemoryReport:
+        """Load the models and score every image, tracing the allocations of each frame."""
+        decoded_frame_bytes = sum(load_image(image_path).raw_image.nbytes for image_path in self.__image_paths) / len(self.__image_paths)
+
+        rss_before_models = current_rss_bytes()
+        tracemalloc.start(TRACEBACK_FRAMES)
+        try:
+            traced_before_models = tracemalloc.get_traced_memory()[0]
+            pipeline = DartBoardImageToScorePipeline(self.__config)
+            model_traced_bytes = tracemalloc.get_traced_memory()[0] - traced_before_models
+            # Torch allocates tensors outside of the Python allocator, so only the resident set size shows the model weights
+            model_rss_bytes = current_rss_bytes() - rss_before_models
+            self.logger.info("Models use %.1f MB resident, %.1f MB traced", model_rss_bytes / MIB, model_traced_bytes / MIB)
+
+            for _ in range(self.__warmup):
+                for image_path in self.__image_paths:
+                    pipeline.detect_darts(image_path)
+
+            attributor = AllocationAttributor()
+            frame_peaks: List[int] = []
+            traced_before_frames = tracemalloc.get_traced_memory()[0]
+            for _ in range(self.__iterations):
+                frame_peaks.extend(self.__trace_frame(pipeline, image_path, attributor) for image_path in self.__image_paths)
+            frame_retained_bytes = (tracemalloc.get_traced_memory()[0] - traced_before_frames) / len(frame_peaks)
+        finally:
+            tracemalloc.stop()
+
+        return MemoryReport(
+            frames=len(frame_peaks),
+            decoded_frame_bytes=decoded_frame_bytes,
+            model_rss_bytes=model_rss_bytes,
+            model_traced_bytes=model_traced_bytes,
+            peak_rss_bytes=peak_rss_bytes(),
+            frame_peak_bytes=Percentiles.from_values(frame_peaks),
+            max_frame_peak_bytes=max(frame_peaks),
+            frame_retained_bytes=frame_retained_bytes,
+            allocations_by_module=attributor.by_module(len(frame_peaks)),
+            allocations_by_package=attributor.by_package(len(frame_peaks)),
+        )
+
+    @staticmethod
+    def __trace_frame(pipeline: DartBoardImageToScorePipeline, image_path: Path, attributor: AllocationAttributor) -> int:
+        """Score a single image and return the peak memory it allocated on top of what was allocated before."""
+        exclude_tracemalloc = tracemalloc.Filter(inclusive=False, filename_pattern=tracemalloc.__file__)
+        previous = tracemalloc.take_snapshot().filter_traces([exclude_tracemalloc])
+        traced_before = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+
+        detection_result = pipeline.detect_darts(image_path)
+
+        peak = tracemalloc.get_traced_memory()[1] - traced_before
+        # The snapshot still holds the detection result, so its size counts towards the frame
+        attributor.add(tracemalloc.take_snapshot().filter_traces([exclude_tracemalloc]), previous)
+        del detection_result
+        return peak
+
+
+def print_report(report: MemoryReport, top: int) -> None:
+    """Print the model memory, the per-frame allocations and the largest allocating modules and packages."""
+    click.echo(f"Frames: {report.frames}, decoded frame size {report.decoded_frame_bytes / MIB:.1f} MB")
+    click.echo(f"Models: {report.model_rss_bytes / MIB:.1f} MB resident, {report.model_traced_bytes / MIB:.1f} MB traced")
+    click.echo(f"Peak RSS: {report.peak_rss_bytes / MIB:.1f} MB")
+    if report.frame_peak_bytes:
+        click.echo(
+            f"Peak allocation per frame: p50 {report.frame_peak_bytes.p50 / MIB:.1f} MB, "
+            f"p95 {report.frame_peak_bytes.p95 / MIB:.1f} MB, max {report.max_frame_peak_bytes / MIB:.1f} MB"
+        )
+    click.echo(f"Retained per frame: {report.frame_retained_bytes / 1024:.1f} KB")
+    for title, allocations in (("module", report.allocations_by_module), ("package", report.allocations_by_package)):
+        click.echo(f"\n{title:<50}{'KB per frame':>14}")
+        for name, size in list(allocations.items())[:top]:
+            click.echo(f"{name:<50}{size / 1024:>14.1f}")
+
+
+@click.command()
+@click.option("--image-dir", type=click.Path(exists=True, file_okay=False, path_type=Path), default=IMAGE_PATH, help="Directory of images")
+@click.option("--iterations", type=click.IntRange(min=1), default=2, help="Traced passes over all images")
+@click.option("--warmup", type=click.IntRange(min=0), default=1, help="Untraced passes over all images before tracing")
+@click.option(
+    "--max-frame-peak-mb",
+    type=click.FloatRange(min=0.0),
+    default=DEFAULT_MAX_FRAME_PEAK_BYTES / MIB,
+    help="Budget of the peak allocation per frame",
+)
+@click.option(
+    "--max-frame-retained-kb",
+    type=click.FloatRange(min=0.0),
+    default=DEFAULT_MAX_FRAME_RETAINED_BYTES / 1024,
+    help="Budget of the memory each frame leaves allocated after the warm-up",
+)
+@click.option("--top", type=click.IntRange(min=1), default=15, help="Number of modules and packages to print")
+@click.option("--output", type=click.Path(dir_okay=False, path_type=Path), help="Write the report of this run to a JSON file")
+def main(  # noqa: PLR0913
+    image_dir: Path, iterations: int, warmup: int, max_frame_peak_mb: float, max_frame_retained_kb: float, top: int, output: Optional[Path]
+) -> None:
+    """Trace the memory of the dart detection pipeline and fail if a frame exceeds the allocation budget."""
+    logging.basicConfig(level=logging.WARNING, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    logger.setLevel(logging.INFO)
+
+    report = PipelineMemoryBenchmark(find_images(image_dir), ProcessingConfig(), iterations=iterations, warmup=warmup).run()
+    print_report(report, top)
+    if output:
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(report.model_dump_json(indent=2) + "\n", encoding="utf-8")
+
+    violations = check_budget(report, int(max_frame_peak_mb * MIB), int(max_frame_retained_kb * 1024))
+    for violation in violations:
+        click.echo(f"BUDGET EXCEEDED {violation}", err=True)
+    if violations:
+        sys.exit(1)
+    click.echo("All frames are within the memory budget")
+
+
+if __name__ == "__main__":
+    main()
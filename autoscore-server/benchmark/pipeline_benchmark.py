@@ -0,0 +1,306 @@
+"""Benchmark of the dart detection pipeline, its services and the WebSocket round trip."""
+
+import asyncio
+import base64
+import logging
+import sys
+import time
+from dataclasses import dataclass
+from functools import partial
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, List, Optional, Sequence, Tuple
+
+import click
+import websockets
+
+from autoscore.model.configuration import ServerConfig
+from autoscore.model.request import PipelineDetectionRequest, RequestType
+from autoscore.websocket.dart_websocket_server import DartWebSocketServer
+from benchmark import BASELINE_PATH, IMAGE_PATH, find_images
+from benchmark.baseline import DEFAULT_TOLERANCE, BenchmarkReport, find_regressions
+from benchmark.memory import MIB
+from benchmark.statistics import LatencyStatistics, current_rss_bytes, peak_rss_bytes, reset_peak_rss
+from detector.entrypoint.image_score_pipeline import DartBoardImageToScorePipeline
+from detector.model.configuration import ProcessingConfig
+from detector.model.detection_models import CalibrationPoint, HomoGraphyMatrix, OriginalDartPosition, TransformedDartPosition
+from detector.model.exception import DartDetectionError
+from detector.service.calibration.calibration_matrix_calculator import CalibrationMatrixCalculator
+from detector.service.calibration.coordinate_transformer import CoordinateTransformer
+from detector.service.image_preprocessor import ImagePreprocessor
+from detector.service.parser.yolo_result_parser import YoloResultParser
+from detector.service.scoring.dart_point_score_calculator import DartPointScoreCalculator
+from detector.util.dataset_cache import DatasetCache, PreprocessedDataset
+from detector.util.file_utils import load_image
+from detector.yolo.dart_detector import YoloDartImageProcessor
+
+if TYPE_CHECKING:
+    from ultralytics.engine.results import Results
+
+logger = logging.getLogger("PipelineBenchmark")
+
+UNLIMITED_FRAME_RATE = 1e9
+UNLIMITED_FRAME_BURST = 10**9
+
+Operation = Callable[[], object]
+
+
+@dataclass
+class PreparedDetection:
+    """Outputs of the models and parsers for one image, used as inputs of the isolated service benchmarks."""
+
+    yolo_result: "Results"
+    calibration_points: List[CalibrationPoint]
+    homography: HomoGraphyMatrix
+    original_positions: List[OriginalDartPosition]
+
+
+class PipelineBenchmark:
+    """Measures the latency of the full pipeline, its services in isolation and the WebSocket round trip."""
+
+    # Needs a dataset cache, so it is skipped in runs without one
+    PREPROCESSED_BENCHMARK = "pipeline_preprocessed"
+    BENCHMARKS = (
+        "pipeline", PREPROCESSED_BENCHMARK, "preprocessor", "result_parser", "calibration_matrix", "score_calculator", "websocket"
+    )
+
+    logger = logging.getLogger(__qualname__)
+
+    def __init__(
+        self,
+        image_paths: Sequence[Path],
+        config: Optional[ProcessingConfig] = None,
+        iterations: int = 5,
+        warmup: int = 1,
+        dataset: Optional[PreprocessedDataset] = None,
+    ) -> None:
+        self.__config = config or ProcessingConfig()
+        self.__dataset = dataset
+        self.__image_paths = list(image_paths)
+        self.__iterations = iterations
+        self.__warmup = warmup
+        self.__images = [load_image(image_path) for image_path in self.__image_paths]
+        self.__detections: Optional[List[PreparedDetection]] = None
+
+    def run(self, names: Sequence[str] = BENCHMARKS) -> BenchmarkReport:
+        """Run the given benchmarks and collect their statistics in a report."""
+        report = BenchmarkReport()
+        for name in names:
+            if name == self.PREPROCESSED_BENCHMARK and self.__dataset is None:
+                self.logger.info("Skipping benchmark %s without a dataset cache", name)
+                continue
+            self.logger.info("Running benchmark %s", name)
+            # Without a resettable peak this is how far the benchmark raised the peak of the whole process
+            reset_peak_rss()
+            rss_before = current_rss_bytes()
+            if name == "websocket":
+                statistics = asyncio.run(self.__measure_websocket_round_trips())
+            else:
+                statistics = self.__measure(self.__operations(name))
+            report.benchmarks[name] = statistics.model_copy(update={"peak_rss_bytes": max(0, peak_rss_bytes() - rss_before)})
+            self.logger.info("Benchmark %s: %s", name, report.benchmarks[name])
+        return report
+
+    def __operations(self, name: str) -> List[Operation]:
+        if name == "pipeline":
+            pipeline = DartBoardImageToScorePipeline(self.__config)
+            return [partial(pipeline.detect_darts, image_path) for image_path in self.__image_paths]
+        if name == self.PREPROCESSED_BENCHMARK and self.__dataset is not None:
+            pipeline = DartBoardImageToScorePipeline(self.__config)
+            dataset = self.__dataset
+            return [partial(pipeline.detect_darts_in_preprocessed, dataset.get(file_name)) for file_name in dataset]
+        if name == "preprocessor":
+            preprocessor = ImagePreprocessor(self.__config)
+            return [partial(preprocessor.preprocess_image, image) for image in self.__images]
+
+        detections = self.__prepare_detections()
+        if name == "result_parser":
+            parser = YoloResultParser(self.__config)
+            return [partial(parser.extract_detections, detection.yolo_result) for detection in detections]
+        if name == "calibration_matrix":
+            calculator = CalibrationMatrixCalculator(self.__config)
+            return [partial(calculator.calculate_homography, detection.calibration_points) for detection in detections]
+        if name == "score_calculator":
+            score_calculator = DartPointScoreCalculator()
+            transformed_positions = self.__transform_positions(detections)
+            return [partial(score_calculator.calculate_scores, positions) for positions in transformed_positions]
+
+        msg = f"Unknown benchmark: {name}"
+        raise ValueError(msg)
+
+    def __prepare_detections(self) -> List[PreparedDetection]:
+        """Run the models once per image, so the services after them can be measured in isolation."""
+        if self.__detections is not None:
+            return self.__detections
+
+        preprocessor = ImagePreprocessor(self.__config)
+        yolo_image_processor = YoloDartImageProcessor(self.__config)
+        parser = YoloResultParser(self.__config)
+        calculator = CalibrationMatrixCalculator(self.__config)
+
+        self.__detections = []
+        for image_path, image in zip(self.__image_paths, self.__images, strict=True):
+            yolo_result = yolo_image_processor.detect(preprocessor.preprocess_image(image).dart_image)
+            parse_result = parser.extract_detections(yolo_result)
+            try:
+                homography = calculator.calculate_homography(parse_result.calibration_points)
+            except DartDetectionError:
+                self.logger.warning("Skipping %s for isolated benchmarks, the board could not be calibrated", image_path.name)
+                continue
+            self.__detections.append(
+                PreparedDetection(yolo_result, parse_result.calibration_points, homography, parse_result.original_positions)
+            )
+
+        if not self.__detections:
+            msg = "None of the benchmark images could be calibrated"
+            raise RuntimeError(msg)
+        return self.__detections
+
+    def __transform_positions(self, detections: List[PreparedDetection]) -> List[List[TransformedDartPosition]]:
+        transformer = CoordinateTransformer(self.__config)
+        return [transformer.transform_to_board_dimensions(detection.homography, detection.original_positions) for detection in detections]
+
+    def __measure(self, operations: Sequence[Operation]) -> LatencyStatistics:
+        for _ in range(self.__warmup):
+            for operation in operations:
+                operation()
+
+        durations: List[float] = []
+        start_time = time.perf_counter()
+        for _ in range(self.__iterations):
+            for operation in operations:
+                operation_start = time.perf_counter()
+                operation()
+                durations.append(time.perf_counter() - operation_start)
+        return LatencyStatistics.from_durations(durations, time.perf_counter() - start_time)
+
+    async def __measure_websocket_round_trips(self) -> LatencyStatistics:
+        # Every frame has to run the full detection, so caches, rate limits and quality degradation are all turned off
+        server_config = ServerConfig(
+            metrics_enabled=False,
+            result_cache_enabled=False,
+            negative_cache_enabled=False,
+            quality_ladder_enabled=False,
+            session_frame_rate=UNLIMITED_FRAME_RATE,
+            session_frame_burst=UNLIMITED_FRAME_BURST,
+            ip_frame_rate=UNLIMITED_FRAME_RATE,
+            ip_frame_burst=UNLIMITED_FRAME_BURST,
+        )
+        server = DartWebSocketServer(server_config)
+        requests = [
+            PipelineDetectionRequest(
+                session_id="benchmark",
+                request_type=RequestType.FULL,
+                image=base64.b64encode(image_path.read_bytes()).decode("utf-8"),
+            ).model_dump_json()
+            for image_path in self.__image_paths
+        ]
+
+        max_size = server_config.max_message_size
+        try:
+            async with websockets.serve(server.register_connection, "127.0.0.1", 0, max_size=max_size) as websocket_server:
+                port = next(iter(websocket_server.sockets)).getsockname()[1]
+                async with websockets.connect(f"ws://127.0.0.1:{port}", max_size=max_size) as websocket:
+                    for _ in range(self.__warmup):
+                        for request in requests:
+                            await websocket.send(request)
+                            await websocket.recv()
+
+                    durations: List[float] = []
+                    start_time = time.perf_counter()
+                    for _ in range(self.__iterations):
+                        for request in requests:
+                            request_start = time.perf_counter()
+                            await websocket.send(request)
+                            await websocket.recv()
+                            durations.append(time.perf_counter() - request_start)
+                    wall_time = time.perf_counter() - start_time
+        finally:
+            await server.stop()
+        return LatencyStatistics.from_durations(durations, wall_time)
+
+
+def print_report(report: BenchmarkReport) -> None:
+    """Print the statistics of all benchmarks as a table."""
+    header = f"{'benchmark':<20}{'samples':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'ops/s':>10}{'peak MB':>10}"
+    click.echo(header)
+    click.echo("-" * len(header))
+    for name, statistics in report.benchmarks.items():
+        click.echo(
+            f"{name:<20}{statistics.samples:>8}"
+            f"{statistics.p50_seconds * 1000:>10.2f}{statistics.p95_seconds * 1000:>10.2f}{statistics.p99_seconds * 1000:>10.2f}"
+            f"{statistics.throughput_per_second:>10.2f}{statistics.peak_rss_bytes / MIB:>10.1f}"
+        )
+
+
+@click.command()
+@click.option("--image-dir", type=click.Path(exists=True, file_okay=False, path_type=Path), default=IMAGE_PATH, help="Directory of images")
+@click.option(
+    "--benchmark", "names", multiple=True, type=click.Choice(PipelineBenchmark.BENCHMARKS), help="Benchmarks to run, all if omitted"
+)
+@click.option("--iterations", type=click.IntRange(min=1), default=5, help="Measured passes over all images")
+@click.option("--warmup", type=click.IntRange(min=0), default=1, help="Unmeasured passes over all images before measuring")
+@click.option(
+    "--baseline", "baseline_path", type=click.Path(dir_okay=False, path_type=Path), default=BASELINE_PATH, help="Baseline JSON file"
+)
+@click.option(
+    "--tolerance", type=click.FloatRange(min=0.0), default=DEFAULT_TOLERANCE, help="Allowed relative regression, e.g. 0.2 for 20%"
+)
+@click.option("--update-baseline", is_flag=True, help="Store the results as the new baseline instead of comparing against it")
+@click.option("--output", type=click.Path(dir_okay=False, path_type=Path), help="Write the report of this run to a JSON file")
+@click.option(
+    "--dataset-cache",
+    type=click.Path(file_okay=False, path_type=Path),
+    help="Also benchmark the pipeline on preprocessed frames of this cache, as pipeline_preprocessed",
+)
+def main(  # noqa: PLR0913
+    image_dir: Path,
+    names: Tuple[str, ...],
+    iterations: int,
+    warmup: int,
+    baseline_path: Path,
+    tolerance: float,
+    update_baseline: bool,  # noqa: FBT001
+    output: Optional[Path],
+    dataset_cache: Optional[Path],
+) -> None:
+    """Benchmark the dart detection pipeline and fail if it regressed against the baseline."""
+    logging.basicConfig(level=logging.WARNING, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    logger.setLevel(logging.INFO)
+
+    config = ProcessingConfig()
+    dataset = DatasetCache(dataset_cache).load(config, image_dir) if dataset_cache else None
+    if dataset_cache and not dataset:
+        msg = f"No dataset cache for the current config in {dataset_cache}, build it with benchmark.dataset_cache first"
+        raise click.ClickException(msg)
+    if PipelineBenchmark.PREPROCESSED_BENCHMARK in names and not dataset:
+        msg = f"The {PipelineBenchmark.PREPROCESSED_BENCHMARK} benchmark needs --dataset-cache"
+        raise click.ClickException(msg)
+
+    benchmark = PipelineBenchmark(find_images(image_dir), config, iterations=iterations, warmup=warmup, dataset=dataset)
+    report = benchmark.run(names or PipelineBenchmark.BENCHMARKS)
+    print_report(report)
+    if output:
+        report.to_json(output)
+
+    if update_baseline:
+        baseline = BenchmarkReport.from_json(baseline_path) if baseline_path.exists() else BenchmarkReport()
+        baseline.benchmarks.update(report.benchmarks)
+        baseline.to_json(baseline_path)
+        click.echo(f"Updated baseline {baseline_path}")
+        return
+
+    if not baseline_path.exists():
+        msg = f"No baseline at {baseline_path}, run with --update-baseline to create one"
+        raise click.ClickException(msg)
+
+    baseline = BenchmarkReport.from_json(baseline_path)
+    regressions = find_regressions(report, baseline, tolerance)
+    for regression in regressions:
+        click.echo(f"REGRESSION {regression}", err=True)
+    if regressions:
+        sys.exit(1)
+    click.echo(f"No regressions beyond {tolerance:.0%} against {baseline_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Latency statistics, throughput and memory usage of benchmark runs."""
+
+import os
+import resource
+import sys
+from pathlib import Path
+from typing import Optional, Sequence
+
+import numpy as np
+from pydantic import BaseModel, Field
+
+KIB = 1024
+STATM_PATH = Path("/proc/self/statm")
+STATUS_PATH = Path("/proc/self/status")
+CLEAR_REFS_PATH = Path("/proc/self/clear_refs")
+# Writing 5 to clear_refs resets the peak resident set size of the process to its current size
+RESET_PEAK_RSS = "5"
+PEAK_RSS_FIELD = "VmHWM:"
+
+
+class Percentiles(BaseModel):
+    """Count, mean and percentiles of a set of values."""
+
+    count: int
+    mean: float
+    p50: float
+    p95: float
+    p99: float
+
+    @classmethod
+    def from_values(cls, values: Sequence[float]) -> Optional["Percentiles"]:
+        """Summarize the values, or return None if there are none."""
+        if not values:
+            return None
+        array = np.asarray(values, dtype=np.float64)
+        p50, p95, p99 = np.percentile(array, [50, 95, 99])
+        return cls(count=len(array), mean=float(array.mean()), p50=float(p50), p95=float(p95), p99=float(p99))
+
+
+class LatencyStatistics(BaseModel):
+    """Latency percentiles and throughput of a single benchmark."""
+
+    samples: int
+    mean_seconds: float
+    p50_seconds: float
+    p95_seconds: float
+    p99_seconds: float
+    throughput_per_second: float
+    peak_rss_bytes: int = Field(default=0, description="Peak resident memory the benchmark added to the process, 0 if not measured")
+
+    @classmethod
+    def from_durations(cls, durations: Sequence[float], wall_time: float) -> "LatencyStatistics":
+        """Summarize the durations in seconds of all operations measured within the given wall time."""
+        if not durations:
+            msg = "Cannot compute statistics without any measured durations"
+            raise ValueError(msg)
+        values = np.asarray(durations, dtype=np.float64)
+        p50, p95, p99 = np.percentile(values, [50, 95, 99])
+        return cls(
+            samples=len(values),
+            mean_seconds=float(values.mean()),
+            p50_seconds=float(p50),
+            p95_seconds=float(p95),
+            p99_seconds=float(p99),
+            throughput_per_second=len(values) / wall_time if wall_time > 0 else 0.0,
+        )
+
+
+def peak_rss_bytes() -> int:
+    """Get the peak resident set size of the current process in bytes, since the last reset where it can be reset."""
+    try:
+        status = STATUS_PATH.read_text(encoding="utf-8")
+    except OSError:
+        status = ""
+    for line in status.splitlines():
+        if line.startswith(PEAK_RSS_FIELD):
+            return int(line.split()[1]) * KIB
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS reports bytes
+    return max_rss if sys.platform == "darwin" else max_rss * KIB
+
+
+def current_rss_bytes() -> int:
+    """Get the current resident set size of the current process in bytes, or the peak where it is not available."""
+    try:
+        resident_pages = int(STATM_PATH.read_text(encoding="utf-8").split()[1])
+    except OSError:
+        return peak_rss_bytes()
+    return resident_pages * os.sysconf("SC_PAGE_SIZE")
+
+
+def reset_peak_rss() -> bool:
+    """Reset the peak resident set size to the current one, so it covers only what runs afterwards, and tell if it was reset."""
+    try:
+        CLEAR_REFS_PATH.write_text(RESET_PEAK_RSS, encoding="utf-8")
+    except OSError:
+        return False
+    return True
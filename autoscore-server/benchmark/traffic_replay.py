@@ -0,0 +1,228 @@
+"""Time-accurate replay of recorded WebSocket traffic against a server, diffing the responses with the recorded ones."""
+
+import asyncio
+import json
+import logging
+import math
+import sys
+import time
+from collections import defaultdict, deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Deque, Dict, FrozenSet, List, Optional, Tuple
+
+import click
+import websockets
+import websockets.exceptions
+from pydantic import BaseModel
+from websockets.asyncio.client import ClientConnection
+
+from autoscore.service.traffic_recorder import TrafficDirection, read_traffic
+from benchmark.statistics import Percentiles
+
+logger = logging.getLogger("TrafficReplay")
+
+MAX_MESSAGE_SIZE = 20 * 1024 * 1024
+RESPONSE_TIMEOUT = 60.0
+MAX_REPORTED_DIFFERENCES = 50
+VOLATILE_FIELDS = frozenset({"processing_time", "creation_time", "stage_timings", "cached"})
+
+
+@dataclass
+class RecordedConnection:
+    """Requests and responses recorded on a single connection."""
+
+    requests: List[Tuple[float, bytes]] = field(default_factory=list)
+    responses: List[bytes] = field(default_factory=list)
+
+
+class ReplayReport(BaseModel):
+    """Results of replaying a traffic recording."""
+
+    connections: int
+    requests: int
+    responses: int
+    progress_messages: int
+    missing_responses: int
+    mismatches: int
+    duration_seconds: float
+    latency: Optional[Percentiles] = None
+    differences: List[str]
+
+
+def load_recording(path: Path) -> Dict[int, RecordedConnection]:
+    """Group the records of a recording by the connection they were received on."""
+    connections: Dict[int, RecordedConnection] = defaultdict(RecordedConnection)
+    for record in read_traffic(path):
+        connection = connections[record.connection_id]
+        if record.direction is TrafficDirection.REQUEST:
+            connection.requests.append((record.timestamp, record.payload))
+        else:
+            connection.responses.append(record.payload)
+    return dict(connections)
+
+
+def request_id_of(message: object) -> Optional[str]:
+    """Get the request id of a decoded request or response, or None if it has none and can only be matched by order."""
+    request_id = message.get("request_id") if isinstance(message, dict) else None
+    return str(request_id) if request_id is not None else None
+
+
+def is_progress(response: object) -> bool:
+    """Check whether a decoded response reports an intermediate stage of a streamed detection instead of its result."""
+    return isinstance(response, dict) and "progress" in response
+
+
+def diff_responses(expected: object, actual: object, ignored_fields: FrozenSet[str] = VOLATILE_FIELDS, path: str = "$") -> List[str]:
+    """Describe the differences between two decoded responses, ignoring fields that change between runs."""
+    if isinstance(expected, dict) and isinstance(actual, dict):
+        differences = []
+        for key in sorted(expected.keys() | actual.keys()):
+            if key in ignored_fields:
+                continue
+            if key not in actual or key not in expected:
+                differences.append(f"{path}.{key}: {'missing' if key not in actual else 'unexpected'}")
+            else:
+                differences.extend(diff_responses(expected[key], actual[key], ignored_fields, f"{path}.{key}"))
+        return differences
+    if isinstance(expected, list) and isinstance(actual, list):
+        if len(expected) != len(actual):
+            return [f"{path}: expected {len(expected)} items, got {len(actual)}"]
+        return [
+            difference
+            for index, (expected_item, actual_item) in enumerate(zip(expected, actual, strict=True))
+            for difference in diff_responses(expected_item, actual_item, ignored_fields, f"{path}[{index}]")
+        ]
+    if isinstance(expected, float) and isinstance(actual, (int, float)):
+        return [] if math.isclose(expected, actual, rel_tol=1e-6, abs_tol=1e-9) else [f"{path}: expected {expected}, got {actual}"]
+    return [] if expected == actual else [f"{path}: expected {expected!r}, got {actual!r}"]
+
+
+class TrafficReplayer:
+    """Streams recorded requests back to a server, keeping the original timing scaled by a speed factor."""
+
+    logger = logging.getLogger(__qualname__)
+
+    def __init__(self, uri: str, connections: Dict[int, RecordedConnection], speed: float = 1.0) -> None:
+        self.__uri = uri
+        self.__connections = connections
+        self.__speed = speed
+        self.__latencies: List[float] = []
+        self.__differences: List[str] = []
+        self.__mismatches = 0
+        self.__responses = 0
+        self.__progress_messages = 0
+
+    async def replay(self) -> ReplayReport:
+        """Replay all connections concurrently and compare their responses with the recorded ones."""
+        first_timestamp = min((connection.requests[0][0] for connection in self.__connections.values() if connection.requests), default=0.0)
+        start_time = time.perf_counter()
+        await asyncio.gather(
+            *(self.__replay_connection(connection_id, connection, first_timestamp, start_time)
+              for connection_id, connection in self.__connections.items() if connection.requests)
+        )
+        requests = sum(len(connection.requests) for connection in self.__connections.values())
+        return ReplayReport(
+            connections=len(self.__connections),
+            requests=requests,
+            responses=self.__responses,
+            progress_messages=self.__progress_messages,
+            missing_responses=requests - self.__responses,
+            mismatches=self.__mismatches,
+            duration_seconds=time.perf_counter() - start_time,
+            latency=Percentiles.from_values(self.__latencies),
+            differences=self.__differences[:MAX_REPORTED_DIFFERENCES],
+        )
+
+    async def __replay_connection(
+        self, connection_id: int, connection: RecordedConnection, first_timestamp: float, start_time: float
+    ) -> None:
+        send_times: Dict[Optional[str], Deque[float]] = defaultdict(deque)
+        async with websockets.connect(self.__uri, max_size=MAX_MESSAGE_SIZE) as websocket:
+            receiver = asyncio.create_task(self.__receive(websocket, connection_id, connection, send_times))
+            try:
+                for timestamp, payload in connection.requests:
+                    if self.__speed > 0:
+                        delay = start_time + (timestamp - first_timestamp) / self.__speed - time.perf_counter()
+                        await asyncio.sleep(max(0.0, delay))
+                    send_times[request_id_of(_decode(payload))].append(time.perf_counter())
+                    await websocket.send(payload.decode("utf-8"))
+            except websockets.exceptions.ConnectionClosed:
+                self.logger.warning("Connection %d was closed before all requests were sent", connection_id)
+            try:
+                await receiver
+            except TimeoutError:
+                self.logger.warning("Connection %d stopped receiving responses", connection_id)
+            except websockets.exceptions.ConnectionClosed:
+                self.logger.warning("Connection %d was closed before all responses were received", connection_id)
+
+    async def __receive(
+        self, websocket: ClientConnection, connection_id: int, connection: RecordedConnection, send_times: Dict[Optional[str], Deque[float]]
+    ) -> None:
+        # Pipelined requests are answered out of order, so pair final responses by request id and only fall back to order without one
+        expected_responses: Dict[Optional[str], Deque[object]] = defaultdict(deque)
+        for payload in connection.responses:
+            response = json.loads(payload)
+            if not is_progress(response):
+                expected_responses[request_id_of(response)].append(response)
+        answered = 0
+        while answered < len(connection.requests):
+            response = json.loads(await asyncio.wait_for(websocket.recv(), RESPONSE_TIMEOUT))
+            if is_progress(response):
+                # Streamed stages precede the final response of their request, they are counted but not diffed
+                self.__progress_messages += 1
+                continue
+            request_id = request_id_of(response)
+            # Errors for requests that could not be parsed carry no id even if the request had one
+            pending = send_times[request_id] or send_times[None]
+            if pending:
+                self.__latencies.append(time.perf_counter() - pending.popleft())
+            self.__responses += 1
+            if expected_responses[request_id]:
+                label = f"request {request_id}" if request_id is not None else f"response {answered}"
+                self.__compare(f"connection {connection_id} {label}", expected_responses[request_id].popleft(), response)
+            answered += 1
+
+    def __compare(self, label: str, expected: object, actual: object) -> None:
+        differences = diff_responses(expected, actual)
+        if differences:
+            self.__mismatches += 1
+            self.__differences.extend(f"{label}: {difference}" for difference in differences)
+
+
+def _decode(payload: bytes) -> object:
+    """Decode a recorded request, which may be invalid JSON the server answered with an error."""
+    try:
+        return json.loads(payload)
+    except ValueError:
+        return None
+
+
+@click.command()
+@click.argument("recording", type=click.Path(exists=True, dir_okay=False, path_type=Path))
+@click.option("--uri", default="ws://localhost:8765", show_default=True, help="URI of the autoscore WebSocket server")
+@click.option("--speed", type=click.FloatRange(min=0.0), default=1.0, show_default=True, help="Replay speed factor, 0 replays at max speed")
+@click.option("--output", type=click.Path(dir_okay=False, path_type=Path), help="Write the replay report to a JSON file")
+def main(recording: Path, uri: str, speed: float, output: Optional[Path]) -> None:
+    """Replay a traffic recording against a server and fail if the responses differ from the recorded ones."""
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    connections = load_recording(recording)
+    logger.info("Replaying %d connections from %s at %s speed", len(connections), recording, f"{speed}x" if speed else "max")
+
+    report = asyncio.run(TrafficReplayer(uri, connections, speed).replay())
+    for difference in report.differences:
+        click.echo(f"DIFF {difference}", err=True)
+    latency = report.latency
+    click.echo(
+        f"Replayed {report.requests} requests on {report.connections} connections in {report.duration_seconds:.1f}s, "
+        f"{report.mismatches} mismatches, {report.missing_responses} missing responses"
+        + (f", latency p50 {latency.p50 * 1000:.1f} ms p95 {latency.p95 * 1000:.1f} ms p99 {latency.p99 * 1000:.1f} ms" if latency else "")
+    )
+    if output:
+        output.write_text(report.model_dump_json(indent=2) + "\n", encoding="utf-8")
+    if report.mismatches or report.missing_responses:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Batch scoring of image directories and glob patterns into a stream of JSON lines."""
+
+import glob
+import logging
+import time
+from pathlib import Path
+from typing import Iterable, List, Optional, Sequence, Set, TextIO
+
+from pydantic import BaseModel, ValidationError
+
+from detector.entrypoint.parallel_pipeline import ParallelImageScorer, ScoredImage
+from detector.model.configuration import ProcessingConfig
+
+IMAGE_SUFFIXES = (".jpg", ".jpeg", ".png", ".bmp")
+
+
+class BatchSummary(BaseModel):
+    """Counts and duration of a batch scoring run."""
+
+    scored: int
+    successful: int
+    skipped: int
+    wall_time: float
+
+
+def expand_image_paths(patterns: Iterable[str]) -> List[Path]:
+    """Expand image files, directories and glob patterns into absolute image paths, sorted and without duplicates."""
+    image_paths: Set[Path] = set()
+    for pattern in patterns:
+        path = Path(pattern)
+        if path.is_dir():
+            image_paths.update(file for file in path.rglob("*") if file.is_file() and file.suffix.lower() in IMAGE_SUFFIXES)
+        elif path.is_file():
+            image_paths.add(path)
+        else:
+            # Path.glob only takes relative patterns, glob.glob also expands absolute ones like /archive/**/*.jpg
+            matches = glob.glob(pattern, recursive=True)  # noqa: PTH207
+            image_paths.update(Path(match) for match in matches if Path(match).suffix.lower() in IMAGE_SUFFIXES)
+    return sorted(path.resolve() for path in image_paths)
+
+
+def read_scored_image_paths(output_path: Path) -> Set[Path]:
+    """Read the images already scored in a partial output file and cut off a last line that was interrupted while writing."""
+    if not output_path.exists():
+        return set()
+    content = output_path.read_bytes()
+    complete_length = content.rfind(b"\n") + 1
+    if complete_length < len(content):
+        with output_path.open("r+b") as output_file:
+            output_file.truncate(complete_length)
+
+    scored_image_paths: Set[Path] = set()
+    for line in content[:complete_length].splitlines():
+        try:
+            scored_image_paths.add(ScoredImage.model_validate_json(line).image_path)
+        except ValidationError:
+            continue
+    return scored_image_paths
+
+
+class BatchImageScorer:
+    """Scores many images with a pool of workers and streams one JSON line per image as soon as it is scored."""
+
+    logger = logging.getLogger(__qualname__)
+
+    def __init__(self, config: Optional[ProcessingConfig] = None, workers: Optional[int] = None) -> None:
+        self.__config = config or ProcessingConfig()
+        self.__workers = workers
+
+    def score(self, image_paths: Sequence[Path], output: TextIO, skip: Optional[Set[Path]] = None) -> BatchSummary:
+        """Score all images except the skipped ones and write each result to the output as a JSON line."""
+        skip = skip or set()
+        pending = [image_path for image_path in image_paths if image_path not in skip]
+        self.logger.info("Scoring %d images, skipping %d already scored", len(pending), len(image_paths) - len(pending))
+
+        scored = successful = 0
+        start_time = time.perf_counter()
+        if pending:
+            with ParallelImageScorer(self.__config, self.__workers) as scorer:
+                for scored_image in scorer.score_images(pending):
+                    output.write(scored_image.model_dump_json() + "\n")
+                    output.flush()
+                    scored += 1
+                    successful += scored_image.detection_result.success
+        return BatchSummary(
+            scored=scored, successful=successful, skipped=len(image_paths) - len(pending), wall_time=time.perf_counter() - start_time
+        )
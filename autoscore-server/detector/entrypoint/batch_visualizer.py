@@ -0,0 +1,96 @@
+"""Headless rendering of calibration visualizations for many images with one visualizer per worker process."""
+
+import logging
+import os
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+from multiprocessing import get_context
+from pathlib import Path
+from types import TracebackType
+from typing import Dict, Iterable, Iterator, Optional, Self, Type
+
+import cv2
+from pydantic import BaseModel
+
+from detector.entrypoint.calibration_visualizer import CalibrationVisualizer
+from detector.entrypoint.parallel_pipeline import DEFAULT_MAX_WORKERS, split_cpu_threads
+from detector.model.configuration import ProcessingConfig
+from detector.model.detection_result_code import ResultCode
+
+_worker_visualizer: Optional[CalibrationVisualizer] = None
+
+
+class RenderedImage(BaseModel):
+    """Output file and detection outcome of a rendered image."""
+
+    image_path: Path
+    output_path: Optional[Path] = None
+    result_code: ResultCode
+    message: Optional[str] = None
+
+
+class BatchCalibrationRenderer:
+    """Renders side-by-side calibration views of many images to files with a pool of worker processes."""
+
+    logger = logging.getLogger(__qualname__)
+
+    def __init__(self, output_dir: Path, config: Optional[ProcessingConfig] = None, workers: Optional[int] = None) -> None:
+        self.__output_dir = output_dir
+        self.__workers = workers or min(DEFAULT_MAX_WORKERS, os.cpu_count() or 1)
+        self.__executor = ProcessPoolExecutor(
+            max_workers=self.__workers,
+            mp_context=get_context("spawn"),
+            initializer=_initialize_worker,
+            initargs=(config or ProcessingConfig(), self.__workers),
+        )
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self, exc_type: Optional[Type[BaseException]], exc_value: Optional[BaseException], traceback: Optional[TracebackType]
+    ) -> None:
+        self.close()
+
+    def render_images(self, image_paths: Iterable[Path]) -> Iterator[RenderedImage]:
+        """Render all images to the output directory and yield their outcome in the order they complete."""
+        self.__output_dir.mkdir(parents=True, exist_ok=True)
+        futures: Dict[Future[RenderedImage], Path] = {
+            self.__executor.submit(_render_image, image_path, output_path(self.__output_dir, image_path)): image_path
+            for image_path in image_paths
+        }
+        self.logger.info("Rendering %d images to %s with %d workers", len(futures), self.__output_dir, self.__workers)
+        for future in as_completed(futures):
+            try:
+                yield future.result()
+            except Exception as e:
+                # A single broken frame must not stop the review of all the others
+                self.logger.exception("Rendering %s failed", futures[future])
+                yield RenderedImage(image_path=futures[future], result_code=ResultCode.UNKNOWN, message=f"Rendering failed: {e}")
+
+    def close(self) -> None:
+        """Shut down the worker processes."""
+        self.__executor.shutdown(cancel_futures=True)
+
+
+def output_path(output_dir: Path, image_path: Path) -> Path:
+    """Get the file a rendered image is written to, keeping the extension so img.jpg and img.png do not overwrite each other."""
+    return output_dir / f"{image_path.name}.png"
+
+
+def _initialize_worker(config: ProcessingConfig, workers: int) -> None:
+    global _worker_visualizer  # noqa: PLW0603
+    split_cpu_threads(workers)
+    _worker_visualizer = CalibrationVisualizer(config)
+
+
+def _render_image(image_path: Path, output_path: Path) -> RenderedImage:
+    if _worker_visualizer is None:
+        msg = "Worker visualizer is not initialized"
+        raise RuntimeError(msg)
+    try:
+        result, comparison = _worker_visualizer.render(image_path)
+    except (OSError, ValueError) as e:
+        return RenderedImage(image_path=image_path, result_code=ResultCode.INVALID_INPUT, message=f"Could not load image: {e}")
+    if not cv2.imwrite(str(output_path), comparison):
+        return RenderedImage(image_path=image_path, result_code=result.result_code, message=f"Could not write {output_path}")
+    return RenderedImage(image_path=image_path, output_path=output_path, result_code=result.result_code, message=result.message)
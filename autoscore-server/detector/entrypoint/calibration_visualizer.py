@@ -6,8 +6,9 @@ and homography matrix transformations are applied.
 """
 
 import logging
+from functools import partial
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
 import os
 os.environ["QT_QPA_PLATFORM"] = "xcb"
 import cv2
@@ -27,39 +28,72 @@ from detector.model.geometry_models import (
     VISUALIZATION_TEXT_OFFSET,
     VISUALIZATION_TEXT_RADIUS_RATIO,
 )
-from detector.model.image_models import DartImage
 from detector.service.dart_image_scoring_service import DartInImageScoringService
 from detector.service.image_preprocessor import ImagePreprocessor
 from detector.util.file_utils import load_image
 
 
+class Layer(NamedTuple):
+    """Pixels of a static overlay drawn on black and their transparency, limited to the pixels the overlay touches."""
+
+    mask: np.ndarray
+    color: np.ndarray
+    transparency: np.ndarray
+
+
+class LayerCache:
+    """Static overlays per output size, drawn once and blended onto every later image of that size."""
+
+    def __init__(self) -> None:
+        self.__layers: Dict[Tuple[object, ...], Layer] = {}
+
+    def composite(self, image: np.ndarray, key: Tuple[object, ...], draw: Callable[[np.ndarray], None]) -> np.ndarray:
+        """Blend a static layer onto the image, drawing the layer only the first time it is needed for an output size."""
+        layer = self.__layers.get(key)
+        if layer is None:
+            on_black = np.zeros(image.shape, dtype=np.uint8)
+            on_white = np.full(image.shape, 255, dtype=np.uint8)
+            draw(on_black)
+            draw(on_white)
+            # Drawing on black and white recovers the anti-aliased coverage, so blending matches drawing on the image itself
+            transparency = on_white - on_black
+            mask = np.asarray((transparency < 255).any(axis=2))  # noqa: PLR2004
+            layer = Layer(mask, on_black[mask], transparency[mask].astype(np.uint16))
+            self.__layers[key] = layer
+        background = image[layer.mask].astype(np.uint16)
+        image[layer.mask] = ((background * layer.transparency + 127) // 255 + layer.color).astype(np.uint8)
+        return image
+
+
 class CalibrationVisualizer:
     """Class for visualizing the calibration transformation results."""
 
     logger = logging.getLogger(__qualname__)
 
-    def __init__(self, config: Optional[ProcessingConfig] = None) -> None:
+    def __init__(
+        self,
+        config: Optional[ProcessingConfig] = None,
+        image_preprocessor: Optional[ImagePreprocessor] = None,
+        detection_service: Optional[DartInImageScoringService] = None,
+    ) -> None:
         self.__config = config or ProcessingConfig()
         self.window_name: str = "Calibration Visualization"
         self.dart_board: DartBoard = DartBoard()
-        self.image_preprocessor = ImagePreprocessor(self.__config)
-        self.detection_service: DartInImageScoringService = DartInImageScoringService(
+        self.image_preprocessor = image_preprocessor or ImagePreprocessor(self.__config)
+        self.detection_service: DartInImageScoringService = detection_service or DartInImageScoringService(
             self.__config, image_preprocessor=self.image_preprocessor
         )
+        self.__layer_cache = LayerCache()
 
     def visualize(self, image_path: Path) -> None:
         """Visualize the transformation result for a given image path."""
         try:
-            image = self.__load_image(image_path)
-            if image is None:
-                return
-
-            result = self.detection_service.detect_and_score(image)
+            result, comparison = self.render(image_path)
 
-            if not result or not result.success:
+            if not result.success:
                 print(f"Detection failed: {result.result_code.message}")
                 return
-            self.__show_transformation_result(image.raw_image, result)
+            self.__display_result(comparison)
             print(f"Detected darts: {len(result.scoring_result.dart_detections)}")  # type: ignore
             print(f"Total score: {result.total_score}")
 
@@ -67,7 +101,22 @@ class CalibrationVisualizer:
             self.logger.exception("Error in visualization")
             print(f"Visualization error: {e!s}")
 
-    def __show_transformation_result(self, original_image: np.ndarray, result: DetectionResult) -> None:
+    def render(self, image_path: Path) -> Tuple[DetectionResult, np.ndarray]:
+        """Detect darts in an image and render the side-by-side comparison, or the image with the failure reason without a window."""
+        image = load_image(image_path)
+        result = self.detection_service.detect_and_score(image)
+        if result.preprocessing_result is None:
+            # Detection failed before the board was located, e.g. because no board is visible
+            return result, self.__create_failure_view(image.raw_image, result)
+        # Draw on the crop the detection ran on, the detected positions refer to it
+        preprocessed = self.image_preprocessor.preprocess_images_from_preprocessing_result(image, result.preprocessing_result)
+        dart_image = preprocessed.dart_image
+        comparison = self.__create_comparison(dart_image.raw_image, result) if result.success else None
+        if comparison is None:
+            comparison = self.__create_failure_view(dart_image.raw_image, result)
+        return result, comparison
+
+    def __create_comparison(self, original_image: np.ndarray, result: DetectionResult) -> Optional[np.ndarray]:
         h_matrix = result.calibration_result.homography_matrix  # type: ignore
         calibration_coords: np.ndarray = Point2D.to_ndarray(result.calibration_result.calibration_points)  # type: ignore
         dart_coords: np.ndarray = Point2D.to_ndarray([detection.original_position for detection in result.scoring_result.dart_detections])  # type: ignore
@@ -77,7 +126,7 @@ class CalibrationVisualizer:
         transformed_image = self.__apply_transformation(original_image, h_matrix.matrix)  # type: ignore
 
         if transformed_image is None:
-            return
+            return None
 
         transformed_viz = self.__create_transformed_visualization(
             transformed_image,
@@ -87,8 +136,13 @@ class CalibrationVisualizer:
             original_image.shape,
         )
 
-        comparison = self.__create_side_by_side_view(original_viz, transformed_viz)
-        self.__display_result(comparison)
+        return self.__create_side_by_side_view(original_viz, transformed_viz)
+
+    @staticmethod
+    def __create_failure_view(original_image: np.ndarray, result: DetectionResult) -> np.ndarray:
+        viz = original_image.copy()
+        cv2.putText(viz, f"Detection failed: {result.result_code.message}", (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 0, 255), 2)
+        return viz
 
     def __create_original_visualization(
         self,
@@ -222,9 +276,11 @@ class CalibrationVisualizer:
         center = (width // 2, height // 2)
         max_radius = min(width, height) // 2
 
-        self.__draw_scoring_rings(image, center, max_radius)
-        self.__draw_segment_numbers(image, center, max_radius)
-        return image
+        def draw_board(layer: np.ndarray) -> None:
+            self.__draw_scoring_rings(layer, center, max_radius)
+            self.__draw_segment_numbers(layer, center, max_radius)
+
+        return self.__layer_cache.composite(image, ("board", height, width), draw_board)
 
     def __draw_scoring_rings(self, image: np.ndarray, center: Tuple[int, int], max_radius: int) -> None:
         scoring_radii_pixels = self.dart_board.scoring_radii * max_radius * 2
@@ -303,8 +359,10 @@ class CalibrationVisualizer:
         comparison[:, : original_resized.shape[1]] = original_resized
         comparison[:, original_resized.shape[1] + 20 :] = transformed_resized
 
-        self.__add_labels(comparison, original_resized.shape[1])
-        return comparison
+        split_point = original_resized.shape[1]
+        return self.__layer_cache.composite(
+            comparison, ("labels", *comparison.shape[:2], split_point), partial(self.__add_labels, split_point=split_point)
+        )
 
     @staticmethod
     def __resize_to_height(image: np.ndarray, target_height: int) -> np.ndarray:
@@ -328,10 +386,3 @@ class CalibrationVisualizer:
             if cv2.waitKey(100) != -1:
                 break
         cv2.destroyWindow(self.window_name)
-
-    def __load_image(self, image_path: Path) -> DartImage | None:
-        image = load_image(image_path)
-        if image is None:
-            self.logger.error("Could not load image: %s", image_path)
-            return None
-        return self.image_preprocessor.preprocess_image(image).dart_image
@@ -6,6 +6,7 @@ from typing import Optional, Union
 
 from detector.model.configuration import ProcessingConfig
 from detector.model.detection_models import DetectionResult
+from detector.model.image_models import DartImagePreprocessed
 from detector.service.dart_image_scoring_service import DartInImageScoringService
 from detector.util.file_utils import load_image
 
@@ -27,3 +28,7 @@ class DartBoardImageToScorePipeline:
         return self._detection_service.detect_and_score(
             loaded_image,
         )
+
+    def detect_darts_in_preprocessed(self, image: DartImagePreprocessed) -> DetectionResult:
+        """Detect darts in an image that was already cropped and resized, e.g. from a dataset cache."""
+        return self._detection_service.score_preprocessed(image)
@@ -0,0 +1,113 @@
+"""Dart image scorer running one pipeline per worker process."""
+
+import logging
+import os
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+from multiprocessing import get_context
+from pathlib import Path
+from types import TracebackType
+from typing import Iterable, Iterator, List, Optional, Self, Type
+
+from pydantic import BaseModel
+
+from detector.entrypoint.image_score_pipeline import DartBoardImageToScorePipeline
+from detector.model.configuration import ProcessingConfig
+from detector.model.detection_models import DetectionResult
+from detector.model.detection_result_code import ResultCode
+from detector.util.dataset_cache import DatasetCache, PreprocessedDataset
+
+DEFAULT_MAX_WORKERS = 4
+
+_worker_pipeline: Optional[DartBoardImageToScorePipeline] = None
+_worker_dataset: Optional[PreprocessedDataset] = None
+
+
+class ScoredImage(BaseModel):
+    """Detection result of a single image together with the wall time it took to score it."""
+
+    image_path: Path
+    detection_result: DetectionResult
+    latency: float
+
+
+class ParallelImageScorer:
+    """Scores images in parallel with a pool of worker processes that each load their own pipeline."""
+
+    logger = logging.getLogger(__qualname__)
+
+    def __init__(
+        self, config: Optional[ProcessingConfig] = None, workers: Optional[int] = None, dataset_cache_dir: Optional[Path] = None
+    ) -> None:
+        self.__config = config or ProcessingConfig()
+        self.__workers = workers or min(DEFAULT_MAX_WORKERS, os.cpu_count() or 1)
+        # Spawn workers so each one initializes torch and the models from scratch instead of inheriting a forked state
+        self.__executor = ProcessPoolExecutor(
+            max_workers=self.__workers,
+            mp_context=get_context("spawn"),
+            initializer=_initialize_worker,
+            initargs=(self.__config, self.__workers, dataset_cache_dir),
+        )
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self, exc_type: Optional[Type[BaseException]], exc_value: Optional[BaseException], traceback: Optional[TracebackType]
+    ) -> None:
+        self.close()
+
+    @property
+    def workers(self) -> int:
+        """Get the number of worker processes."""
+        return self.__workers
+
+    def score_images(self, image_paths: Iterable[Path]) -> Iterator[ScoredImage]:
+        """Score all images and yield their results in the order they complete."""
+        futures: List[Future[ScoredImage]] = [self.__executor.submit(_score_image, image_path) for image_path in image_paths]
+        self.logger.info("Scoring %d images with %d workers", len(futures), self.__workers)
+        for future in as_completed(futures):
+            yield future.result()
+
+    def close(self) -> None:
+        """Shut down the worker processes."""
+        self.__executor.shutdown(cancel_futures=True)
+
+
+def split_cpu_threads(workers: int) -> None:
+    """Limit torch in a worker process to its share of the CPU cores, otherwise every worker spins up one thread per core."""
+    import torch
+
+    torch.set_num_threads(max(1, (os.cpu_count() or 1) // workers))
+
+
+def _initialize_worker(config: ProcessingConfig, workers: int, dataset_cache_dir: Optional[Path]) -> None:
+    global _worker_pipeline, _worker_dataset  # noqa: PLW0603
+    split_cpu_threads(workers)
+    _worker_pipeline = DartBoardImageToScorePipeline(config)
+    if dataset_cache_dir is not None:
+        _worker_dataset = DatasetCache(dataset_cache_dir).load(config)
+
+
+def _score_image(image_path: Path) -> ScoredImage:
+    if _worker_pipeline is None:
+        msg = "Worker pipeline is not initialized"
+        raise RuntimeError(msg)
+    start_time = time.perf_counter()
+    dataset = _worker_dataset
+    try:
+        if dataset is not None and _is_cached(dataset, image_path):
+            detection_result = _worker_pipeline.detect_darts_in_preprocessed(dataset.get(image_path.name))
+        else:
+            detection_result = _worker_pipeline.detect_darts(image_path)
+    except (OSError, ValueError) as e:
+        # An unreadable image fails on its own instead of aborting all other images of the batch
+        detection_result = DetectionResult(
+            processing_time=time.perf_counter() - start_time, result_code=ResultCode.INVALID_INPUT, message=f"Could not load image: {e}"
+        )
+    return ScoredImage(image_path=image_path, detection_result=detection_result, latency=time.perf_counter() - start_time)
+
+
+def _is_cached(dataset: PreprocessedDataset, image_path: Path) -> bool:
+    """Check if the dataset holds an up to date frame of the image, hashing the file is far cheaper than decoding it."""
+    return image_path.name in dataset and dataset.source_hash(image_path.name) == DatasetCache.source_hash(image_path)
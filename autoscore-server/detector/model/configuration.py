@@ -4,7 +4,7 @@ import json
 from dataclasses import dataclass
 from enum import Enum
 from pathlib import Path
-from typing import Tuple
+from typing import Optional, Tuple
 
 from pydantic import BaseModel, Field
 
@@ -69,6 +69,10 @@ class ProcessingConfig(BaseModel):
         default=CalibrationPointDetectionMode.GEOMETRIC,
         description="Mode for calibration point detection",
     )
+    model_cache_dir: Optional[Path] = Field(
+        default=None,
+        description="Directory to cache fused YOLO models in for faster reloads, disabled if not set",
+    )
 
     @classmethod
     def from_json(cls, json_path: Path) -> "ProcessingConfig":
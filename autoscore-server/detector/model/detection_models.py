@@ -2,6 +2,7 @@
 
 import time
 from abc import ABC
+from enum import Enum
 from typing import TYPE_CHECKING, List, Optional, Sequence, TypeVar
 
 import numpy as np
@@ -9,6 +10,7 @@ from pydantic import BaseModel, ConfigDict, Field, field_serializer, field_valid
 
 from detector.model.detection_result_code import ResultCode
 from detector.model.image_models import PreprocessingResult
+from detector.model.timing_models import StageTimings
 from detector.model.yolo_dart_class_mapping import YoloDartClassMapping
 
 if TYPE_CHECKING:
@@ -200,6 +202,7 @@ class DetectionResult(AbstractResult):
     preprocessing_result: Optional[PreprocessingResult] = None
     calibration_result: Optional[CalibrationResult] = None
     scoring_result: Optional[ScoringResult] = None
+    stage_timings: Optional[StageTimings] = None
 
     @property
     def total_score(self) -> int:
@@ -217,4 +220,19 @@ class DetectionResult(AbstractResult):
         )
 
 
+class DetectionStage(Enum):
+    """Intermediate stages of the detection pipeline reported before the final result."""
+
+    BOARD_LOCATED = "board_located"
+    CALIBRATED = "calibrated"
+
+
+class DetectionProgress(BaseModel):
+    """Intermediate result of the detection pipeline after a stage completed."""
+
+    stage: DetectionStage
+    preprocessing_result: Optional[PreprocessingResult] = None
+    calibration_result: Optional[CalibrationResult] = None
+
+
 P = TypeVar("P", bound=YoloPoint)
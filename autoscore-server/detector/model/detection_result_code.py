@@ -11,6 +11,8 @@ class ResultCode(Enum):
     HOMOGRAPHY = 2
     MISSING_CALIBRATION_POINTS = 3
     INVALID_INPUT = 4
+    NO_DARTBOARD = 5
+    DEADLINE_EXCEEDED = 6
     UNKNOWN = 100
 
     @property
@@ -22,6 +24,14 @@ class ResultCode(Enum):
             2: "Homography matrix calculation failed",
             3: "Not enough calibration points detected",
             4: "Invalid input data provided",
+            5: "No dartboard found in the image",
+            6: "Deadline of the request passed before it was processed",
             100: "Unknown error",
         }
         return messages[self.value]
+
+
+# Codes of frames that were processed correctly but do not show a usable dartboard, e.g. from a blocked camera
+UNUSABLE_FRAME_CODES = frozenset({ResultCode.NO_DARTBOARD, ResultCode.MISSING_CALIBRATION_POINTS})
+# Codes after which the following frames of a session are skipped, calibration points are often just hidden by a hand or dart
+REJECTED_FRAME_CODES = frozenset({ResultCode.NO_DARTBOARD})
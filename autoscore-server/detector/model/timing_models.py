@@ -0,0 +1,43 @@
+"""Models for timing the stages of the dart detection pipeline."""
+
+from enum import Enum
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class PipelineStage(Enum):
+    """Enum of the timed stages a frame passes through, from decoding to serializing the response."""
+
+    DECODE = "decode"
+    CROP_MODEL = "crop_model"
+    RESIZE = "resize"
+    DART_MODEL = "dart_model"
+    PARSE = "parse"
+    CALIBRATION = "calibration"
+    HOMOGRAPHY = "homography"
+    TRANSFORM = "transform"
+    SCORING = "scoring"
+    ARCHIVE = "archive"
+    SERIALIZE = "serialize"
+
+
+class StageTimings(BaseModel):
+    """Durations in seconds spent in each pipeline stage, stages that did not run are None."""
+
+    decode: Optional[float] = None
+    crop_model: Optional[float] = None
+    resize: Optional[float] = None
+    dart_model: Optional[float] = None
+    parse: Optional[float] = None
+    calibration: Optional[float] = None
+    homography: Optional[float] = None
+    transform: Optional[float] = None
+    scoring: Optional[float] = None
+    archive: Optional[float] = None
+    serialize: Optional[float] = None
+
+    @property
+    def total(self) -> float:
+        """Get the summed duration of all stages that ran."""
+        return sum(duration for duration in self.model_dump().values() if duration is not None)
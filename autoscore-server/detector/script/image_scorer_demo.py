@@ -1,17 +1,17 @@
 """Demo running dart detection with an image scorer."""
 
 import logging
+import sys
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import List, Optional, Tuple
 
 import click
 from pydanclick import from_pydantic
 
+from detector.entrypoint.batch_image_scorer import BatchImageScorer, expand_image_paths, read_scored_image_paths
 from detector.entrypoint.image_score_pipeline import DartBoardImageToScorePipeline
 from detector.model.configuration import ProcessingConfig
-
-if TYPE_CHECKING:
-    from detector.model.detection_models import DetectionResult
+from detector.model.detection_models import DetectionResult
 
 logger = logging.getLogger("DartImageScorerDemo")
 
@@ -24,22 +24,62 @@ def setup_logging() -> None:  # noqa: D103
 
 
 @click.command()
-@click.argument("image_path", type=click.Path(exists=True, path_type=Path))
+@click.argument("image_paths", nargs=-1, required=True)
 @click.option("--config-path", type=click.Path(exists=True, path_type=Path), help="Path to JSON config file for dart detection")
+@click.option("--workers", type=click.IntRange(min=1), help="Worker processes for batch scoring, each loading the models once")
+@click.option(
+    "--output", type=click.Path(dir_okay=False, path_type=Path), help="Write one JSON line per image to this file instead of stdout"
+)
+@click.option("--resume", is_flag=True, help="Skip images already scored in the output file and append to it")
 @from_pydantic("config", ProcessingConfig)
-def main(image_path: Path, config_path: Path | None, config: ProcessingConfig) -> None:
-    """Run the Dart Detection demo with a single image."""
+def main(  # noqa: PLR0913
+    image_paths: Tuple[str, ...],
+    config_path: Path | None,
+    workers: Optional[int],
+    output: Optional[Path],
+    resume: bool,  # noqa: FBT001
+    config: ProcessingConfig,
+) -> None:
+    """Score a single image, or score image files, directories and glob patterns in batch as JSON lines."""
     setup_logging()
 
     if config_path:
         logger.info("Loading configuration from %s", config_path)
-        file_config = ProcessingConfig.from_json(config_path)
-        detector = DartBoardImageToScorePipeline(file_config)
+        config = ProcessingConfig.from_json(config_path)
+
+    single_image = Path(image_paths[0])
+    if len(image_paths) == 1 and single_image.is_file() and output is None and workers is None:
+        log_detection_result(DartBoardImageToScorePipeline(config).detect_darts(single_image))
+        return
+
+    score_batch(expand_image_paths(image_paths), config, workers, output, resume=resume)
+
+
+def score_batch(image_paths: List[Path], config: ProcessingConfig, workers: Optional[int], output: Optional[Path], *, resume: bool) -> None:
+    """Score all images with a worker pool and stream the results as JSON lines to the output file or stdout."""
+    if not image_paths:
+        msg = "No images found for the given paths"
+        raise click.UsageError(msg)
+    if resume and output is None:
+        msg = "--resume requires --output"
+        raise click.UsageError(msg)
+
+    scorer = BatchImageScorer(config, workers)
+    if output is None:
+        summary = scorer.score(image_paths, sys.stdout)
     else:
-        detector = DartBoardImageToScorePipeline(config)
+        skip = read_scored_image_paths(output) if resume else set()
+        output.parent.mkdir(parents=True, exist_ok=True)
+        with output.open("a" if resume else "w", encoding="utf-8") as output_file:
+            summary = scorer.score(image_paths, output_file, skip)
+
+    logger.info(
+        "Scored %d images (%d successful, %d skipped) in %.1fs", summary.scored, summary.successful, summary.skipped, summary.wall_time
+    )
 
-    result: DetectionResult = detector.detect_darts(image_path)
 
+def log_detection_result(result: DetectionResult) -> None:
+    """Log the scores of a single detection result."""
     if not result:
         logger.error("❌ No result returned from the detection service.")
         return
@@ -3,13 +3,15 @@
 import logging
 import re
 from pathlib import Path
-from typing import List
+from typing import List, Optional
 
 import click
 from pydanclick import from_pydantic
 
+from detector.entrypoint.batch_visualizer import BatchCalibrationRenderer
 from detector.entrypoint.calibration_visualizer import CalibrationVisualizer
 from detector.model.configuration import ProcessingConfig
+from detector.model.detection_result_code import ResultCode
 
 
 def __natural_sort_key(path: Path) -> tuple[int, int | str]:
@@ -19,17 +21,23 @@ def __natural_sort_key(path: Path) -> tuple[int, int | str]:
     return 1, path.name
 
 
-def list_available_images(image_folder: Path) -> None:
-    """List all available images in the specified folder."""
-    print("Available images in the folder:")
+def find_images(image_folder: Path) -> List[Path]:
+    """Find all images in the specified folder in natural order."""
     image_extensions = ["*.png", "*.jpg", "*.jpeg", "*.bmp", "*.tiff"]
     image_files: List[Path] = []
 
     for ext in image_extensions:
         image_files.extend(image_folder.glob(ext))
+    return sorted(image_files, key=__natural_sort_key)
+
+
+def list_available_images(image_folder: Path) -> None:
+    """List all available images in the specified folder."""
+    print("Available images in the folder:")
+    image_files = find_images(image_folder)
 
     if image_files:
-        for image_file in sorted(image_files, key=__natural_sort_key):
+        for image_file in image_files:
             print(f"  - {image_file.name}")
         print(f"\nTotal: {len(image_files)} image(s) found")
     else:
@@ -37,14 +45,36 @@ def list_available_images(image_folder: Path) -> None:
     print(f"Image folder path: {image_folder}")
 
 
+def render_images(image_paths: List[Path], output_dir: Path, config: Optional[ProcessingConfig], workers: Optional[int]) -> None:
+    """Render the calibration views of all images to the output directory without opening a window."""
+    failed = 0
+    with BatchCalibrationRenderer(output_dir, config, workers) as renderer:
+        for rendered_image in renderer.render_images(image_paths):
+            if rendered_image.result_code is not ResultCode.SUCCESS:
+                failed += 1
+                print(f"{rendered_image.image_path.name}: {rendered_image.result_code.message} {rendered_image.message or ''}")
+    print(f"Rendered {len(image_paths)} image(s) to {output_dir}, {failed} with failed detection")
+
+
 @click.command()
 @click.option("--list", is_flag=True, help="List all available images in the target folder and exit.")
 @click.option(
     "--config_path", type=click.Path(exists=True, path_type=Path), default=None, help="Path to JSON config file for dart detection"
 )
+@click.option(
+    "--output-dir", type=click.Path(file_okay=False, path_type=Path), help="Render the views to this directory instead of showing a window"
+)
+@click.option("--workers", type=click.IntRange(min=1), help="Worker processes for rendering to --output-dir")
 @click.argument("target", type=click.Path(exists=True, path_type=Path), default=".")
 @from_pydantic("config", ProcessingConfig)
-def main(list: bool, config_path: Path | None, target: Path, config: ProcessingConfig) -> None:  # noqa: A002, ARG001, FBT001
+def main(  # noqa: PLR0913
+    list: bool,  # noqa: A002, FBT001
+    config_path: Path | None,
+    output_dir: Optional[Path],
+    workers: Optional[int],
+    target: Path,
+    config: ProcessingConfig,  # noqa: ARG001
+) -> None:
     """
     Run the calibration visualization demo.
 
@@ -66,6 +96,11 @@ def main(list: bool, config_path: Path | None, target: Path, config: ProcessingC
         format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
     )
 
+    if output_dir:
+        image_paths = [image_path] if image_path else find_images(image_folder)
+        render_images(image_paths, output_dir, ProcessingConfig.from_json(config_path) if config_path else None, workers)
+        return
+
     print("=== Dart Board Calibration Visualization Demo ===")
     print("This demo shows how the image looks after calibration and homography transformations.")
     print()
@@ -11,6 +11,8 @@ from detector.model.configuration import ProcessingConfig
 from detector.model.detection_models import CalibrationPoint, HomoGraphyMatrix, Point2D
 from detector.model.detection_result_code import ResultCode
 from detector.model.exception import DartDetectionError
+from detector.model.timing_models import PipelineStage
+from detector.util.timing_utils import measure_stage
 
 
 class CalibrationMatrixCalculator:
@@ -28,6 +30,10 @@ class CalibrationMatrixCalculator:
         calibration_points: List[CalibrationPoint],
     ) -> HomoGraphyMatrix:
         """Calculate homography transformation matrix from calibration points."""
+        with measure_stage(PipelineStage.HOMOGRAPHY):
+            return self.__calculate_homography(calibration_points)
+
+    def __calculate_homography(self, calibration_points: List[CalibrationPoint]) -> HomoGraphyMatrix:
         self.logger.debug("Calculating homography transformation matrix")
         calibration_coords = Point2D.to_ndarray(calibration_points)
 
@@ -57,6 +63,9 @@ class CalibrationMatrixCalculator:
 
     def __ensure_minimum_points(self, valid_count: int, calibration_points: List[CalibrationPoint], valid_mask: np.ndarray) -> None:
         """Ensure we have the minimum required valid points."""
+        if valid_count == 0:
+            # Frames of a blocked or turned away camera are common, they get no per-point diagnostics
+            raise DartDetectionError(ResultCode.MISSING_CALIBRATION_POINTS, details="No valid calibration points found")
         if valid_count < self.__config.min_calibration_points:
             from detector.model.yolo_dart_class_mapping import YoloDartClassMapping
             
@@ -84,7 +93,10 @@ class CalibrationMatrixCalculator:
             found_details = "\nFound points: " + (", ".join(found_points) if found_points else "None")
             missing_details = "\nMissing points: " + (", ".join(missing_points) if missing_points else "None")
             
-            msg = f"Only {valid_count} valid calibration points found, minimum {self.__config.min_calibration_points} required{found_details}{missing_details}"
+            msg = (
+                f"Only {valid_count} valid calibration points found, "
+                f"minimum {self.__config.min_calibration_points} required{found_details}{missing_details}"
+            )
             raise DartDetectionError(ResultCode.MISSING_CALIBRATION_POINTS, details=msg)
 
     def __compute_homography_matrix(self, calibration_coords: np.ndarray, valid_mask: np.ndarray, image_shape: float) -> np.ndarray:
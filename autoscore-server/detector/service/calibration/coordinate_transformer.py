@@ -7,6 +7,8 @@ import numpy as np
 
 from detector.model.configuration import ProcessingConfig
 from detector.model.detection_models import HomoGraphyMatrix, OriginalDartPosition, TransformedDartPosition
+from detector.model.timing_models import PipelineStage
+from detector.util.timing_utils import measure_stage
 
 
 class CoordinateTransformer:
@@ -21,6 +23,12 @@ class CoordinateTransformer:
         self, homography_matrix: HomoGraphyMatrix, dart_positions: List[OriginalDartPosition]
     ) -> List[TransformedDartPosition]:
         """Transform dart coordinates to board coordinate system and map to dart_position."""
+        with measure_stage(PipelineStage.TRANSFORM):
+            return self.__transform_to_board_dimensions(homography_matrix, dart_positions)
+
+    def __transform_to_board_dimensions(
+        self, homography_matrix: HomoGraphyMatrix, dart_positions: List[OriginalDartPosition]
+    ) -> List[TransformedDartPosition]:
         self.logger.debug("Transforming %s dart coordinates to board space", len(dart_positions))
 
         transformed_positions = []
@@ -2,21 +2,26 @@
 
 import logging
 import time
-from typing import Optional
+from typing import Callable, Optional
 
 from detector.model.configuration import ProcessingConfig
 from detector.model.detection_models import (
     CalibrationResult,
+    DetectionProgress,
     DetectionResult,
+    DetectionStage,
     ScoringResult,
 )
-from detector.model.detection_result_code import ResultCode
+from detector.model.detection_result_code import UNUSABLE_FRAME_CODES, ResultCode
 from detector.model.exception import DartDetectionError
-from detector.model.image_models import DartImage, PreprocessingResult
+from detector.model.image_models import CropInformation, DartImage, DartImagePreprocessed, PreprocessingResult
+from detector.model.timing_models import PipelineStage
 from detector.service.calibration.board_calibration_service import DartBoardCalibrationService
 from detector.service.image_preprocessor import ImagePreprocessor
 from detector.service.parser.yolo_result_parser import YoloResultParser
 from detector.service.scoring.dart_scoring_service import DartScoringService
+from detector.util.deadline import Deadline
+from detector.util.timing_utils import StageTimer
 from detector.yolo.dart_detector import YoloDartImageProcessor
 
 
@@ -45,23 +50,66 @@ class DartInImageScoringService:
         )
         self.__image_preprocessor = image_preprocessor or ImagePreprocessor(self.__config)
 
-    def detect_and_score(self, image: DartImage) -> DetectionResult:
-        """Execute the complete detection and scoring pipeline."""
+    def detect_and_score(  # noqa: PLR0913
+        self,
+        image: DartImage,
+        roi: Optional[CropInformation] = None,
+        progress: Optional[Callable[[DetectionProgress], None]] = None,
+        deadline: Optional[Deadline] = None,
+        inference_size: Optional[int] = None,
+        calibration_result: Optional[CalibrationResult] = None,
+    ) -> DetectionResult:
+        """Run the detection and scoring pipeline, reusing the calibration of a frame with the same crop and honoring the deadline."""
+        with StageTimer.active() or StageTimer() as timer:
+            detection_result = self.__detect_and_score(image, roi, progress, deadline, inference_size, calibration_result)
+        detection_result.stage_timings = timer.to_stage_timings()
+        return detection_result
+
+    def score_preprocessed(self, image: DartImagePreprocessed) -> DetectionResult:
+        """Execute the detection and scoring pipeline on an image that was already cropped and resized."""
+        with StageTimer.active() or StageTimer() as timer:
+            detection_result = self.__detect_and_score(image)
+        detection_result.stage_timings = timer.to_stage_timings()
+        return detection_result
+
+    def __detect_and_score(  # noqa: PLR0913
+        self,
+        image: DartImage | DartImagePreprocessed,
+        roi: Optional[CropInformation] = None,
+        progress: Optional[Callable[[DetectionProgress], None]] = None,
+        deadline: Optional[Deadline] = None,
+        inference_size: Optional[int] = None,
+        calibration_result: Optional[CalibrationResult] = None,
+    ) -> DetectionResult:
         try:
-            start_time = time.time()
-            preprocessing_result = self.__image_preprocessor.preprocess_image(image)
-            results = self.__yolo_image_processor.detect(preprocessing_result.dart_image)
+            start_time = time.perf_counter()
+            self.__check_deadline(deadline, PipelineStage.CROP_MODEL)
+            preprocessing_result = (
+                image if isinstance(image, DartImagePreprocessed) else self.__image_preprocessor.preprocess_image(image, roi)
+            )
+            if progress is not None:
+                progress(
+                    DetectionProgress(stage=DetectionStage.BOARD_LOCATED, preprocessing_result=preprocessing_result.preprocessing_result)
+                )
+            self.__check_deadline(deadline, PipelineStage.DART_MODEL)
+            results = self.__yolo_image_processor.detect(preprocessing_result.dart_image, inference_size)
             detections = self.__yolo_result_parser.extract_detections(results)
-            calibration_result = self.__calibration_service.calibrate_board(detections.calibration_points)
+            if calibration_result is None:
+                calibration_result = self.__calibration_service.calibrate_board(detections.calibration_points)
+            if progress is not None:
+                progress(DetectionProgress(stage=DetectionStage.CALIBRATED, calibration_result=calibration_result))
+            self.__check_deadline(deadline, PipelineStage.SCORING)
             scoring_result = self.__dart_scoring_service.calculate_scores(calibration_result, detections.original_positions)
-            processing_time = round(time.time() - start_time, 3)
+            processing_time = round(time.perf_counter() - start_time, 3)
             self.logger.debug("Full detection pipeline took %s seconds", processing_time)
             return self.__create_success_result(
                 scoring_result, calibration_result, preprocessing_result.preprocessing_result, processing_time
             )
         except DartDetectionError as e:
-            if e.error_code == ResultCode.MISSING_CALIBRATION_POINTS:
+            if e.error_code in UNUSABLE_FRAME_CODES:
                 self.logger.info(e.details)
+            elif e.error_code is ResultCode.DEADLINE_EXCEEDED:
+                self.logger.debug(e.details)
             else:
                 self.logger.exception("Dart detection failed")
             return self.__create_error_result(e.error_code, e.message)
@@ -69,6 +117,11 @@ class DartInImageScoringService:
             self.logger.exception("Unknown error during detection pipeline")
             return self.__create_error_result(ResultCode.UNKNOWN, f"Unknown error occurred: {e}")
 
+    @staticmethod
+    def __check_deadline(deadline: Optional[Deadline], stage: PipelineStage) -> None:
+        if deadline is not None:
+            deadline.check(stage)
+
     @staticmethod
     def __create_success_result(
         scoring_result: ScoringResult,
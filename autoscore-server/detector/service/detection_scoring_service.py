@@ -0,0 +1,71 @@
+"""Service to calibrate and score darts from detections made by a model outside of this process."""
+
+import logging
+import time
+from typing import List, Optional
+
+from detector.model.configuration import ProcessingConfig
+from detector.model.detection_models import CalibrationResult, DetectionResult, YoloDetection
+from detector.model.detection_result_code import UNUSABLE_FRAME_CODES, ResultCode
+from detector.model.exception import DartDetectionError
+from detector.service.calibration.calibration_matrix_calculator import CalibrationMatrixCalculator
+from detector.service.parser.yolo_result_parser import YoloResultParser
+from detector.service.scoring.dart_scoring_service import DartScoringService
+from detector.util.timing_utils import StageTimer
+
+
+class DetectionScoringService:
+    """Service that calibrates the board and scores the darts of detections without loading any model."""
+
+    logger = logging.getLogger(__qualname__)
+
+    def __init__(
+        self,
+        config: Optional[ProcessingConfig] = None,
+        yolo_result_parser: Optional[YoloResultParser] = None,
+        calibration_matrix_calculator: Optional[CalibrationMatrixCalculator] = None,
+        dart_scoring_service: Optional[DartScoringService] = None,
+    ) -> None:
+        self.__config = config or ProcessingConfig()
+        self.__yolo_result_parser = yolo_result_parser or YoloResultParser(self.__config)
+        self.__calibration_matrix_calculator = calibration_matrix_calculator or CalibrationMatrixCalculator(self.__config)
+        self.__dart_scoring_service = dart_scoring_service or DartScoringService(
+            self.__config, yolo_result_parser=self.__yolo_result_parser
+        )
+
+    def score_detections(self, detections: List[YoloDetection]) -> DetectionResult:
+        """Calibrate and score detections with normalized centers, attaching the durations of each stage to the result."""
+        with StageTimer.active() or StageTimer() as timer:
+            detection_result = self.__score_detections(detections)
+        detection_result.stage_timings = timer.to_stage_timings()
+        return detection_result
+
+    def __score_detections(self, detections: List[YoloDetection]) -> DetectionResult:
+        try:
+            start_time = time.perf_counter()
+            parse_result = self.__yolo_result_parser.parse_detections(detections)
+            homography = self.__calibration_matrix_calculator.calculate_homography(parse_result.calibration_points)
+            calibration_result = CalibrationResult(
+                processing_time=round(time.perf_counter() - start_time, 6),
+                result_code=ResultCode.SUCCESS,
+                message="Calibration successful",
+                homography_matrix=homography,
+                calibration_points=parse_result.calibration_points,
+            )
+            scoring_result = self.__dart_scoring_service.calculate_scores(calibration_result, parse_result.original_positions)
+            return DetectionResult(
+                calibration_result=calibration_result,
+                scoring_result=scoring_result,
+                processing_time=round(time.perf_counter() - start_time, 6),
+                result_code=ResultCode.SUCCESS,
+                message=f"Successfully detected {len(scoring_result.dart_detections)} darts",
+            )
+        except DartDetectionError as e:
+            if e.error_code in UNUSABLE_FRAME_CODES:
+                self.logger.debug(e.details)
+            else:
+                self.logger.exception("Scoring detections failed")
+            return DetectionResult(processing_time=0.0, result_code=e.error_code, message=e.message, details=e.details)
+        except Exception as e:
+            self.logger.exception("Unknown error while scoring detections")
+            return DetectionResult(processing_time=0.0, result_code=ResultCode.UNKNOWN, message=f"Unknown error occurred: {e}")
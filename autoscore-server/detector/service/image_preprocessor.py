@@ -6,8 +6,10 @@ from typing import Optional
 from detector.model.configuration import ProcessingConfig
 from detector.model.detection_result_code import ResultCode
 from detector.model.exception import DartDetectionError
-from detector.model.image_models import DartImage, DartImagePreprocessed, PreprocessingResult
+from detector.model.image_models import CropInformation, DartImage, DartImagePreprocessed, PreprocessingResult
+from detector.model.timing_models import PipelineStage
 from detector.util.file_utils import resize_image
+from detector.util.timing_utils import measure_stage
 from detector.yolo.dartboard_cropper import YoloDartBoardImageCropper
 
 
@@ -19,20 +21,29 @@ class ImagePreprocessor:
     def __init__(self, config: Optional[ProcessingConfig] = None) -> None:
         self.__config = config or ProcessingConfig()
         if self.__config.enable_cropping_model:
-            self.__image_cropper = YoloDartBoardImageCropper()
+            self.__image_cropper = YoloDartBoardImageCropper(self.__config)
 
-    def preprocess_image(self, image: DartImage) -> DartImagePreprocessed:
-        """Preprocess the input image by resizing it and applying other transformations."""
+    def warmup(self, runs: int = 1) -> None:
+        """Warm up the cropping model, if enabled."""
+        if self.__config.enable_cropping_model:
+            self.__image_cropper.warmup(runs)
+
+    def preprocess_image(self, image: DartImage, roi: Optional[CropInformation] = None) -> DartImagePreprocessed:
+        """Preprocess the input image, skipping the cropping model if it was already cropped to a region of the original frame."""
         if image is None:
             raise DartDetectionError(ResultCode.UNKNOWN, details="Input image is None")
 
-        crop_info = None
-        if self.__config.enable_cropping_model:
-            image, crop_info = self.__image_cropper.crop_image(image)
+        crop_info = roi
+        if roi is not None:
+            self.logger.debug("Image is already cropped to %s, skipping image cropping", roi)
+        elif self.__config.enable_cropping_model:
+            with measure_stage(PipelineStage.CROP_MODEL):
+                image, crop_info = self.__image_cropper.crop_image(image)
         else:
             self.logger.info("Cropping model is disabled, skipping image cropping")
 
-        resized_image = resize_image(image, self.__config.target_image_size)
+        with measure_stage(PipelineStage.RESIZE):
+            resized_image = resize_image(image, self.__config.target_image_size)
         return DartImagePreprocessed(dart_image=resized_image, preprocessing_result=PreprocessingResult(crop_info=crop_info))
 
     def preprocess_images_from_preprocessing_result(
@@ -46,5 +57,6 @@ class ImagePreprocessor:
             self.logger.info("Using provided crop information for preprocessing")
             image = self.__image_cropper.apply_crop(image, preprocessing_result.crop_info)
 
-        resized_image = resize_image(image, self.__config.target_image_size)
+        with measure_stage(PipelineStage.RESIZE):
+            resized_image = resize_image(image, self.__config.target_image_size)
         return DartImagePreprocessed(dart_image=resized_image, preprocessing_result=preprocessing_result)
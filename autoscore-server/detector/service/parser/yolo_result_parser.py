@@ -1,14 +1,17 @@
 """A parser for YOLO detection results."""
 
 import logging
-from typing import List
-
-from ultralytics.engine.results import Results
+from typing import TYPE_CHECKING, List
 
 from detector.model.configuration import ProcessingConfig
 from detector.model.detection_models import YoloDartParseResult, YoloDetection
+from detector.model.timing_models import PipelineStage
 from detector.service.parser.calibration.calibration_point_parser_service import CalibrationPointParserService
 from detector.service.parser.dart.dart_parser_service import DartParserService
+from detector.util.timing_utils import measure_stage
+
+if TYPE_CHECKING:
+    from ultralytics.engine.results import Results
 
 
 class YoloResultParser:
@@ -21,18 +24,25 @@ class YoloResultParser:
         self.__dart_parser_service = DartParserService(config)
         self.__calibration_parser_service = CalibrationPointParserService(config)
 
-    def extract_detections(self, yolo_result: Results) -> YoloDartParseResult:
+    def extract_detections(self, yolo_result: "Results") -> YoloDartParseResult:
         """Extract calibration points and dart coordinates from YOLO results."""
         self.logger.debug("Processing YOLO detection output")
 
-        detections = self.__parse_yolo_results(yolo_result)
-        dart_positions = self.__dart_parser_service.parse(detections)
-        calibration_points = self.__calibration_parser_service.parse(detections)
+        with measure_stage(PipelineStage.PARSE):
+            detections = self.__parse_yolo_results(yolo_result)
+        return self.parse_detections(detections)
+
+    def parse_detections(self, detections: List[YoloDetection]) -> YoloDartParseResult:
+        """Extract calibration points and dart coordinates from detections, e.g. made by a model running on the client."""
+        with measure_stage(PipelineStage.PARSE):
+            dart_positions = self.__dart_parser_service.parse(detections)
+        with measure_stage(PipelineStage.CALIBRATION):
+            calibration_points = self.__calibration_parser_service.parse(detections)
         self.logger.debug("Extracted %s calibration points and %s darts", len(calibration_points), len(dart_positions))
         return YoloDartParseResult(calibration_points=calibration_points, original_positions=dart_positions)
 
     @staticmethod
-    def __parse_yolo_results(yolo_result: Results) -> List[YoloDetection]:
+    def __parse_yolo_results(yolo_result: "Results") -> List[YoloDetection]:
         """Convert YOLO results into our internal Detection format."""
         detections: List[YoloDetection] = []
 
@@ -14,6 +14,8 @@ from detector.model.geometry_models import (
     MISS_SCORE,
     SINGLE_BULL_SCORE,
 )
+from detector.model.timing_models import PipelineStage
+from detector.util.timing_utils import measure_stage
 
 
 class DartPointScoreCalculator:
@@ -30,9 +32,10 @@ class DartPointScoreCalculator:
 
         dart_score_result = []
 
-        for position in dart_positions:
-            score = self.__calculate_single_dart_score(position)  # type: ignore
-            dart_score_result.append(score)
+        with measure_stage(PipelineStage.SCORING):
+            for position in dart_positions:
+                score = self.__calculate_single_dart_score(position)  # type: ignore
+                dart_score_result.append(score)
         return dart_score_result
 
     def __calculate_single_dart_score(self, position: DartPosition) -> DartScore:
@@ -41,15 +41,20 @@ class DartScoringService:
         self.__config = config or ProcessingConfig()
         self.__coordinate_transformer = coordinate_transformer or CoordinateTransformer(self.__config)
         self.__score_calculator = score_calculator or DartPointScoreCalculator()
-        self.__yolo_image_processor = yolo_image_processor or YoloDartImageProcessor(self.__config)
+        # The models are only loaded once darts are detected in an image, scoring known dart positions needs none
+        self.__yolo_image_processor = yolo_image_processor
         self.__yolo_result_parser = yolo_result_parser or YoloResultParser(self.__config)
-        self.__image_preprocessor = image_preprocessor or ImagePreprocessor(self.__config)
+        self.__image_preprocessor = image_preprocessor
 
     def calculate_scores_from_image(self, image: DartImage, calibration_result: CalibrationResult) -> ScoringResult:
         """Calculate scores for the darts based on the image and calibration result."""
         try:
             start_time = time.time()
             self.__validate_input(image, calibration_result)
+            if self.__image_preprocessor is None:
+                self.__image_preprocessor = ImagePreprocessor(self.__config)
+            if self.__yolo_image_processor is None:
+                self.__yolo_image_processor = YoloDartImageProcessor(self.__config)
             self.__image_preprocessor.preprocess_images_from_preprocessing_result(
                 image=image,
                 preprocessing_result=calibration_result.preprocessing_result,  # type: ignore
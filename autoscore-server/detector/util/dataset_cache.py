@@ -0,0 +1,143 @@
+"""Cache of decoded and preprocessed images in a memory-mapped array file, so repeated runs skip decoding and cropping."""
+
+import hashlib
+import logging
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+from pydantic import BaseModel
+
+from detector.model.configuration import ProcessingConfig
+from detector.model.image_models import DartImage, DartImagePreprocessed, PreprocessingResult
+from detector.util.file_utils import load_image
+
+logger = logging.getLogger("DatasetCache")
+
+HASH_CHUNK_SIZE = 1024 * 1024
+# Settings the cached frames depend on, changing thresholds or the calibration mode must not invalidate the cache
+PREPROCESSING_CONFIG_FIELDS = {"target_image_size", "enable_cropping_model", "crop_padding_ratio"}
+
+
+class DatasetEntry(BaseModel):
+    """Location of a cached frame and the preprocessing applied to it."""
+
+    file_name: str
+    source_hash: str
+    row: int
+    preprocessing_result: PreprocessingResult
+
+
+class DatasetIndex(BaseModel):
+    """Index of all frames in a cached dataset."""
+
+    cache_key: str
+    frame_shape: Tuple[int, int, int]
+    entries: List[DatasetEntry]
+
+
+class PreprocessedDataset:
+    """Read-only view of cached preprocessed frames, backed by a memory-mapped array."""
+
+    def __init__(self, index: DatasetIndex, frames: np.ndarray) -> None:
+        self.__frames = frames
+        self.__entries: Dict[str, DatasetEntry] = {entry.file_name: entry for entry in index.entries}
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    def __contains__(self, file_name: str) -> bool:
+        return file_name in self.__entries
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.__entries)
+
+    def get(self, file_name: str) -> DartImagePreprocessed:
+        """Get the preprocessed frame of an image without copying it out of the memory map."""
+        entry = self.__entries[file_name]
+        return DartImagePreprocessed(
+            dart_image=DartImage(raw_image=self.__frames[entry.row]),
+            preprocessing_result=entry.preprocessing_result.model_copy(deep=True),
+        )
+
+    def source_hash(self, file_name: str) -> str:
+        """Get the content hash of the source image a frame was created from."""
+        return self.__entries[file_name].source_hash
+
+
+class DatasetCache:
+    """Writes and reads preprocessed datasets keyed by the preprocessing configuration."""
+
+    logger = logging.getLogger(__qualname__)
+
+    def __init__(self, cache_dir: Path) -> None:
+        self.__cache_dir = cache_dir
+
+    @staticmethod
+    def cache_key(config: ProcessingConfig) -> str:
+        """Identify the preprocessing configuration the frames depend on."""
+        config_json = config.model_dump_json(include=PREPROCESSING_CONFIG_FIELDS)
+        return hashlib.blake2b(config_json.encode("utf-8"), digest_size=8).hexdigest()
+
+    @staticmethod
+    def source_hash(image_path: Path) -> str:
+        """Calculate the content hash of a source image file."""
+        digest = hashlib.blake2b(digest_size=16)
+        with image_path.open("rb") as image_file:
+            while chunk := image_file.read(HASH_CHUNK_SIZE):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def build(
+        self, image_paths: Sequence[Path], config: ProcessingConfig, preprocess: Callable[[DartImage], DartImagePreprocessed]
+    ) -> PreprocessedDataset:
+        """Decode and preprocess all images once and write them to the cache."""
+        cache_key = self.cache_key(config)
+        width, height = config.target_image_size
+        frame_shape = (height, width, 3)
+        self.__cache_dir.mkdir(parents=True, exist_ok=True)
+        frames_path, index_path = self.__paths(cache_key)
+        temporary_frames_path = frames_path.with_suffix(".tmp.npy")
+
+        frames = np.lib.format.open_memmap(temporary_frames_path, mode="w+", dtype=np.uint8, shape=(len(image_paths), *frame_shape))
+        entries = []
+        for row, image_path in enumerate(image_paths):
+            preprocessed = preprocess(load_image(image_path))
+            frames[row] = preprocessed.dart_image.raw_image
+            entries.append(
+                DatasetEntry(
+                    file_name=image_path.name,
+                    source_hash=self.source_hash(image_path),
+                    row=row,
+                    preprocessing_result=preprocessed.preprocessing_result,
+                )
+            )
+        frames.flush()
+        del frames
+        temporary_frames_path.replace(frames_path)
+
+        index = DatasetIndex(cache_key=cache_key, frame_shape=frame_shape, entries=entries)
+        index_path.write_text(index.model_dump_json(indent=2), encoding="utf-8")
+        self.logger.info("Cached %d preprocessed frames in %s", len(entries), frames_path)
+        return PreprocessedDataset(index, np.load(frames_path, mmap_mode="r"))
+
+    def load(self, config: ProcessingConfig, image_dir: Optional[Path] = None) -> Optional[PreprocessedDataset]:
+        """Open the cached dataset of a configuration, dropping frames whose source image in image_dir changed or is missing."""
+        frames_path, index_path = self.__paths(self.cache_key(config))
+        if not frames_path.exists() or not index_path.exists():
+            return None
+
+        index = DatasetIndex.model_validate_json(index_path.read_text(encoding="utf-8"))
+        if image_dir is not None:
+            valid_entries = [
+                entry
+                for entry in index.entries
+                if (image_dir / entry.file_name).is_file() and self.source_hash(image_dir / entry.file_name) == entry.source_hash
+            ]
+            if len(valid_entries) < len(index.entries):
+                self.logger.warning("Ignoring %d cached frames with changed source images", len(index.entries) - len(valid_entries))
+            index = index.model_copy(update={"entries": valid_entries})
+        return PreprocessedDataset(index, np.load(frames_path, mmap_mode="r"))
+
+    def __paths(self, cache_key: str) -> Tuple[Path, Path]:
+        return self.__cache_dir / f"frames-{cache_key}.npy", self.__cache_dir / f"index-{cache_key}.json"
@@ -0,0 +1,33 @@
+"""Deadline of a frame that is checked at the boundaries of the pipeline stages."""
+
+import time
+from typing import Optional, Self
+
+from detector.model.detection_result_code import ResultCode
+from detector.model.exception import DartDetectionError
+from detector.model.timing_models import PipelineStage
+
+
+class Deadline:
+    """Monotonic point in time after which the result of a frame is no longer useful to the client."""
+
+    def __init__(self, expires_at: float) -> None:
+        self.expires_at = expires_at
+        self.expired_before: Optional[PipelineStage] = None
+
+    @classmethod
+    def after(cls, seconds: float) -> Self:
+        """Create a deadline that expires the given number of seconds from now."""
+        return cls(time.monotonic() + seconds)
+
+    def remaining(self) -> float:
+        """Seconds left until the deadline, negative once it passed."""
+        return self.expires_at - time.monotonic()
+
+    def check(self, stage: PipelineStage) -> None:
+        """Raise a DEADLINE_EXCEEDED error and remember the stage if the deadline passed before the stage started."""
+        remaining = self.remaining()
+        if remaining > 0:
+            return
+        self.expired_before = stage
+        raise DartDetectionError(ResultCode.DEADLINE_EXCEEDED, details=f"Deadline passed {-remaining:.3f}s before the {stage.value} stage")
@@ -0,0 +1,61 @@
+"""Utility functions for timing the stages of the dart detection pipeline."""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from types import TracebackType
+from typing import Dict, Iterator, List, Optional, Self, Type
+
+from detector.model.timing_models import PipelineStage, StageTimings
+
+_active_timer: ContextVar[Optional["StageTimer"]] = ContextVar("active_stage_timer", default=None)
+
+
+class StageTimer:
+    """Collects perf_counter based durations of the pipeline stages of a single frame."""
+
+    def __init__(self) -> None:
+        self.__durations: Dict[PipelineStage, float] = {}
+        self.__tokens: List[Token] = []
+
+    def __enter__(self) -> Self:
+        self.__tokens.append(_active_timer.set(self))
+        return self
+
+    def __exit__(
+        self, exc_type: Optional[Type[BaseException]], exc_value: Optional[BaseException], traceback: Optional[TracebackType]
+    ) -> None:
+        _active_timer.reset(self.__tokens.pop())
+
+    @staticmethod
+    def active() -> Optional["StageTimer"]:
+        """Get the timer activated in the current context, if any."""
+        return _active_timer.get()
+
+    @contextmanager
+    def measure(self, stage: PipelineStage) -> Iterator[None]:
+        """Measure the duration of the enclosed block and add it to the given stage."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - start)
+
+    def record(self, stage: PipelineStage, seconds: float) -> None:
+        """Add a duration in seconds to the given stage."""
+        self.__durations[stage] = self.__durations.get(stage, 0.0) + seconds
+
+    def to_stage_timings(self) -> StageTimings:
+        """Convert the collected durations to a stage timings model."""
+        return StageTimings(**{stage.value: round(duration, 6) for stage, duration in self.__durations.items()})
+
+
+@contextmanager
+def measure_stage(stage: PipelineStage) -> Iterator[None]:
+    """Measure the enclosed block with the active stage timer, does nothing if no timer is active."""
+    timer = _active_timer.get()
+    if timer is None:
+        yield
+        return
+    with timer.measure(stage):
+        yield
@@ -2,15 +2,18 @@
 
 import logging
 import time
-
-import torch
-from ultralytics import YOLO
-from ultralytics.engine.results import Results
+from typing import TYPE_CHECKING, Any, Dict, Optional
 
 from detector.model.configuration import ImmutableConfig, ProcessingConfig
 from detector.model.detection_result_code import ResultCode
 from detector.model.exception import DartDetectionError
 from detector.model.image_models import DartImage
+from detector.model.timing_models import PipelineStage
+from detector.util.timing_utils import measure_stage
+from detector.yolo.model_loader import load_yolo_model, warmup_yolo_model
+
+if TYPE_CHECKING:
+    from ultralytics.engine.results import Results
 
 
 class YoloDartImageProcessor:
@@ -20,19 +23,23 @@ class YoloDartImageProcessor:
 
     def __init__(self, config: ProcessingConfig) -> None:
         self.__config = config
-        device = "cuda" if torch.cuda.is_available() else "cpu"
-        self.logger.info("Loading YOLO model from: %s to device %s", ImmutableConfig.dart_scorer_model_path, device)
-        self._model = YOLO(ImmutableConfig.dart_scorer_model_path)
-        self._model.to(device)
-
-    def detect(self, image: DartImage) -> Results:
-        """Run YOLO inference on image."""
-        start_time = time.time()
+        self.logger.info("Loading YOLO model from: %s", ImmutableConfig.dart_scorer_model_path)
+        self._model = load_yolo_model(ImmutableConfig.dart_scorer_model_path, config.model_cache_dir)
+
+    def warmup(self, runs: int = 1) -> None:
+        """Run inference on a blank image of the target size to initialize the model."""
+        warmup_yolo_model(self._model, self.__config.target_image_size, runs)
+
+    def detect(self, image: DartImage, inference_size: Optional[int] = None) -> "Results":
+        """Run YOLO inference on image, at a smaller input size than the model was trained at if given."""
+        start_time = time.perf_counter()
+        options: Dict[str, Any] = {"imgsz": inference_size} if inference_size is not None else {}
         try:
-            results = list(self._model(image.raw_image, verbose=False))
+            with measure_stage(PipelineStage.DART_MODEL):
+                results = list(self._model(image.raw_image, verbose=False, **options))
             result = results[0]
             self.logger.debug(
-                "YOLO inference complete in %s seconds. Detected %s objects", round(time.time() - start_time, 3), len(result.boxes)
+                "YOLO inference complete in %s seconds. Detected %s objects", round(time.perf_counter() - start_time, 3), len(result.boxes)
             )
             return result  # noqa: TRY300
         except Exception as e:
@@ -2,17 +2,18 @@
 
 import logging
 import time
-from typing import Optional, Tuple
+from typing import TYPE_CHECKING, Optional, Tuple
 
 import numpy as np
-import torch
-from ultralytics import YOLO
-from ultralytics.engine.results import Results
 
 from detector.model.configuration import ImmutableConfig, ProcessingConfig
 from detector.model.detection_result_code import ResultCode
 from detector.model.exception import DartDetectionError
 from detector.model.image_models import CropInformation, DartImage
+from detector.yolo.model_loader import load_yolo_model, warmup_yolo_model
+
+if TYPE_CHECKING:
+    from ultralytics.engine.results import Results
 
 
 class YoloDartBoardImageCropper:
@@ -21,16 +22,18 @@ class YoloDartBoardImageCropper:
     logger = logging.getLogger(__qualname__)
 
     def __init__(self, config: Optional[ProcessingConfig] = None) -> None:
-        device = "cuda" if torch.cuda.is_available() else "cpu"
-        self.logger.info("Loading YOLO model from: %s to device ", ImmutableConfig.dartboard_model_path)
-        self._model = YOLO(ImmutableConfig.dartboard_model_path)
-        self._model.to(device)
         self.__config = config or ProcessingConfig()
+        self.logger.info("Loading YOLO model from: %s", ImmutableConfig.dartboard_model_path)
+        self._model = load_yolo_model(ImmutableConfig.dartboard_model_path, self.__config.model_cache_dir)
+
+    def warmup(self, runs: int = 1) -> None:
+        """Run inference on a blank image of the target size to initialize the model."""
+        warmup_yolo_model(self._model, self.__config.target_image_size, runs)
 
     def crop_image(self, dart_image: DartImage) -> Tuple[DartImage, CropInformation]:
         """Crop the image to focus on the detected dartboard."""
         image = dart_image.raw_image
-        start = time.time()
+        start = time.perf_counter()
         detection_result = self.__detect_dartboard(image)
         bounding_box = self.__extract_bounding_box(detection_result, image.shape)
         cropped_image = self.__crop_with_bounding_box(image, bounding_box)
@@ -54,13 +57,13 @@ class YoloDartBoardImageCropper:
         cropped_image = image[crop_info.y_offset : y_end, crop_info.x_offset : x_end]
         return DartImage(raw_image=cropped_image)
 
-    def __detect_dartboard(self, image: np.ndarray) -> Results:
+    def __detect_dartboard(self, image: np.ndarray) -> "Results":
         results = self._model(image, verbose=False)
         result = results[0]
         self.__validate_dartboard_detection_output(result)
         return result
 
-    def __extract_bounding_box(self, result: Results, image_shape: Tuple[int, ...]) -> Tuple[int, int, int, int]:
+    def __extract_bounding_box(self, result: "Results", image_shape: Tuple[int, ...]) -> Tuple[int, int, int, int]:
         # boxes is guaranteed to exist after validation
         assert result.boxes is not None
         xywh_normalized = result.boxes.xywhn[0]
@@ -115,7 +118,7 @@ class YoloDartBoardImageCropper:
     def __log_cropping_info(
         bounding_box: Tuple[int, int, int, int], confidence: float, cropped_shape: Tuple[int, ...], start: float
     ) -> None:
-        end = time.time()
+        end = time.perf_counter()
         x_start, y_start, x_end, y_end = bounding_box
         YoloDartBoardImageCropper.logger.debug(
             "Cropped dartboard in %s seconds from (%d,%d) with confidence %s to (%d,%d), size: %dx%d",
@@ -130,8 +133,8 @@ class YoloDartBoardImageCropper:
         )
 
     @staticmethod
-    def __validate_dartboard_detection_output(result: Results) -> None:
+    def __validate_dartboard_detection_output(result: "Results") -> None:
         if not result:
             raise DartDetectionError(ResultCode.YOLO_ERROR, details="No result from YOLO dartboard model")
         if not result.boxes:
-            raise DartDetectionError(ResultCode.YOLO_ERROR, details="No boxes detected by YOLO dartboard model")
+            raise DartDetectionError(ResultCode.NO_DARTBOARD, details="No boxes detected by YOLO dartboard model")
@@ -0,0 +1,79 @@
+"""Loads YOLO models, optionally from an on-disk cache of fused model artifacts."""
+
+import hashlib
+import logging
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional, Tuple
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from ultralytics import YOLO
+
+# torch and ultralytics take seconds and hundreds of MB to import, so they are only imported once a model is loaded
+logger = logging.getLogger("ModelLoader")
+
+FINGERPRINT_CHUNK_SIZE = 1024 * 1024
+
+
+def get_device() -> str:
+    """Get the device models are loaded to."""
+    import torch
+
+    return "cuda" if torch.cuda.is_available() else "cpu"
+
+
+def load_yolo_model(model_path: str, cache_dir: Optional[Path] = None) -> "YOLO":
+    """Load a YOLO model, reusing a cached fused copy of it when a cache directory is given."""
+    from ultralytics import YOLO
+
+    device = get_device()
+    start_time = time.perf_counter()
+    model = YOLO(model_path) if cache_dir is None else _load_fused_model(Path(model_path), Path(cache_dir))
+    model.to(device)
+    logger.info("Loaded YOLO model %s to device %s in %.2f seconds", Path(model_path).name, device, time.perf_counter() - start_time)
+    return model
+
+
+def warmup_yolo_model(model: "YOLO", image_size: Tuple[int, int], runs: int = 1) -> None:
+    """Run inference on a blank image so lazy initialization does not slow down the first real frame."""
+    width, height = image_size
+    blank_image = np.zeros((height, width, 3), dtype=np.uint8)
+    start_time = time.perf_counter()
+    for _ in range(runs):
+        model(blank_image, verbose=False)
+    logger.info("Warmed up YOLO model with %d run(s) in %.2f seconds", runs, time.perf_counter() - start_time)
+
+
+def _load_fused_model(model_path: Path, cache_dir: Path) -> "YOLO":
+    from ultralytics import YOLO
+
+    cached_path = cache_dir / f"{model_path.stem}-{_fingerprint(model_path)}.pt"
+    if cached_path.exists():
+        try:
+            return YOLO(str(cached_path))
+        except Exception:
+            logger.exception("Cached model %s is unusable, rebuilding it", cached_path)
+            cached_path.unlink(missing_ok=True)
+
+    model = YOLO(str(model_path))
+    model.fuse()
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    temporary_path = cached_path.with_suffix(".tmp")
+    model.save(temporary_path)
+    temporary_path.replace(cached_path)
+    logger.info("Cached fused model %s at %s", model_path.name, cached_path)
+    return model
+
+
+def _fingerprint(model_path: Path) -> str:
+    """Identify a model file together with the library versions that produced the fused artifact."""
+    import torch
+    import ultralytics
+
+    digest = hashlib.sha256(f"{ultralytics.__version__}-{torch.__version__}".encode())
+    with model_path.open("rb") as model_file:
+        while chunk := model_file.read(FINGERPRINT_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()[:16]
@@ -0,0 +1,30 @@
+"""Tests for the comparison of predicted and ground truth dart scores."""
+
+from benchmark.accuracy import ConfusionCounter, match_percentage, pair_scores, score_label
+from detector.model.detection_models import DartScore
+
+# Only S5 of the four predictions matches its ground truth exactly
+EXACT_MATCH_RATIO = 0.25
+
+
+def test_score_label_uses_ground_truth_notation() -> None:
+    assert score_label(DartScore(multiplier=3, single_value=20)) == "T20"
+    assert score_label(DartScore(multiplier=2, single_value=25)) == "DB"
+    assert score_label(DartScore(multiplier=1, single_value=25)) == "SB"
+    assert score_label(DartScore(multiplier=0, single_value=0)) == "MISS"
+
+
+def test_pair_scores_prefers_exact_then_segment_then_ring() -> None:
+    pairs = pair_scores(["T20", "S5", "D8", "S1"], ["S20", "S5", "D16"])
+
+    assert pairs == [("S5", "S5"), ("T20", "S20"), ("D8", "D16"), ("S1", "NONE")]
+    assert match_percentage(["T20", "S5", "D8", "S1"], ["S20", "S5", "D16"]) == EXACT_MATCH_RATIO
+
+
+def test_confusion_by_segment_and_ring() -> None:
+    confusion = ConfusionCounter()
+    confusion.add(["T20", "DB"], ["S20", "DB", "S1"])
+
+    assert confusion.scores() == {"DB": {"DB": 1}, "NONE": {"S1": 1}, "T20": {"S20": 1}}
+    assert confusion.segments() == {"20": {"20": 1}, "BULL": {"BULL": 1}, "NONE": {"1": 1}}
+    assert confusion.rings() == {"DB": {"DB": 1}, "NONE": {"S": 1}, "T": {"S": 1}}
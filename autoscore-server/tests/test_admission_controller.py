@@ -0,0 +1,67 @@
+"""Tests for admitting connections and detection requests within the capacity of the server."""
+
+import asyncio
+from http import HTTPStatus
+from typing import List
+
+import pytest
+from websockets.asyncio.client import connect
+from websockets.asyncio.server import ServerConnection, serve
+from websockets.exceptions import InvalidStatus
+
+from autoscore.model.configuration import ServerConfig
+from autoscore.websocket.admission_controller import AdmissionController
+
+MESSAGE_BYTES = 60
+
+
+@pytest.mark.asyncio
+async def test_connections_beyond_capacity_are_rejected_with_retry_hint() -> None:
+    controller = AdmissionController(ServerConfig(max_connections=1, connection_retry_after_seconds=7))
+
+    async def handler(connection: ServerConnection) -> None:
+        await connection.wait_closed()
+        controller.release_connection(connection)
+
+    async with serve(handler, "127.0.0.1", 0, process_request=controller.process_request) as server:
+        url = f"ws://127.0.0.1:{server.sockets[0].getsockname()[1]}"
+        async with connect(url):
+            with pytest.raises(InvalidStatus) as error:
+                await connect(url)
+            assert error.value.response.status_code == HTTPStatus.SERVICE_UNAVAILABLE
+            assert error.value.response.headers["Retry-After"] == "7"
+
+        # The slot is free again once the first connection is closed
+        await asyncio.sleep(0.05)
+        async with connect(url):
+            pass
+
+
+@pytest.mark.asyncio
+async def test_frames_above_session_and_address_rate_are_rejected() -> None:
+    controller = AdmissionController(ServerConfig(session_frame_rate=10, session_frame_burst=2, ip_frame_rate=10, ip_frame_burst=3))
+    retry_afters: List[float] = []
+
+    async def handler(connection: ServerConnection) -> None:
+        retry_afters.extend(controller.admit_frame(connection, "a") for _ in range(3))
+        retry_afters.extend(controller.admit_frame(connection, "b") for _ in range(2))
+        await connection.close()
+
+    async with serve(handler, "127.0.0.1", 0, process_request=controller.process_request) as server:
+        client = await connect(f"ws://127.0.0.1:{server.sockets[0].getsockname()[1]}")
+        await client.wait_closed()
+
+    # Session a is limited by its own burst, session b by the burst left for the address
+    assert retry_afters[:2] == [0.0, 0.0]
+    assert retry_afters[2] == pytest.approx(0.1, abs=0.01)
+    assert retry_afters[3] == 0.0
+    assert retry_afters[4] == pytest.approx(0.1, abs=0.01)
+
+
+def test_inflight_bytes_are_bounded() -> None:
+    controller = AdmissionController(ServerConfig(max_inflight_bytes=100))
+    assert controller.reserve_bytes(MESSAGE_BYTES)
+    assert not controller.reserve_bytes(MESSAGE_BYTES)
+    controller.release_bytes(MESSAGE_BYTES)
+    assert controller.reserve_bytes(MESSAGE_BYTES)
+    assert controller.inflight_bytes == MESSAGE_BYTES
@@ -0,0 +1,29 @@
+"""Tests for expanding the inputs of batch scoring and resuming from a partial output file."""
+
+from pathlib import Path
+
+from detector.entrypoint.batch_image_scorer import expand_image_paths, read_scored_image_paths
+from detector.entrypoint.parallel_pipeline import ScoredImage
+from detector.model.detection_models import DetectionResult
+from detector.model.detection_result_code import ResultCode
+
+
+def test_expand_directories_files_and_glob_patterns(tmp_path: Path) -> None:
+    (tmp_path / "archive" / "2024").mkdir(parents=True)
+    for file_name in ("archive/a.jpg", "archive/2024/b.PNG", "archive/notes.txt", "c.jpg"):
+        (tmp_path / file_name).touch()
+
+    image_paths = expand_image_paths([str(tmp_path / "archive"), str(tmp_path / "*.jpg"), str(tmp_path / "c.jpg")])
+
+    assert image_paths == sorted([tmp_path / "archive" / "a.jpg", tmp_path / "archive" / "2024" / "b.PNG", tmp_path / "c.jpg"])
+
+
+def test_resume_skips_complete_lines_and_drops_interrupted_line(tmp_path: Path) -> None:
+    output_path = tmp_path / "scores.jsonl"
+    scored_image = ScoredImage(
+        image_path=tmp_path / "a.jpg", detection_result=DetectionResult(processing_time=0.1, result_code=ResultCode.SUCCESS), latency=0.1
+    )
+    output_path.write_text(scored_image.model_dump_json() + "\n" + '{"image_path": "b.j', encoding="utf-8")
+
+    assert read_scored_image_paths(output_path) == {tmp_path / "a.jpg"}
+    assert output_path.read_text(encoding="utf-8") == scored_image.model_dump_json() + "\n"
@@ -0,0 +1,49 @@
+"""Tests for the benchmark statistics and baseline comparison."""
+
+import pytest
+
+from benchmark.baseline import RSS_NOISE_BYTES, BenchmarkReport, find_regressions
+from benchmark.statistics import LatencyStatistics
+
+BASELINE_PEAK_RSS_BYTES = 1024 * 1024
+SAMPLES = 100
+WALL_TIME = 2.0
+
+
+def test_latency_statistics_percentiles() -> None:
+    statistics = LatencyStatistics.from_durations([i / SAMPLES for i in range(1, SAMPLES + 1)], wall_time=WALL_TIME)
+
+    assert statistics.samples == SAMPLES
+    assert statistics.p50_seconds == pytest.approx(0.505)
+    assert statistics.p99_seconds == pytest.approx(0.9901)
+    assert statistics.throughput_per_second == SAMPLES / WALL_TIME
+
+
+def test_find_regressions_respects_tolerance() -> None:
+    baseline = BenchmarkReport(benchmarks={"pipeline": LatencyStatistics.from_durations([0.1] * 10, wall_time=1.0)})
+    within_tolerance = BenchmarkReport(benchmarks={"pipeline": LatencyStatistics.from_durations([0.11] * 10, wall_time=1.1)})
+    regressed = BenchmarkReport(
+        benchmarks={
+            "pipeline": LatencyStatistics.from_durations([0.15] * 10, wall_time=1.5),
+            "websocket": LatencyStatistics.from_durations([1.0] * 10, wall_time=10.0),
+        }
+    )
+
+    assert find_regressions(within_tolerance, baseline, tolerance=0.2) == []
+    regressions = find_regressions(regressed, baseline, tolerance=0.2)
+    assert any(regression.startswith("pipeline: p50_seconds") for regression in regressions)
+    assert any("throughput" in regression for regression in regressions)
+    assert "websocket: no baseline entry, run with --update-baseline to record it" in regressions
+
+
+def test_find_regressions_checks_peak_rss() -> None:
+    statistics = LatencyStatistics.from_durations([0.1] * 10, wall_time=1.0)
+    grown_peak_rss_bytes = BASELINE_PEAK_RSS_BYTES + 2 * RSS_NOISE_BYTES
+    baseline = BenchmarkReport(benchmarks={"pipeline": statistics.model_copy(update={"peak_rss_bytes": BASELINE_PEAK_RSS_BYTES})})
+    noisy = BenchmarkReport(benchmarks={"pipeline": statistics.model_copy(update={"peak_rss_bytes": BASELINE_PEAK_RSS_BYTES * 2})})
+    grown = BenchmarkReport(benchmarks={"pipeline": statistics.model_copy(update={"peak_rss_bytes": grown_peak_rss_bytes})})
+
+    assert find_regressions(noisy, baseline, tolerance=0.2) == []
+    assert find_regressions(grown, baseline, tolerance=0.2) == [
+        f"pipeline: peak RSS grew from {BASELINE_PEAK_RSS_BYTES} to {grown_peak_rss_bytes} bytes"
+    ]
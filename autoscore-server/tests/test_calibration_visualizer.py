@@ -0,0 +1,81 @@
+"""Tests for rendering calibration views headless, one frame at a time and in batches."""
+
+from pathlib import Path
+from typing import TYPE_CHECKING, cast
+
+import cv2
+import numpy as np
+import pytest
+
+from detector.entrypoint import batch_visualizer
+from detector.entrypoint.batch_visualizer import output_path
+from detector.entrypoint.calibration_visualizer import CalibrationVisualizer, LayerCache
+from detector.model.configuration import ProcessingConfig
+from detector.model.detection_models import DetectionResult
+from detector.model.detection_result_code import ResultCode
+from detector.model.image_models import DartImage, PreprocessingResult
+from detector.service.image_preprocessor import ImagePreprocessor
+
+if TYPE_CHECKING:
+    from detector.service.dart_image_scoring_service import DartInImageScoringService
+
+FRAME_SIZE = 64
+# The visualizer draws its overlays without anti-aliasing, blending them only rounds once per channel
+MAX_BLENDING_ERROR = 1
+
+
+class FakeDetectionService:
+    """Detection service answering by file content, a black frame shows no board."""
+
+    def detect_and_score(self, image: DartImage) -> DetectionResult:
+        """Detect nothing, or find the board but too few calibration points."""
+        if not image.raw_image.any():
+            return DetectionResult(processing_time=0.0, result_code=ResultCode.NO_DARTBOARD, message="No board")
+        return DetectionResult(
+            processing_time=0.0,
+            result_code=ResultCode.MISSING_CALIBRATION_POINTS,
+            message="Too few points",
+            preprocessing_result=PreprocessingResult(),
+        )
+
+
+def create_visualizer() -> CalibrationVisualizer:
+    config = ProcessingConfig(target_image_size=(FRAME_SIZE, FRAME_SIZE), enable_cropping_model=False)
+    return CalibrationVisualizer(config, ImagePreprocessor(config), cast("DartInImageScoringService", FakeDetectionService()))
+
+
+def draw_overlay(image: np.ndarray) -> None:
+    # Same primitives as the scoring rings and segment numbers of the visualizer
+    cv2.circle(image, (32, 32), 20, (0, 200, 255), 2)
+    cv2.putText(image, "20", (20, 20), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 2)
+
+
+def test_composited_layer_matches_drawing_on_the_image() -> None:
+    rng = np.random.default_rng(7)
+    layer_cache = LayerCache()
+    for _ in range(2):
+        image = rng.integers(0, 255, size=(FRAME_SIZE, FRAME_SIZE, 3), dtype=np.uint8)
+        redrawn = image.copy()
+        draw_overlay(redrawn)
+
+        composited = layer_cache.composite(image.copy(), ("overlay", FRAME_SIZE), draw_overlay)
+
+        assert np.abs(composited.astype(np.int16) - redrawn.astype(np.int16)).max() <= MAX_BLENDING_ERROR
+
+
+def test_batch_renders_frames_without_a_board(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(batch_visualizer, "_worker_visualizer", create_visualizer())
+    image_paths = [tmp_path / "empty.png", tmp_path / "board.jpg", tmp_path / "board.png"]
+    for image_path, value in zip(image_paths, (0, 100, 200), strict=True):
+        cv2.imwrite(str(image_path), np.full((FRAME_SIZE * 2, FRAME_SIZE * 2, 3), value, dtype=np.uint8))
+
+    rendered_images = [batch_visualizer._render_image(image_path, output_path(tmp_path, image_path)) for image_path in image_paths]  # noqa: SLF001
+
+    assert [rendered_image.result_code for rendered_image in rendered_images] == [
+        ResultCode.NO_DARTBOARD,
+        ResultCode.MISSING_CALIBRATION_POINTS,
+        ResultCode.MISSING_CALIBRATION_POINTS,
+    ]
+    output_paths = {rendered_image.output_path for rendered_image in rendered_images}
+    assert len(output_paths) == len(image_paths)
+    assert all(path is not None and path.is_file() for path in output_paths)
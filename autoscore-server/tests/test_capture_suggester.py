@@ -0,0 +1,41 @@
+"""Tests for the capture region and resolution suggested to clients."""
+
+from autoscore.service.capture_suggester import CaptureSuggester
+from detector.model.detection_models import CalibrationResult, DetectionResult, ScoringResult
+from detector.model.detection_result_code import ResultCode
+from detector.model.image_models import CropInformation, PreprocessingResult
+
+
+def create_result(crop_info: CropInformation | None, result_code: ResultCode = ResultCode.SUCCESS) -> DetectionResult:
+    return DetectionResult(
+        processing_time=0.1,
+        result_code=result_code,
+        calibration_result=CalibrationResult(processing_time=0.1, result_code=result_code),
+        scoring_result=ScoringResult(processing_time=0.1, result_code=result_code),
+        preprocessing_result=PreprocessingResult(crop_info=crop_info),
+    )
+
+
+def test_suggests_board_crop_at_model_input_size() -> None:
+    roi = CropInformation(x_offset=420, y_offset=60, width=1100, height=960)
+
+    suggestion = CaptureSuggester((800, 800)).suggest(create_result(roi))
+
+    assert suggestion is not None
+    assert suggestion.roi == roi
+    assert suggestion.resolution == (800, 800)
+
+
+def test_small_crop_is_not_upscaled() -> None:
+    suggestion = CaptureSuggester((800, 800)).suggest(create_result(CropInformation(x_offset=0, y_offset=0, width=640, height=900)))
+
+    assert suggestion is not None
+    assert suggestion.resolution == (640, 800)
+
+
+def test_no_suggestion_without_board_crop_or_after_failure() -> None:
+    suggester = CaptureSuggester((800, 800))
+
+    assert suggester.suggest(create_result(None)) is None
+    crop_info = CropInformation(x_offset=0, y_offset=0, width=10, height=10)
+    assert suggester.suggest(create_result(crop_info, ResultCode.MISSING_CALIBRATION_POINTS)) is None
@@ -0,0 +1,54 @@
+"""Tests for the memory-mapped dataset cache."""
+
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from detector.model.configuration import ProcessingConfig
+from detector.model.image_models import CropInformation, DartImage, DartImagePreprocessed, PreprocessingResult
+from detector.util.dataset_cache import DatasetCache
+from detector.util.file_utils import resize_image
+
+BRIGHTNESS_STEP = 100
+
+
+def crop_and_resize(image: DartImage) -> DartImagePreprocessed:
+    crop_info = CropInformation(x_offset=1, y_offset=2, width=30, height=30)
+    return DartImagePreprocessed(dart_image=resize_image(image, (16, 16)), preprocessing_result=PreprocessingResult(crop_info=crop_info))
+
+
+def test_build_and_load_memory_mapped_frames(tmp_path: Path) -> None:
+    image_dir = tmp_path / "images"
+    image_dir.mkdir()
+    for index in range(2):
+        cv2.imwrite(str(image_dir / f"{index}.png"), np.full((40, 40, 3), index * BRIGHTNESS_STEP, dtype=np.uint8))
+    config = ProcessingConfig(target_image_size=(16, 16), enable_cropping_model=False)
+    cache = DatasetCache(tmp_path / "cache")
+
+    cache.build(sorted(image_dir.iterdir()), config, crop_and_resize)
+    dataset = cache.load(config, image_dir)
+
+    assert dataset is not None
+    assert list(dataset) == ["0.png", "1.png"]
+    frame = dataset.get("1.png")
+    assert isinstance(frame.dart_image.raw_image, np.memmap)
+    assert frame.dart_image.raw_image.shape == (16, 16, 3)
+    assert int(frame.dart_image.raw_image[0, 0, 0]) == BRIGHTNESS_STEP
+    assert frame.preprocessing_result.crop_info == CropInformation(x_offset=1, y_offset=2, width=30, height=30)
+    assert cache.load(config.model_copy(update={"target_image_size": (32, 32)})) is None
+    assert cache.load(config.model_copy(update={"dart_confidence_threshold": 0.9})) is not None
+
+
+def test_load_skips_changed_source_images(tmp_path: Path) -> None:
+    image_path = tmp_path / "board.png"
+    cv2.imwrite(str(image_path), np.zeros((20, 20, 3), dtype=np.uint8))
+    config = ProcessingConfig(target_image_size=(16, 16), enable_cropping_model=False)
+    cache = DatasetCache(tmp_path / "cache")
+    cache.build([image_path], config, crop_and_resize)
+
+    cv2.imwrite(str(image_path), np.ones((20, 20, 3), dtype=np.uint8))
+    dataset = cache.load(config, tmp_path)
+
+    assert dataset is not None
+    assert "board.png" not in dataset
@@ -0,0 +1,50 @@
+"""Tests for dropping frames whose deadline passed at the pipeline stage boundaries."""
+
+import time
+from typing import TYPE_CHECKING, cast
+
+import numpy as np
+import pytest
+
+from detector.model.detection_result_code import ResultCode
+from detector.model.exception import DartDetectionError
+from detector.model.image_models import DartImage
+from detector.model.timing_models import PipelineStage
+from detector.service.dart_image_scoring_service import DartInImageScoringService
+from detector.util.deadline import Deadline
+
+if TYPE_CHECKING:
+    from detector.service.calibration.board_calibration_service import DartBoardCalibrationService
+    from detector.service.image_preprocessor import ImagePreprocessor
+    from detector.service.parser.yolo_result_parser import YoloResultParser
+    from detector.service.scoring.dart_scoring_service import DartScoringService
+    from detector.yolo.dart_detector import YoloDartImageProcessor
+
+
+def test_deadline_raises_and_remembers_stage_once_passed() -> None:
+    deadline = Deadline.after(0.02)
+    deadline.check(PipelineStage.CROP_MODEL)
+    assert deadline.expired_before is None
+
+    time.sleep(0.03)
+    with pytest.raises(DartDetectionError) as error:
+        deadline.check(PipelineStage.DART_MODEL)
+    assert error.value.error_code is ResultCode.DEADLINE_EXCEEDED
+    assert deadline.expired_before is PipelineStage.DART_MODEL
+
+
+def test_expired_frame_is_dropped_before_any_model_runs() -> None:
+    # None of the pipeline components may be used once the deadline passed
+    service = DartInImageScoringService(
+        yolo_image_processor=cast("YoloDartImageProcessor", object()),
+        yolo_result_parser=cast("YoloResultParser", object()),
+        calibration_service=cast("DartBoardCalibrationService", object()),
+        dart_scoring_service=cast("DartScoringService", object()),
+        image_preprocessor=cast("ImagePreprocessor", object()),
+    )
+    deadline = Deadline.after(-0.1)
+
+    result = service.detect_and_score(DartImage(raw_image=np.zeros((8, 8, 3), dtype=np.uint8)), deadline=deadline)
+
+    assert result.result_code is ResultCode.DEADLINE_EXCEEDED
+    assert deadline.expired_before is PipelineStage.CROP_MODEL
@@ -0,0 +1,139 @@
+"""Tests for streaming the intermediate stages of a pipeline detection before its final response."""
+
+import asyncio
+import base64
+import json
+from pathlib import Path
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, Dict, Iterator, List, cast
+
+import cv2
+import numpy as np
+import pytest
+
+from autoscore.handler.pipeline_detection_handler import PipelineDetectionHandler
+from autoscore.model.request import PipelineDetectionRequest, RequestType
+from autoscore.service.inference_executor import InferenceExecutor
+from autoscore.service.request_scheduler import RequestScheduler
+from detector.model.detection_models import CalibrationResult, DetectionStage, ScoringResult
+from detector.model.detection_result_code import ResultCode
+from detector.model.exception import DartDetectionError
+from detector.model.image_models import DartImage, DartImagePreprocessed, PreprocessingResult
+from detector.service.dart_image_scoring_service import DartInImageScoringService
+
+if TYPE_CHECKING:
+    from websockets.asyncio.server import ServerConnection
+
+    from detector.service.calibration.board_calibration_service import DartBoardCalibrationService
+    from detector.service.image_preprocessor import ImagePreprocessor
+    from detector.service.parser.yolo_result_parser import YoloResultParser
+    from detector.service.scoring.dart_scoring_service import DartScoringService
+    from detector.yolo.dart_detector import YoloDartImageProcessor
+
+FRAME_SIZE = 32
+NO_BOARD = 0
+TOO_FEW_CALIBRATION_POINTS = 100
+CALIBRATED = 200
+# Long enough that an unawaited progress send would arrive after the final response
+PROGRESS_SEND_DELAY = 0.05
+
+
+class FakeModels:
+    """Stands in for every stage of the pipeline, deciding the outcome by the brightness of the frame."""
+
+    def preprocess_image(self, image: DartImage, _roi: object = None) -> DartImagePreprocessed:
+        """Locate the board unless the frame is black."""
+        if int(image.raw_image.max()) == NO_BOARD:
+            raise DartDetectionError(ResultCode.NO_DARTBOARD)
+        return DartImagePreprocessed(dart_image=image, preprocessing_result=PreprocessingResult())
+
+    def detect(self, image: DartImage, _inference_size: object = None) -> int:
+        """Pass the brightness on as the model result."""
+        return int(image.raw_image.max())
+
+    def extract_detections(self, brightness: int) -> SimpleNamespace:
+        """Find calibration points only on bright frames."""
+        return SimpleNamespace(calibration_points=[] if brightness < CALIBRATED else [brightness], original_positions=[])
+
+    def calibrate_board(self, calibration_points: List[int]) -> CalibrationResult:
+        """Calibrate the board if any calibration point was found."""
+        if not calibration_points:
+            raise DartDetectionError(ResultCode.MISSING_CALIBRATION_POINTS)
+        return CalibrationResult(processing_time=0.0, result_code=ResultCode.SUCCESS)
+
+    def calculate_scores(self, _calibration_result: CalibrationResult, _positions: object) -> ScoringResult:
+        """Score no darts."""
+        return ScoringResult(processing_time=0.0, result_code=ResultCode.SUCCESS)
+
+
+class FakeWebSocket:
+    """Connection that records every sent message, delivering progress messages slowly."""
+
+    def __init__(self) -> None:
+        self.sent: List[Dict[str, object]] = []
+
+    async def send(self, message: str) -> None:
+        """Record a sent message."""
+        response = json.loads(message)
+        if "progress" in response:
+            await asyncio.sleep(PROGRESS_SEND_DELAY)
+        self.sent.append(response)
+
+
+@pytest.fixture
+def handler(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Iterator[PipelineDetectionHandler]:
+    # Received frames are archived to the working directory
+    monkeypatch.chdir(tmp_path)
+    models = FakeModels()
+    service = DartInImageScoringService(
+        yolo_image_processor=cast("YoloDartImageProcessor", models),
+        yolo_result_parser=cast("YoloResultParser", models),
+        calibration_service=cast("DartBoardCalibrationService", models),
+        dart_scoring_service=cast("DartScoringService", models),
+        image_preprocessor=cast("ImagePreprocessor", models),
+    )
+    executor = InferenceExecutor([service])
+    try:
+        yield PipelineDetectionHandler(RequestScheduler(executor))
+    finally:
+        executor.close()
+
+
+def create_request(brightness: int, *, stream: bool) -> PipelineDetectionRequest:
+    _, encoded = cv2.imencode(".png", np.full((FRAME_SIZE, FRAME_SIZE, 3), brightness, dtype=np.uint8))
+    return PipelineDetectionRequest(
+        request_type=RequestType.FULL,
+        session_id="board",
+        request_id="frame-1",
+        image=base64.b64encode(encoded.tobytes()).decode("utf-8"),
+        stream=stream,
+    )
+
+
+@pytest.mark.parametrize(
+    ("brightness", "stages", "result_code"),
+    [
+        (CALIBRATED, [DetectionStage.BOARD_LOCATED, DetectionStage.CALIBRATED], ResultCode.SUCCESS),
+        (TOO_FEW_CALIBRATION_POINTS, [DetectionStage.BOARD_LOCATED], ResultCode.MISSING_CALIBRATION_POINTS),
+        (NO_BOARD, [], ResultCode.NO_DARTBOARD),
+    ],
+)
+async def test_progress_of_completed_stages_precedes_the_final_response(
+    handler: PipelineDetectionHandler, brightness: int, stages: List[DetectionStage], result_code: ResultCode
+) -> None:
+    websocket = FakeWebSocket()
+
+    await handler.handle(cast("ServerConnection", websocket), create_request(brightness, stream=True))
+
+    *progress, final = websocket.sent
+    assert [response["progress"]["stage"] for response in progress] == [stage.value for stage in stages]
+    assert all(response["request_id"] == "frame-1" for response in websocket.sent)
+    assert final["detection_result"]["result_code"] == result_code.value
+
+
+async def test_no_progress_without_streaming(handler: PipelineDetectionHandler) -> None:
+    websocket = FakeWebSocket()
+
+    await handler.handle(cast("ServerConnection", websocket), create_request(CALIBRATED, stream=False))
+
+    assert [("progress" in response, "detection_result" in response) for response in websocket.sent] == [(False, True)]
@@ -0,0 +1,39 @@
+"""Tests for scoring detections made by a model running on the client."""
+
+from typing import List
+
+from detector.geometry.board import DartBoard
+from detector.model.detection_models import YoloDetection
+from detector.model.detection_result_code import ResultCode
+from detector.model.geometry_models import DART_CLASS_ID
+from detector.service.detection_scoring_service import DetectionScoringService
+
+CALIBRATION_CLASS_IDS = (0, 1, 2, 3, 5, 6)
+BULLSEYE_SCORE = 50
+
+
+def calibration_detections() -> List[YoloDetection]:
+    reference_coordinates = DartBoard().get_calibration_reference_coordinates()
+    return [
+        YoloDetection(class_id=class_id, confidence=0.9, center_x=float(x), center_y=float(y))
+        for class_id, (x, y) in zip(CALIBRATION_CLASS_IDS, reference_coordinates, strict=True)
+    ]
+
+
+def test_dart_in_board_center_scores_bullseye() -> None:
+    dart = YoloDetection(class_id=DART_CLASS_ID, confidence=0.8, center_x=0.5, center_y=0.5)
+
+    result = DetectionScoringService().score_detections([*calibration_detections(), dart])
+
+    assert result.success
+    assert result.total_score == BULLSEYE_SCORE
+    assert result.stage_timings is not None
+    assert result.stage_timings.homography is not None
+    assert result.stage_timings.dart_model is None
+
+
+def test_too_few_calibration_points_are_rejected() -> None:
+    result = DetectionScoringService().score_detections(calibration_detections()[:2])
+
+    assert result.result_code is ResultCode.MISSING_CALIBRATION_POINTS
+    assert not result.success
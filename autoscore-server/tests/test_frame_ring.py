@@ -0,0 +1,28 @@
+"""Tests for the shared memory frame ring of the local frame transport."""
+
+import numpy as np
+import pytest
+
+from autoscore.transport.frame_ring import FrameRing
+
+
+def test_attached_ring_reads_frames_of_producer_without_copying() -> None:
+    producer_ring = FrameRing.create(slot_count=2, max_width=8, max_height=4)
+    server_ring = FrameRing.attach(producer_ring.descriptor)
+    try:
+        frame = np.random.default_rng(1).integers(0, 255, (4, 6, 3), dtype=np.uint8)
+        producer_ring.write(1, frame)
+
+        view = server_ring.frame(1, 4, 6)
+        np.testing.assert_array_equal(view, frame)
+        producer_ring.frame(1, 4, 6)[0, 0] = (1, 2, 3)
+        assert tuple(view[0, 0]) == (1, 2, 3)
+        del view
+
+        with pytest.raises(ValueError, match="does not fit"):
+            server_ring.frame(0, 8, 8)
+        with pytest.raises(ValueError, match="outside of the ring"):
+            server_ring.frame(2, 4, 6)
+    finally:
+        server_ring.close()
+        producer_ring.close()
@@ -0,0 +1,10 @@
+"""Tests that the scoring layer and the server can be imported without torch."""
+
+import pytest
+
+from benchmark.import_benchmark import DEFERRED_MODEL_MODULES, LIGHTWEIGHT_MODULES, measure_import
+
+
+@pytest.mark.parametrize("module", [*LIGHTWEIGHT_MODULES, *DEFERRED_MODEL_MODULES])
+def test_import_does_not_load_torch(module: str) -> None:
+    assert measure_import(module).heavy_modules == []
@@ -0,0 +1,35 @@
+"""Tests for running detections on worker threads with one detection service per thread."""
+
+import asyncio
+import threading
+from typing import List, cast
+
+import pytest
+
+from autoscore.service.inference_executor import InferenceExecutor
+from detector.service.dart_image_scoring_service import DartInImageScoringService
+
+BARRIER_TIMEOUT = 5.0
+
+
+@pytest.mark.asyncio
+async def test_concurrent_runs_use_distinct_services_off_the_event_loop() -> None:
+    services = [cast("DartInImageScoringService", object()) for _ in range(2)]
+    executor = InferenceExecutor(services)
+    loop_thread = threading.get_ident()
+    used: List[object] = []
+    # Both runs have to be inside a detection at the same time to pass the barrier, it breaks if they ran one after the other
+    both_running = threading.Barrier(len(services), timeout=BARRIER_TIMEOUT)
+
+    def detect(service: DartInImageScoringService) -> int:
+        assert threading.get_ident() != loop_thread
+        used.append(service)
+        both_running.wait()
+        return len(used)
+
+    try:
+        await asyncio.gather(executor.run(detect), executor.run(detect))
+    finally:
+        executor.close()
+
+    assert sorted(map(id, used)) == sorted(map(id, services))
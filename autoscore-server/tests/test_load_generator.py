@@ -0,0 +1,56 @@
+"""Tests for the WebSocket load generator against a stub server."""
+
+import asyncio
+import json
+from typing import AsyncGenerator
+
+import pytest
+import websockets
+from websockets.asyncio.server import ServerConnection
+
+from benchmark.load_generator import LoadMode, run_load
+
+LOAD_PORT = 18767
+RESPONSE_DELAY = 0.05
+
+
+async def respond_with_detection(websocket: ServerConnection) -> None:
+    async for message in websocket:
+        request = json.loads(message)
+        await asyncio.sleep(RESPONSE_DELAY)
+        response = {
+            "request_type": "FULL",
+            "session_id": request["session_id"],
+            "status": 0,
+            "cached": False,
+            "detection_result": {"result_code": 3, "processing_time": 0.0, "stage_timings": {"dart_model": 0.02, "scoring": None}},
+        }
+        await websocket.send(json.dumps(response))
+
+
+@pytest.fixture
+async def stub_server() -> AsyncGenerator[str, None]:
+    async with websockets.serve(respond_with_detection, "127.0.0.1", LOAD_PORT):
+        yield f"ws://127.0.0.1:{LOAD_PORT}"
+
+
+@pytest.mark.asyncio
+async def test_closed_loop_skips_frames_while_waiting(stub_server: str) -> None:
+    report = await run_load(stub_server, ["aW1hZ2U="], boards=2, fps=40.0, duration=0.5, mode=LoadMode.CLOSED)
+
+    assert report.completed == report.sent > 0
+    assert report.errors == 0
+    assert report.skipped > 0
+    assert report.result_codes == {"MISSING_CALIBRATION_POINTS": report.completed}
+    assert report.latency is not None
+    assert report.latency.p50 >= RESPONSE_DELAY
+    assert set(report.stage_timings) == {"dart_model"}
+
+
+@pytest.mark.asyncio
+async def test_open_loop_caps_frames_in_flight(stub_server: str) -> None:
+    report = await run_load(stub_server, ["aW1hZ2U="], boards=1, fps=100.0, duration=0.5, mode=LoadMode.OPEN, max_in_flight=2)
+
+    assert report.completed == report.sent
+    assert report.scheduled == report.sent + report.skipped
+    assert report.skip_rate > 0
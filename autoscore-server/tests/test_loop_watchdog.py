@@ -0,0 +1,32 @@
+"""Tests for the event loop lag watchdog."""
+
+import asyncio
+import logging
+import time
+
+import pytest
+
+from autoscore.metrics.server_metrics import ServerMetrics
+from autoscore.websocket.loop_watchdog import LoopWatchdog
+
+
+def block_event_loop(seconds: float) -> None:
+    time.sleep(seconds)
+
+
+@pytest.mark.asyncio
+async def test_blocking_call_is_counted_and_logged_with_stack(caplog: pytest.LogCaptureFixture) -> None:
+    metrics = ServerMetrics()
+    watchdog = LoopWatchdog(metrics, interval=0.02, threshold=0.1)
+    await watchdog.start()
+    try:
+        await asyncio.sleep(0.1)
+        with caplog.at_level(logging.WARNING):
+            block_event_loop(0.4)
+        await asyncio.sleep(0.1)
+    finally:
+        await watchdog.stop()
+
+    assert metrics.loop_blocks.value() == 1
+    assert metrics.loop_lag.count() > 0
+    assert any("block_event_loop" in record.getMessage() for record in caplog.records)
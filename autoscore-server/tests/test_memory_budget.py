@@ -0,0 +1,43 @@
+"""Tests for the allocation attribution and the per-frame memory budget of the memory benchmark."""
+
+from pathlib import Path
+
+import numpy as np
+
+import detector
+from benchmark.memory import STDLIB, AllocationAttributor, MemoryReport, check_budget
+
+
+def create_report(max_frame_peak_bytes: int, frame_retained_bytes: float) -> MemoryReport:
+    return MemoryReport(
+        frames=4,
+        decoded_frame_bytes=1.0,
+        model_rss_bytes=0,
+        model_traced_bytes=0,
+        peak_rss_bytes=0,
+        max_frame_peak_bytes=max_frame_peak_bytes,
+        frame_retained_bytes=frame_retained_bytes,
+        allocations_by_module={},
+        allocations_by_package={},
+    )
+
+
+def test_attribute_files_to_modules_and_packages() -> None:
+    attributor = AllocationAttributor()
+    detector_file = str(Path(detector.__file__).parent / "util" / "file_utils.py")
+
+    assert attributor.module_name(detector_file) == "detector.util.file_utils"
+    assert attributor.package_name(detector_file) == "detector"
+    assert attributor.module_name(np.__file__) is None
+    assert attributor.package_name("/usr/lib/python3/site-packages/numpy/core/numeric.py") == "numpy"
+    assert attributor.package_name("/usr/lib/python3.11/json/decoder.py") == STDLIB
+
+
+def test_check_budget_reports_exceeded_metrics() -> None:
+    assert check_budget(create_report(100, 10.0), max_frame_peak_bytes=100, max_frame_retained_bytes=10) == []
+
+    violations = check_budget(create_report(101, 11.0), max_frame_peak_bytes=100, max_frame_retained_bytes=10)
+
+    peak_violation, retained_violation = violations
+    assert "peak allocation per frame" in peak_violation
+    assert "retained per frame" in retained_violation
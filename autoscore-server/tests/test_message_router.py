@@ -0,0 +1,167 @@
+"""Tests for processing pipelined requests of a connection concurrently within its window."""
+
+import asyncio
+import json
+from pathlib import Path
+from typing import TYPE_CHECKING, AsyncIterator, Dict, List, Optional, Tuple, cast
+
+import pytest
+import websockets.exceptions
+
+from autoscore.handler.base_handler import BaseHandler
+from autoscore.model.configuration import ServerConfig
+from autoscore.model.request import PingRequest, RequestType
+from autoscore.model.response import PingResponse, Status
+from autoscore.websocket import message_router
+from autoscore.websocket.message_router import MessageRouter
+
+if TYPE_CHECKING:
+    from websockets.asyncio.server import ServerConnection
+
+    from detector.service.dart_image_scoring_service import DartInImageScoringService
+
+PIPELINE_WINDOW = 2
+STEP_TIMEOUT = 5.0
+
+
+class FakeWebSocket:
+    """Connection fed by the test, which records every sent message."""
+
+    def __init__(self) -> None:
+        self.incoming: asyncio.Queue[Optional[str]] = asyncio.Queue()
+        self.sent: List[Dict[str, object]] = []
+        self.remote_address = ("127.0.0.1", 50000)
+
+    def receive(self, request_id: Optional[str]) -> None:
+        """Queue a ping request for the router to read."""
+        self.incoming.put_nowait(json.dumps({"request_type": "PING", "session_id": "board", "request_id": request_id}))
+
+    async def recv(self) -> str:
+        """Get the next queued message, or fail as a closed connection once the test closed it."""
+        message = await self.incoming.get()
+        if message is None:
+            raise websockets.exceptions.ConnectionClosed(None, None)
+        return message
+
+    async def send(self, message: str) -> None:
+        """Record a sent message."""
+        self.sent.append(json.loads(message))
+
+
+class BlockingPingHandler(BaseHandler[PingRequest, PingResponse]):
+    """Answers a ping only once the test released it, failing for the request id "fail"."""
+
+    def __init__(self) -> None:
+        self.started: Dict[Optional[str], asyncio.Event] = {}
+        self.released: Dict[Optional[str], asyncio.Event] = {}
+
+    def get_request_type(self) -> RequestType:
+        """Get the ping request type."""
+        return RequestType.PING
+
+    async def handle(self, websocket: "ServerConnection", request: PingRequest) -> None:
+        """Wait until the request is released, then answer it."""
+        self.event(self.started, request.request_id).set()
+        await self.event(self.released, request.request_id).wait()
+        if request.request_id == "fail":
+            msg = "handler failed"
+            raise RuntimeError(msg)
+        await self.send_response(
+            websocket,
+            PingResponse(request_type=RequestType.PING, session_id="board", request_id=request.request_id, status=Status.SUCCESS),
+        )
+
+    @staticmethod
+    def event(events: Dict[Optional[str], asyncio.Event], request_id: Optional[str]) -> asyncio.Event:
+        """Get the event of a request, creating it on first use."""
+        return events.setdefault(request_id, asyncio.Event())
+
+    async def wait_started(self, request_id: Optional[str]) -> None:
+        """Wait until the handler started processing a request."""
+        await asyncio.wait_for(self.event(self.started, request_id).wait(), STEP_TIMEOUT)
+
+    def release(self, request_id: Optional[str]) -> None:
+        """Let the handler answer a request."""
+        self.event(self.released, request_id).set()
+
+
+@pytest.fixture
+async def connection(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> AsyncIterator[Tuple[FakeWebSocket, BlockingPingHandler]]:
+    monkeypatch.setattr(message_router, "create_detection_service", lambda *_: cast("DartInImageScoringService", object()))
+    router = MessageRouter(ServerConfig(pipeline_window=PIPELINE_WINDOW, profile_dir=tmp_path))
+    handler = BlockingPingHandler()
+    router.handlers[RequestType.PING] = handler
+    websocket = FakeWebSocket()
+    task = asyncio.create_task(router.handle_messages(cast("ServerConnection", websocket)))
+    try:
+        yield websocket, handler
+    finally:
+        for request_id in ("a", "b", "c", "d", "fail", None):
+            handler.release(request_id)
+        websocket.incoming.put_nowait(None)
+        await asyncio.wait_for(task, STEP_TIMEOUT)
+        router.close()
+
+
+async def settle() -> None:
+    """Let every task that can make progress run until it blocks."""
+    for _ in range(10):
+        await asyncio.sleep(0)
+
+
+async def test_pipelined_responses_complete_out_of_order(connection: Tuple[FakeWebSocket, BlockingPingHandler]) -> None:
+    websocket, handler = connection
+    websocket.receive("a")
+    websocket.receive("b")
+    await handler.wait_started("a")
+    await handler.wait_started("b")
+
+    handler.release("b")
+    await settle()
+    handler.release("a")
+    await settle()
+
+    assert [response["request_id"] for response in websocket.sent] == ["b", "a"]
+
+
+async def test_full_window_pauses_reading(connection: Tuple[FakeWebSocket, BlockingPingHandler]) -> None:
+    websocket, handler = connection
+    for request_id in ("a", "b", "c", "d"):
+        websocket.receive(request_id)
+    await handler.wait_started("a")
+    await handler.wait_started("b")
+    await settle()
+
+    # c was read and waits for a slot, d stays unread on the connection
+    assert not handler.event(handler.started, "c").is_set()
+    assert websocket.incoming.qsize() == 1
+
+    handler.release("a")
+    await handler.wait_started("c")
+    await settle()
+    assert not handler.event(handler.started, "d").is_set()
+
+
+async def test_errors_are_tagged_with_the_request_id(connection: Tuple[FakeWebSocket, BlockingPingHandler]) -> None:
+    websocket, handler = connection
+    websocket.receive("fail")
+    await handler.wait_started("fail")
+
+    handler.release("fail")
+    await settle()
+
+    assert [(response["request_id"], response["message"]) for response in websocket.sent] == [("fail", "Server error: handler failed")]
+
+
+async def test_requests_without_id_are_handled_inline(connection: Tuple[FakeWebSocket, BlockingPingHandler]) -> None:
+    websocket, handler = connection
+    websocket.receive(None)
+    websocket.receive("a")
+    await handler.wait_started(None)
+    await settle()
+
+    assert not handler.event(handler.started, "a").is_set()
+
+    handler.release(None)
+    await handler.wait_started("a")
+    assert [response["request_id"] for response in websocket.sent] == [None]
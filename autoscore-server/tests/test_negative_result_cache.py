@@ -0,0 +1,56 @@
+"""Tests for skipping the frames of sessions without a usable dartboard."""
+
+import time
+
+from autoscore.model.configuration import ServerConfig
+from autoscore.service.negative_result_cache import NegativeResultCache
+from detector.model.detection_models import DetectionResult
+from detector.model.detection_result_code import ResultCode
+
+BACKOFF = 0.05
+
+
+def create_result(result_code: ResultCode) -> DetectionResult:
+    return DetectionResult(processing_time=0.1, result_code=result_code)
+
+
+def test_rejected_frame_skips_session_until_backoff_expires() -> None:
+    cache = NegativeResultCache(ServerConfig(negative_cache_initial_backoff_seconds=BACKOFF))
+    cache.record("s", create_result(ResultCode.NO_DARTBOARD))
+
+    skipped = cache.get("s")
+    assert skipped is not None
+    assert skipped.result_code is ResultCode.NO_DARTBOARD
+    assert cache.get("other") is None
+
+    time.sleep(BACKOFF * 1.5)
+    assert cache.get("s") is None
+
+
+def test_backoff_doubles_up_to_maximum_and_resets_after_success() -> None:
+    cache = NegativeResultCache(
+        ServerConfig(negative_cache_initial_backoff_seconds=BACKOFF, negative_cache_max_backoff_seconds=BACKOFF * 3)
+    )
+    for _ in range(2):
+        cache.record("s", create_result(ResultCode.NO_DARTBOARD))
+    time.sleep(BACKOFF * 1.5)
+    assert cache.get("s") is not None
+
+    for _ in range(5):
+        cache.record("s", create_result(ResultCode.NO_DARTBOARD))
+    time.sleep(BACKOFF * 3.5)
+    assert cache.get("s") is None
+
+    cache.record("s", create_result(ResultCode.NO_DARTBOARD))
+    cache.record("s", create_result(ResultCode.SUCCESS))
+    assert cache.get("s") is None
+
+
+def test_failures_other_than_rejected_frames_are_not_skipped() -> None:
+    cache = NegativeResultCache(ServerConfig())
+    cache.record("s", create_result(ResultCode.YOLO_ERROR))
+    # Calibration points hidden by a hand or a dart must not hold back the next frames
+    cache.record("occluded", create_result(ResultCode.MISSING_CALIBRATION_POINTS))
+
+    assert cache.get("s") is None
+    assert cache.get("occluded") is None
@@ -0,0 +1,58 @@
+"""Tests for degrading detection quality step by step under load."""
+
+from autoscore.metrics.server_metrics import ServerMetrics
+from autoscore.model.configuration import ServerConfig
+from autoscore.service.quality_ladder import QualityLadder
+from autoscore.service.session_crops import SessionCrops
+from detector.model.detection_models import CalibrationResult, DetectionResult, ScoringResult
+from detector.model.detection_result_code import ResultCode
+from detector.model.image_models import CropInformation, PreprocessingResult
+
+CROP = CropInformation(x_offset=10, y_offset=20, width=300, height=300)
+FRAME_SHAPE = (720, 1280, 3)
+LOWEST_LEVEL = len(ServerConfig().quality_ladder) - 1
+
+
+def create_result(result_code: ResultCode = ResultCode.SUCCESS) -> DetectionResult:
+    return DetectionResult(
+        processing_time=0.1,
+        result_code=result_code,
+        preprocessing_result=PreprocessingResult(crop_info=CROP),
+        calibration_result=CalibrationResult(processing_time=0.0, result_code=result_code),
+        scoring_result=ScoringResult(processing_time=0.0, result_code=result_code),
+    )
+
+
+def test_ladder_steps_down_one_level_per_check_and_back_up_once_load_falls() -> None:
+    metrics = ServerMetrics()
+    ladder = QualityLadder(ServerConfig(quality_step_down_queue_depth=8, quality_step_up_queue_depth=2), metrics)
+
+    assert ladder.update(queue_depth=20, loop_lag=0.0) == 1
+    assert ladder.update(queue_depth=0, loop_lag=0.5) == LOWEST_LEVEL
+    assert ladder.update(queue_depth=20, loop_lag=0.5) == LOWEST_LEVEL
+    assert ladder.current[1] == ServerConfig().quality_ladder[LOWEST_LEVEL]
+    assert metrics.quality_level.value() == LOWEST_LEVEL
+
+    # Between the thresholds the level is kept
+    assert ladder.update(queue_depth=5, loop_lag=0.0) == LOWEST_LEVEL
+    assert ladder.update(queue_depth=1, loop_lag=0.0) == 1
+    assert ladder.update(queue_depth=0, loop_lag=0.0) == 0
+    assert ladder.update(queue_depth=0, loop_lag=0.0) == 0
+    assert metrics.quality_level.value() == 0
+
+
+def test_crop_is_reused_between_cropping_model_runs_until_the_board_is_lost() -> None:
+    crops = SessionCrops()
+    assert crops.reuse("s", FRAME_SHAPE, every_n_frames=3) is None
+    crops.record("s", FRAME_SHAPE, create_result(), reused=False)
+
+    assert crops.reuse("s", FRAME_SHAPE, every_n_frames=1) is None
+    assert crops.reuse("s", (480, 640, 3), every_n_frames=3) is None
+    assert crops.reuse("s", FRAME_SHAPE, every_n_frames=3) == CROP
+    assert crops.reuse("s", FRAME_SHAPE, every_n_frames=3) == CROP
+    assert crops.reuse("s", FRAME_SHAPE, every_n_frames=3) is None
+
+    crops.record("s", FRAME_SHAPE, create_result(), reused=False)
+    assert crops.reuse("s", FRAME_SHAPE, every_n_frames=3) == CROP
+    crops.record("s", FRAME_SHAPE, create_result(ResultCode.MISSING_CALIBRATION_POINTS), reused=True)
+    assert crops.reuse("s", FRAME_SHAPE, every_n_frames=3) is None
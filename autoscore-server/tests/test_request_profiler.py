@@ -0,0 +1,48 @@
+"""Tests for the sampling request profiler."""
+
+import json
+from pathlib import Path
+
+from autoscore.service.request_profiler import RequestProfiler
+
+MAX_PROFILES = 2
+DECODE_SECONDS = 0.25
+DART_MODEL_SECONDS = 0.5
+from detector.model.timing_models import StageTimings
+
+
+def test_disabled_profiler_never_starts(tmp_path: Path) -> None:
+    profiler = RequestProfiler(tmp_path)
+
+    assert all(profiler.start() is None for _ in range(10))
+    assert not tmp_path.exists() or not any(tmp_path.iterdir())
+
+
+def test_profile_directory_is_created_once_profiling_is_enabled(tmp_path: Path) -> None:
+    profile_dir = tmp_path / "profiles"
+    profiler = RequestProfiler(profile_dir)
+
+    assert not profile_dir.exists()
+    profiler.configure(50)
+    assert profile_dir.is_dir()
+
+
+def test_samples_every_nth_request_into_bounded_directory(tmp_path: Path) -> None:
+    profiler = RequestProfiler(tmp_path, every_n=2, max_profiles=MAX_PROFILES)
+
+    for request in range(8):
+        profile = profiler.start()
+        assert (profile is not None) == (request % 2 == 0)
+        if profile is not None:
+            sum(range(1000))
+            profiler.finish(profile, f"board/{request}", StageTimings(decode=DECODE_SECONDS, dart_model=DART_MODEL_SECONDS))
+
+    profiles = sorted(tmp_path.glob("*.prof"))
+    assert len(profiles) == MAX_PROFILES
+    metadata = json.loads(profiles[-1].with_suffix(".json").read_text())
+    assert metadata["session_id"] == "board/6"
+    assert metadata["total"] == DECODE_SECONDS + DART_MODEL_SECONDS
+    assert len(list(tmp_path.glob("*.json"))) == MAX_PROFILES
+
+    profiler.configure(0)
+    assert profiler.start() is None
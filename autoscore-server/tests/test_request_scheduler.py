@@ -0,0 +1,85 @@
+"""Tests for sharing the inference workers fairly between sessions."""
+
+import asyncio
+import time
+from functools import partial
+from typing import List, cast
+
+import pytest
+
+from autoscore.model.configuration import ServerConfig
+from autoscore.service.inference_executor import InferenceExecutor
+from autoscore.service.request_scheduler import RequestPriority, RequestScheduler, SessionQueueFullError
+from detector.service.dart_image_scoring_service import DartInImageScoringService
+
+
+def detect(order: List[str], name: str, _: DartInImageScoringService) -> str:
+    time.sleep(0.01)
+    order.append(name)
+    return name
+
+
+def create_scheduler(config: ServerConfig) -> RequestScheduler:
+    return RequestScheduler(InferenceExecutor([cast("DartInImageScoringService", object())]), config)
+
+
+@pytest.mark.asyncio
+async def test_sessions_take_turns_and_interactive_requests_go_first() -> None:
+    scheduler = create_scheduler(ServerConfig(scheduler_max_queued_per_session=8))
+    order: List[str] = []
+
+    # The first request occupies the only worker while the others queue up behind it
+    requests = [scheduler.run("chatty", partial(detect, order, "chatty-0"))]
+    await asyncio.sleep(0)
+    requests.extend(scheduler.run("chatty", partial(detect, order, f"chatty-{i}")) for i in range(1, 4))
+    requests.append(scheduler.run("quiet", partial(detect, order, "quiet-0")))
+    requests.append(scheduler.run("idle", partial(detect, order, "idle-0"), RequestPriority.INTERACTIVE))
+    await asyncio.gather(*map(asyncio.ensure_future, requests))
+
+    assert order == ["chatty-0", "idle-0", "chatty-1", "quiet-0", "chatty-2", "chatty-3"]
+
+
+@pytest.mark.asyncio
+async def test_weighted_session_gets_more_turns() -> None:
+    scheduler = create_scheduler(ServerConfig(scheduler_session_weights={"main": 2.0}))
+    order: List[str] = []
+
+    blocker = asyncio.ensure_future(scheduler.run("blocker", partial(detect, order, "blocker")))
+    await asyncio.sleep(0)
+    requests = [scheduler.run(session, partial(detect, order, session)) for session in ("main", "main", "main", "side", "side")]
+    await asyncio.gather(blocker, *map(asyncio.ensure_future, requests))
+
+    assert order == ["blocker", "main", "main", "side", "main", "side"]
+
+
+@pytest.mark.asyncio
+async def test_sessions_weighted_below_one_are_dispatched() -> None:
+    scheduler = create_scheduler(ServerConfig(scheduler_session_weights={"slow": 0.5, "slower": 0.25}))
+    order: List[str] = []
+
+    # Without any other session, the fractional weights alone have to earn the first turn
+    assert await asyncio.wait_for(scheduler.run("slow", partial(detect, order, "slow-0")), timeout=1) == "slow-0"
+
+    blocker = asyncio.ensure_future(scheduler.run("blocker", partial(detect, order, "blocker")))
+    await asyncio.sleep(0)
+    requests = [scheduler.run("slow", partial(detect, order, f"slow-{i}")) for i in range(1, 4)]
+    requests.extend(scheduler.run("slower", partial(detect, order, f"slower-{i}")) for i in range(2))
+    await asyncio.wait_for(asyncio.gather(blocker, *map(asyncio.ensure_future, requests)), timeout=1)
+
+    assert order == ["slow-0", "blocker", "slow-1", "slow-2", "slower-0", "slow-3", "slower-1"]
+
+
+@pytest.mark.asyncio
+async def test_session_queue_is_capped() -> None:
+    scheduler = create_scheduler(ServerConfig(scheduler_max_queued_per_session=1))
+    order: List[str] = []
+
+    running = asyncio.ensure_future(scheduler.run("s", partial(detect, order, "running")))
+    await asyncio.sleep(0)
+    queued = asyncio.ensure_future(scheduler.run("s", partial(detect, order, "queued")))
+    await asyncio.sleep(0)
+
+    with pytest.raises(SessionQueueFullError):
+        await scheduler.run("s", partial(detect, order, "rejected"))
+    await asyncio.gather(running, queued)
+    assert order == ["running", "queued"]
@@ -0,0 +1,106 @@
+"""Tests for the detection result cache."""
+
+import numpy as np
+import pytest
+
+from autoscore.model.configuration import ServerConfig
+from autoscore.service.result_cache import DetectionResultCache
+from detector.model.detection_models import CalibrationResult, DetectionResult
+from detector.model.detection_result_code import ResultCode
+
+ONE_HIT_IN_TWO_LOOKUPS = 0.5
+
+
+def create_result(message: str = "ok", result_code: ResultCode = ResultCode.SUCCESS) -> DetectionResult:
+    return DetectionResult(processing_time=0.1, result_code=result_code, message=message)
+
+
+def create_calibrated_result(message: str = "ok") -> DetectionResult:
+    calibration_result = CalibrationResult(processing_time=0.1, result_code=ResultCode.SUCCESS)
+    return create_result(message).model_copy(update={"calibration_result": calibration_result})
+
+
+def test_exact_hit_is_scoped_to_session() -> None:
+    cache = DetectionResultCache(ServerConfig())
+    content_hash = cache.content_hash(b"frame")
+    cache.put("session-a", content_hash, create_result())
+
+    assert cache.get("session-a", content_hash) is not None
+    assert cache.get("session-b", content_hash) is None
+
+    statistics = cache.statistics
+    assert statistics.hits == 1
+    assert statistics.misses == 1
+    assert statistics.hit_rate == ONE_HIT_IN_TWO_LOOKUPS
+
+
+def test_global_scope_shares_results_across_sessions() -> None:
+    cache = DetectionResultCache(ServerConfig(result_cache_session_scoped=False))
+    content_hash = cache.content_hash(b"frame")
+    cache.put("session-a", content_hash, create_result())
+
+    assert cache.get("session-b", content_hash) is not None
+
+
+def test_least_recently_used_entry_is_evicted() -> None:
+    cache = DetectionResultCache(ServerConfig(result_cache_max_entries=2))
+    cache.put("s", "first", create_result())
+    cache.put("s", "second", create_result())
+    cache.get("s", "first")
+    cache.put("s", "third", create_result())
+
+    assert cache.get("s", "first") is not None
+    assert cache.get("s", "second") is None
+    assert cache.statistics.evictions == 1
+
+
+def test_memory_cap_and_ttl_are_enforced() -> None:
+    result = create_result()
+    size_bytes = len(result.model_dump_json())
+    cache = DetectionResultCache(ServerConfig(result_cache_max_bytes=size_bytes * 2, result_cache_ttl_seconds=1e-9))
+    for key in ("a", "b", "c"):
+        cache.put("s", key, result)
+
+    statistics = cache.statistics
+    assert statistics.size_bytes <= size_bytes * 2
+    assert cache.get("s", "c") is None
+    assert cache.statistics.expirations == 1
+
+
+def test_transient_errors_are_not_cached() -> None:
+    cache = DetectionResultCache(ServerConfig())
+    cache.put("s", "frame", create_result(result_code=ResultCode.UNKNOWN))
+
+    assert cache.get("s", "frame") is None
+
+
+def test_near_duplicate_frames_share_calibrated_results() -> None:
+    cache = DetectionResultCache(ServerConfig(perceptual_cache_enabled=True))
+    rng = np.random.default_rng(42)
+    image = rng.integers(0, 255, size=(120, 160, 3), dtype=np.uint8)
+    noisy_image = image.copy()
+    noisy_image[0, 0] = 255 - noisy_image[0, 0]
+
+    cache.put("s", "original", create_calibrated_result(), cache.perceptual_hash(image))
+    cache.put("s", "uncalibrated", create_result(), cache.perceptual_hash(255 - image))
+
+    assert cache.get_similar("s", cache.perceptual_hash(noisy_image)) is not None
+    assert cache.get_similar("s", cache.perceptual_hash(255 - image)) is None
+    assert cache.statistics.perceptual_hits == 1
+    assert cache.statistics.perceptual_misses == 1
+
+
+def test_expired_near_duplicate_does_not_hide_a_valid_one(monkeypatch: pytest.MonkeyPatch) -> None:
+    cache = DetectionResultCache(ServerConfig(perceptual_cache_enabled=True, result_cache_ttl_seconds=10))
+    perceptual_hash = cache.perceptual_hash(np.zeros((120, 160, 3), dtype=np.uint8))
+    monkeypatch.setattr("autoscore.service.result_cache.time.monotonic", lambda: 100.0)
+    cache.put("s", "valid", create_calibrated_result("valid"), perceptual_hash)
+    monkeypatch.setattr("autoscore.service.result_cache.time.monotonic", lambda: 0.0)
+    cache.put("s", "expired", create_calibrated_result("expired"), perceptual_hash)
+
+    monkeypatch.setattr("autoscore.service.result_cache.time.monotonic", lambda: 50.0)
+    similar_result = cache.get_similar("s", perceptual_hash)
+
+    assert similar_result is not None
+    assert similar_result.message == "valid"
+    assert cache.statistics.expirations == 1
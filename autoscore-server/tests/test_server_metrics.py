@@ -0,0 +1,77 @@
+"""Tests for the server metrics and their Prometheus exporter."""
+
+import asyncio
+
+import pytest
+
+from autoscore.metrics.metrics_http_server import MetricsHttpServer
+from autoscore.metrics.server_metrics import ServerMetrics
+from autoscore.model.request import RequestType
+from autoscore.service.result_cache import CacheStatistics
+from detector.model.detection_result_code import ResultCode
+from detector.model.timing_models import StageTimings
+
+METRICS_PORT = 18766
+
+
+def test_render_prometheus_text_format() -> None:
+    metrics = ServerMetrics()
+    metrics.record_request(RequestType.FULL, ResultCode.SUCCESS, 0.2)
+    metrics.record_request(RequestType.NONE, ResultCode.INVALID_INPUT)
+    metrics.record_stage_timings(StageTimings(decode=0.004, crop_model=0.03, dart_model=0.05))
+    metrics.track_connections(lambda: 3)
+    metrics.track_result_cache(lambda: CacheStatistics(hits=1, misses=3, perceptual_hits=2, entries=2))
+
+    rendered = metrics.registry.render()
+
+    assert "# TYPE autoscore_requests_total counter" in rendered
+    assert 'autoscore_requests_total{request_type="FULL",result_code="SUCCESS"} 1.0' in rendered
+    assert 'autoscore_requests_total{request_type="NONE",result_code="INVALID_INPUT"} 1.0' in rendered
+    assert 'autoscore_request_latency_seconds_bucket{request_type="FULL",le="0.25"} 1' in rendered
+    assert 'autoscore_request_latency_seconds_bucket{request_type="FULL",le="0.1"} 0' in rendered
+    assert 'autoscore_stage_latency_seconds_count{stage="decode"} 1' in rendered
+    assert 'autoscore_model_inferences_total{model="dartboard"} 1.0' in rendered
+    assert 'autoscore_model_inferences_total{model="dart"} 1.0' in rendered
+    assert "autoscore_active_connections 3.0" in rendered
+    assert "autoscore_result_cache_hit_ratio 0.25" in rendered
+    assert 'autoscore_result_cache_perceptual_lookups_total{outcome="hit"} 2.0' in rendered
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint_serves_registry() -> None:
+    metrics = ServerMetrics()
+    metrics.record_request(RequestType.PING, None)
+    server = MetricsHttpServer(metrics.registry, "127.0.0.1", METRICS_PORT)
+    await server.start()
+    try:
+        reader, writer = await asyncio.open_connection("127.0.0.1", METRICS_PORT)
+        writer.write(b"GET /metrics HTTP/1.1\r\nHost: localhost\r\n\r\n")
+        await writer.drain()
+        response = (await reader.read()).decode()
+        writer.close()
+    finally:
+        await server.stop()
+
+    assert response.startswith("HTTP/1.1 200 OK")
+    assert 'autoscore_requests_total{request_type="PING",result_code="NONE"} 1.0' in response
+
+
+@pytest.mark.asyncio
+async def test_ready_endpoint_reflects_readiness() -> None:
+    metrics = ServerMetrics()
+    server = MetricsHttpServer(metrics.registry, "127.0.0.1", METRICS_PORT, lambda: metrics.is_ready)
+    await server.start()
+    try:
+        responses = []
+        for _ in range(2):
+            reader, writer = await asyncio.open_connection("127.0.0.1", METRICS_PORT)
+            writer.write(b"GET /ready HTTP/1.1\r\nHost: localhost\r\n\r\n")
+            await writer.drain()
+            responses.append((await reader.read()).decode())
+            writer.close()
+            metrics.mark_ready()
+    finally:
+        await server.stop()
+
+    assert responses[0].startswith("HTTP/1.1 503 Service Unavailable")
+    assert responses[1].startswith("HTTP/1.1 200 OK")
@@ -0,0 +1,37 @@
+"""Tests for the pipeline stage timer."""
+
+from detector.geometry.board import DartBoard
+from detector.model.configuration import ProcessingConfig
+from detector.model.detection_models import CalibrationPoint
+from detector.model.timing_models import PipelineStage
+from detector.service.calibration.calibration_matrix_calculator import CalibrationMatrixCalculator
+from detector.util.timing_utils import StageTimer, measure_stage
+
+DECODE_SECONDS = 0.25
+
+
+def test_measure_stage_without_active_timer_is_noop() -> None:
+    with measure_stage(PipelineStage.DECODE):
+        pass
+
+    assert StageTimer.active() is None
+
+
+def test_nested_services_record_into_active_timer() -> None:
+    reference_coordinates = DartBoard().get_calibration_reference_coordinates()
+    calibration_points = [
+        CalibrationPoint(x=float(x), y=float(y), confidence=0.9, class_id=class_id, message="valid")
+        for class_id, (x, y) in enumerate(reference_coordinates)
+    ]
+
+    with StageTimer() as timer:
+        timer.record(PipelineStage.DECODE, DECODE_SECONDS)
+        timer.record(PipelineStage.DECODE, DECODE_SECONDS)
+        CalibrationMatrixCalculator(ProcessingConfig()).calculate_homography(calibration_points)
+
+    stage_timings = timer.to_stage_timings()
+    assert stage_timings.decode == 2 * DECODE_SECONDS
+    assert stage_timings.homography is not None
+    assert stage_timings.dart_model is None
+    assert stage_timings.total >= stage_timings.decode
+    assert StageTimer.active() is None
@@ -0,0 +1,75 @@
+"""Tests for the traffic recorder and the response diff of the replay tool."""
+
+import json
+from pathlib import Path
+
+from websockets.asyncio.server import ServerConnection, serve
+
+from autoscore.service.traffic_recorder import TrafficDirection, TrafficRecorder, read_traffic
+from benchmark.traffic_replay import RecordedConnection, TrafficReplayer, diff_responses, load_recording
+
+RECORDED_TIMESTAMP = 10.5
+PIPELINED_REQUESTS = [(0.0, b'{"request_id": "a"}'), (0.0, b'{"request_id": "b"}')]
+
+
+def test_recording_round_trip(tmp_path: Path) -> None:
+    recording_path = tmp_path / "traffic.bin"
+    recorder = TrafficRecorder(recording_path)
+    connection_id = recorder.new_connection_id()
+    recorder.record(TrafficDirection.REQUEST, connection_id, "board-1", '{"request_type": "PING"}', timestamp=RECORDED_TIMESTAMP)
+    recorder.record(TrafficDirection.RESPONSE, connection_id, "", b'{"message": "pong"}')
+    recorder.close()
+
+    records = list(read_traffic(recording_path))
+    assert [record.direction for record in records] == [TrafficDirection.REQUEST, TrafficDirection.RESPONSE]
+    assert records[0].timestamp == RECORDED_TIMESTAMP
+    assert records[0].session_id == "board-1"
+    assert records[1].payload == b'{"message": "pong"}'
+
+    connections = load_recording(recording_path)
+    assert connections[connection_id].requests == [(RECORDED_TIMESTAMP, b'{"request_type": "PING"}')]
+    assert connections[connection_id].responses == [b'{"message": "pong"}']
+
+
+def test_diff_responses_ignores_volatile_fields() -> None:
+    expected = {"status": 0, "detection_result": {"processing_time": 0.4, "darts": [{"score": 20, "x": 0.25}]}}
+    same = {"status": 0, "detection_result": {"processing_time": 0.9, "darts": [{"score": 20, "x": 0.25}]}}
+    changed = {"status": 0, "detection_result": {"processing_time": 0.4, "darts": [{"score": 5, "x": 0.25}]}}
+
+    assert diff_responses(expected, same) == []
+    assert diff_responses(expected, changed) == ["$.detection_result.darts[0].score: expected 20, got 5"]
+
+
+async def answer_out_of_order(websocket: ServerConnection) -> None:
+    await websocket.recv()
+    await websocket.recv()
+    await websocket.send(json.dumps({"request_id": "a", "progress": {"stage": "BOARD_LOCATED"}}))
+    await websocket.send(json.dumps({"request_id": "b", "score": 5}))
+    await websocket.send(json.dumps({"request_id": "a", "score": 20}))
+
+
+async def close_after_first_request(websocket: ServerConnection) -> None:
+    await websocket.recv()
+
+
+async def test_replay_pairs_pipelined_responses_by_request_id() -> None:
+    recorded = RecordedConnection(
+        requests=PIPELINED_REQUESTS,
+        responses=[b'{"request_id": "a", "progress": {"stage": "BOARD_LOCATED"}}', b'{"request_id": "a", "score": 20}',
+                   b'{"request_id": "b", "score": 5}'],
+    )
+    async with serve(answer_out_of_order, "127.0.0.1", 0) as server:
+        port = server.sockets[0].getsockname()[1]
+        report = await TrafficReplayer(f"ws://127.0.0.1:{port}", {1: recorded}, speed=0).replay()
+
+    assert (report.responses, report.progress_messages, report.missing_responses, report.mismatches) == (2, 1, 0, 0)
+    assert report.latency is not None
+
+
+async def test_replay_survives_a_dropped_connection() -> None:
+    recorded = RecordedConnection(requests=PIPELINED_REQUESTS, responses=[b'{"request_id": "a"}', b'{"request_id": "b"}'])
+    async with serve(close_after_first_request, "127.0.0.1", 0) as server:
+        port = server.sockets[0].getsockname()[1]
+        report = await TrafficReplayer(f"ws://127.0.0.1:{port}", {1: recorded, 2: recorded}, speed=0).replay()
+
+    assert report.missing_responses == len(PIPELINED_REQUESTS) * 2